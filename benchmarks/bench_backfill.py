@@ -0,0 +1,68 @@
+"""
+Runs a paged backfill against the stub query_range API, interrupts it by
+making the stub fail part-way, then resumes from the checkpoint and checks
+that every step-grid point was written exactly once.
+
+Usage: python -m benchmarks.bench_backfill [--days 30] [--step 60]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.prom_stub import start_stub
+from src.live_metrics import backfill, plan_pages, QUERIES
+from src.metric_store import MetricStore
+
+
+def main(days, step, workers):
+    end = 1_760_000_000
+    start = end - int(days * 86400)
+    pages = plan_pages(start, end, step)
+    expected = len(np.arange(start, end + 1, step))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MetricStore(os.path.join(tmp, "store"))
+        checkpoint = os.path.join(tmp, "checkpoint.json")
+
+        # First run (one page at a time) dies after roughly half the pages
+        fail_after = len(pages) * len(QUERIES) // 2
+        server, base_url, _ = start_stub(latency=0.01, fail_after=fail_after)
+        url = base_url + "/api/v1/query_range"
+        try:
+            backfill(start, end, step, store=store, url=url, checkpoint_path=checkpoint, workers=1)
+            raise AssertionError("stub was expected to fail the first run")
+        except Exception as e:
+            first = len(store.read_arrays()[0])
+            print(f"interrupted after {first} rows ({type(e).__name__}); checkpoint kept: {os.path.exists(checkpoint)}")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        # Same URL again, as a restarted job would see it
+        server, base_url, counters = start_stub(port=server.server_address[1], latency=0.01)
+        url = base_url + "/api/v1/query_range"
+        try:
+            t0 = time.perf_counter()
+            resumed = backfill(start, end, step, store=store, url=url, checkpoint_path=checkpoint, workers=workers)
+            elapsed = time.perf_counter() - t0
+        finally:
+            server.shutdown()
+
+        ts, values = store.read_arrays()
+        assert len(ts) == expected and len(np.unique(ts)) == expected, (len(ts), expected)
+        assert values.shape[1] == len(QUERIES)
+        print(f"{days} days at {step}s: {len(pages)} pages, {expected} rows x {values.shape[1]} metrics")
+        print(f"resumed run wrote {resumed} rows with {counters['/api/v1/query_range']} requests in {elapsed:.2f}s")
+        print(f"checkpoint removed after completion: {not os.path.exists(checkpoint)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check resumable paged backfill against the stub")
+    parser.add_argument("--days", type=float, default=30)
+    parser.add_argument("--step", type=int, default=60)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    main(args.days, args.step, args.workers)
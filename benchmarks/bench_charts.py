@@ -0,0 +1,99 @@
+"""
+Live chart refresh cost vs history length: full figure rebuilds vs LiveChart.
+
+For each history length, a multi-metric chart (one trace per --traces, 2 s
+samples) is refreshed --refreshes times, one new sample per refresh:
+
+    rebuild    a new go.Figure with every point each refresh (what the
+               dashboard did before)
+    live       one LiveChart fed only the new sample (M4 at --width px)
+
+Reported per refresh: figure build time, the time Streamlit spends turning
+the figure into the message it sends (to_dict + to_json), and that payload's
+size. The live payload stays the same from 200 samples to days of history.
+
+Usage: python -m benchmarks.bench_charts [--sizes 200 10000 100000 1000000] [--traces 5] [--width 1000]
+"""
+import argparse
+import time
+
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from src.charts import LiveChart
+
+SAMPLE_NS = 2_000_000_000
+
+
+def make_series(n, traces, seed=0):
+    rng = np.random.default_rng(seed)
+    ts = (time.time_ns() // SAMPLE_NS - n) * SAMPLE_NS + np.arange(n, dtype=np.int64) * SAMPLE_NS
+    values = 50 + np.cumsum(rng.normal(0, 1, (n, traces)), axis=0)
+    spikes = rng.choice(n, max(1, n // 1000))
+    values[spikes] += 40
+    return ts, values
+
+
+def template(traces):
+    fig = go.Figure([go.Scatter(mode="lines", name=f"metric {i}") for i in range(traces)])
+    fig.add_hline(y=80, line_dash="dash", line_color="#ff3333")
+    fig.update_layout(template="plotly_dark", height=500, hovermode="x unified")
+    return fig
+
+
+def rebuild(ts, values):
+    x = ts.view("datetime64[ns]")
+    fig = go.Figure([go.Scatter(x=x, y=values[:, i], mode="lines", name=f"metric {i}")
+                     for i in range(values.shape[1])])
+    fig.add_hline(y=80, line_dash="dash", line_color="#ff3333")
+    fig.update_layout(template="plotly_dark", height=500, hovermode="x unified")
+    return fig
+
+
+def serialize(fig):
+    """What st.plotly_chart does with a figure: to_dict, then JSON without validation."""
+    return pio.to_json(fig.to_dict(), validate=False)
+
+
+def measure(n, traces, width, refreshes):
+    ts, values = make_series(n + refreshes, traces)
+    results = {}
+
+    chart = LiveChart(template(traces), width)
+    start = time.perf_counter()
+    chart.update(ts[:n], values[:n].T)
+    fill = time.perf_counter() - start
+    for name, step in (("rebuild", lambda end: rebuild(ts[:end], values[:end])),
+                       ("live", lambda end: chart.update(ts[:end], values[:end].T, start_ns=ts[0]))):
+        build = send = size = 0.0
+        for k in range(1, refreshes + 1):
+            start = time.perf_counter()
+            fig = step(n + k)
+            built = time.perf_counter()
+            payload = serialize(fig)
+            build += built - start
+            send += time.perf_counter() - built
+            size += len(payload)
+        results[name] = (build / refreshes, send / refreshes, size / refreshes)
+    return fill, results
+
+
+def main(sizes, traces, width, refreshes):
+    print(f"{traces} traces, {width} px, mean of {refreshes} refreshes (+1 sample each)")
+    print(f"{'samples':>9} {'mode':<8} {'build ms':>9} {'send ms':>8} {'payload KB':>11}")
+    for n in sizes:
+        fill, results = measure(n, traces, width, refreshes)
+        for mode, (build, send, size) in results.items():
+            print(f"{n:>9} {mode:<8} {build * 1e3:>9.1f} {send * 1e3:>8.1f} {size / 1024:>11.0f}")
+        print(f"{'':>9} (live initial fill of {n} samples: {fill * 1e3:.0f} ms)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark live chart refreshes")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[200, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--traces", type=int, default=5)
+    parser.add_argument("--width", type=int, default=1000)
+    parser.add_argument("--refreshes", type=int, default=10)
+    args = parser.parse_args()
+    main(args.sizes, args.traces, args.width, args.refreshes)
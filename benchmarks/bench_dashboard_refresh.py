@@ -0,0 +1,167 @@
+"""
+Server CPU per connected dashboard session: live fragments vs full-page reruns.
+
+Starts `streamlit run src/dashboard.py` headless in three setups and connects
+--sessions websocket clients to each:
+
+    full+gc    the old sleep-and-rerun loop (BPREDICTOR_FRAGMENTS=0) with
+               Streamlit's post-run gc.collect() turned back on
+    full page  the old loop with .streamlit/config.toml as shipped
+    fragments  live sections as fragments (the default)
+ A client clicks START, optionally
+navigates to --page, then behaves like a browser tab: it re-requests each
+fragment on the interval the server asked for (auto_rerun messages). After
+--warmup seconds the server's CPU time is sampled for --seconds.
+
+Usage: python -m benchmarks.bench_dashboard_refresh [--sessions 1 5] [--seconds 30] [--page Dashboard]
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import psutil
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join("src", "dashboard.py")
+MODES = {
+    "full+gc": {"BPREDICTOR_FRAGMENTS": "0", "STREAMLIT_RUNNER_POST_SCRIPT_GC": "true"},
+    "full page": {"BPREDICTOR_FRAGMENTS": "0"},
+    "fragments": {"BPREDICTOR_FRAGMENTS": "1"},
+}
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port, mode):
+    env = dict(os.environ, TF_CPP_MIN_LOG_LEVEL="3", **MODES[mode])
+    proc = subprocess.Popen([sys.executable, "-m", "streamlit", "run", SCRIPT, "--server.headless", "true",
+                             "--server.port", str(port), "--server.fileWatcherType", "none",
+                             "--browser.gatherUsageStats", "false"],
+                            cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("streamlit server did not start")
+
+
+class Session:
+    """A websocket client that drives one dashboard session like a browser tab."""
+
+    def __init__(self, port, page):
+        self.url = f"ws://127.0.0.1:{port}/_stcore/stream"
+        self.page = page
+        self.ws = None
+        self.page_hash = ""
+        self.buttons = {}
+        self.timers = {}
+        self.runs = 0
+
+    async def rerun(self, fragment_id="", widget_states=()):
+        msg = BackMsg()
+        state = msg.rerun_script
+        state.page_script_hash = self.page_hash
+        state.widget_states.widgets.extend(widget_states)
+        if fragment_id:
+            state.fragment_id = fragment_id
+            state.is_auto_rerun = True
+        await self.ws.send(msg.SerializeToString())
+
+    async def click(self, key):
+        ids = [i for i in self.buttons if i.endswith(key)]
+        if ids:
+            await self.rerun(widget_states=[WidgetState(id=ids[0], trigger_value=True)])
+        return bool(ids)
+
+    async def auto_rerun(self, fragment_id, interval):
+        while True:
+            await asyncio.sleep(interval)
+            await self.rerun(fragment_id)
+
+    async def run(self):
+        self.ws = await websockets.connect(self.url, subprotocols=["streamlit"], max_size=None)
+        await self.rerun()
+        steps = ["predict_button"] + ([f"nav_{self.page}"] if self.page != "Dashboard" else [])
+        async for data in self.ws:
+            msg = ForwardMsg()
+            msg.ParseFromString(data)
+            kind = msg.WhichOneof("type")
+            if kind == "new_session":
+                self.page_hash = msg.new_session.page_script_hash
+            elif kind == "delta" and msg.delta.new_element.WhichOneof("type") == "button":
+                self.buttons[msg.delta.new_element.button.id] = True
+            elif kind == "auto_rerun":
+                fragment_id = msg.auto_rerun.fragment_id
+                if fragment_id not in self.timers:
+                    self.timers[fragment_id] = asyncio.ensure_future(
+                        self.auto_rerun(fragment_id, msg.auto_rerun.interval))
+            elif kind == "script_finished":
+                self.runs += 1
+                if steps and await self.click(steps[0]):
+                    steps.pop(0)
+
+    async def close(self):
+        for timer in self.timers.values():
+            timer.cancel()
+        if self.ws is not None:
+            await self.ws.close()
+
+
+async def measure(port, server, sessions, page, warmup, seconds):
+    clients = [Session(port, page) for _ in range(sessions)]
+    tasks = [asyncio.ensure_future(c.run()) for c in clients]
+    await asyncio.sleep(warmup)
+    proc = psutil.Process(server.pid)
+    before, runs = proc.cpu_times(), sum(c.runs for c in clients)
+    start = time.monotonic()
+    await asyncio.sleep(seconds)
+    after, runs = proc.cpu_times(), sum(c.runs for c in clients) - runs
+    elapsed = time.monotonic() - start
+    for c in clients:
+        await c.close()
+    for t in tasks:
+        t.cancel()
+    cpu = (after.user - before.user) + (after.system - before.system)
+    return cpu / elapsed, runs * 60 / elapsed / sessions
+
+
+def main(session_counts, page, warmup, seconds):
+    print(f"page: {page}, {seconds:.0f}s measured after {warmup:.0f}s warm-up")
+    print(f"{'mode':<10} {'sessions':>8} {'runs/min':>9} {'server CPU':>11} {'per session':>12}")
+    for mode in MODES:
+        for n in session_counts:
+            port = free_port()
+            server = start_server(port, mode)
+            try:
+                load, runs = asyncio.run(measure(port, server, n, page, warmup, seconds))
+            finally:
+                server.terminate()
+                server.wait()
+            print(f"{mode:<10} {n:>8} {runs:>9.0f} {load:>10.1%} {load / n:>11.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure dashboard server CPU per session")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 5])
+    parser.add_argument("--page", default="Dashboard",
+                        choices=["Dashboard", "Live Metrics", "LSTM Forecast"])
+    parser.add_argument("--warmup", type=float, default=15.0)
+    parser.add_argument("--seconds", type=float, default=30.0)
+    args = parser.parse_args()
+    main(args.sessions, args.page, args.warmup, args.seconds)
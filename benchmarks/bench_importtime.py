@@ -0,0 +1,95 @@
+"""
+Import-time regression check for the dashboard's startup path.
+
+Each module is imported in a fresh interpreter under `python -X importtime`
+(best of --runs). Reports the total and the heaviest top-level packages, and
+fails when a module takes longer than --threshold-ms or pulls in one of the
+heavy packages that must stay deferred (TensorFlow, shap, sklearn, plotly).
+Deferred packages that --baseline (streamlit) already imports by itself are
+not counted: recent Streamlit versions import plotly on startup.
+
+Usage: python -m benchmarks.bench_importtime [--modules src.dashboard ...] [--threshold-ms 2500] [--baseline streamlit]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ("src.dashboard", "src.landing", "src.root_cause", "src.warmup")
+# Loaded on demand by pages or by the warm-up thread, never at import
+DEFERRED = ("tensorflow", "keras", "shap", "sklearn", "plotly", "numba")
+
+
+def import_profile(module):
+    """
+    (total µs for `module`, {package: µs}, modules imported by it). A package's
+    time counts each import of it that is not nested inside the same package;
+    interpreter startup (site, encodings, ...) is left out.
+    """
+    env = dict(os.environ, TF_CPP_MIN_LOG_LEVEL="3")
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                         cwd=ROOT, env=env, capture_output=True, text=True)
+    if out.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{out.stderr[-2000:]}")
+    entries = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            entries.append((len(name) - len(name.lstrip()), name.strip(), int(cumulative)))
+
+    # Children are printed before their parent; walk backwards to see parents first
+    total, packages, imported, stack = 0, {}, set(), []
+    for depth, name, cumulative in reversed(entries):
+        while stack and stack[-1][0] >= depth:
+            stack.pop()
+        package = name.split(".")[0]
+        if not stack:
+            inside = name == module
+            if inside:
+                total = cumulative
+        if inside:
+            imported.add(name)
+            if stack and stack[-1][1] != package:
+                packages[package] = packages.get(package, 0) + cumulative
+        stack.append((depth, package))
+    return total, packages, imported
+
+
+def main(modules, threshold_ms, runs, top, baseline):
+    failures = []
+    try:
+        _, _, framework = import_profile(baseline) if baseline else (0, {}, set())
+    except RuntimeError:
+        framework = set()
+    for module in modules:
+        profiles = [import_profile(module) for _ in range(runs)]
+        total, packages, imported = min(profiles, key=lambda p: p[0])
+        total_ms = total / 1e3
+        heavy = sorted(n for n in imported - framework if n.split(".")[0] in DEFERRED)
+
+        print(f"{module}: {total_ms:.0f}ms ({len(imported)} modules)")
+        for name, us in sorted(packages.items(), key=lambda kv: -kv[1])[:top]:
+            print(f"    {name:<24} {us / 1e3:>8.1f}ms")
+        if total_ms > threshold_ms:
+            failures.append(f"{module} took {total_ms:.0f}ms > {threshold_ms}ms")
+        if heavy:
+            failures.append(f"{module} imports deferred packages: {', '.join(sorted({n.split('.')[0] for n in heavy}))}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check import time of the dashboard modules")
+    parser.add_argument("--modules", nargs="+", default=list(MODULES))
+    parser.add_argument("--threshold-ms", type=float, default=2500)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=8)
+    parser.add_argument("--baseline", default="streamlit",
+                        help="framework whose own imports are not held against the modules ('' for none)")
+    args = parser.parse_args()
+    sys.exit(main(args.modules, args.threshold_ms, args.runs, args.top, args.baseline))
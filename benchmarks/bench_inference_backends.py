@@ -0,0 +1,81 @@
+"""
+Compares the Keras, TFLite and NumPy inference backends for the dashboard LSTM.
+
+Each backend runs in a fresh interpreter so cold start and memory are what a
+new Streamlit process would see: time to import + load the model, per-batch
+predict latency (1 window = one rerun with a warm cache, 190 windows = a full
+200-sample history), and RSS after loading and predicting.
+
+Usage: python -m benchmarks.bench_inference_backends [--rounds 200]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BATCHES = (1, 16, 190)
+BACKENDS = ("keras", "tflite", "numpy")
+
+
+def child(backend, rounds):
+    start = time.perf_counter()
+    import numpy as np
+    import psutil
+    from src.inference import load_forecaster
+    model, path, loaded = load_forecaster(backend)
+    rng = np.random.default_rng(0)
+    model.predict(rng.random((1, 10, 5), dtype=np.float32), verbose=0)
+    cold_start = time.perf_counter() - start
+
+    latency = {}
+    for batch in BATCHES:
+        X = rng.random((batch, 10, 5), dtype=np.float32)
+        model.predict(X, verbose=0)
+        times = []
+        for _ in range(rounds):
+            t0 = time.perf_counter()
+            model.predict(X, verbose=0)
+            times.append(time.perf_counter() - t0)
+        latency[batch] = float(np.median(times))
+
+    print(json.dumps({
+        "backend": loaded,
+        "cold_start": cold_start,
+        "latency": latency,
+        "rss_mb": psutil.Process().memory_info().rss / 2**20,
+        "output": model.predict(rng.random((4, 10, 5), dtype=np.float32), verbose=0).ravel().tolist(),
+    }))
+
+
+def run(backend, rounds):
+    env = dict(os.environ, TF_CPP_MIN_LOG_LEVEL="3")
+    out = subprocess.run([sys.executable, "-m", "benchmarks.bench_inference_backends", "--child", backend,
+                          "--rounds", str(rounds)], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(rounds):
+    results = [run(backend, rounds) for backend in BACKENDS]
+    keras_out = results[0]["output"]
+
+    print(f"{'backend':<8} {'cold start':>11} " + " ".join(f"{'batch ' + str(b):>10}" for b in BATCHES) + f" {'RSS':>9}")
+    for r in results:
+        lat = " ".join(f"{r['latency'][str(b)] * 1e3:>8.2f}ms" for b in BATCHES)
+        print(f"{r['backend']:<8} {r['cold_start']:>10.2f}s {lat} {r['rss_mb']:>7.0f}MB")
+    for r in results[1:]:
+        diff = max(abs(a - b) for a, b in zip(keras_out, r["output"]))
+        print(f"max |keras - {r['backend']}| on the same windows: {diff:.2e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark LSTM inference backends")
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--child", choices=BACKENDS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.child, args.rounds)
+    else:
+        main(args.rounds)
@@ -0,0 +1,59 @@
+"""
+Compares loading metrics from the columnar store with pd.read_csv.
+
+Usage: python -m benchmarks.bench_metric_store [--rows 1000000]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.metric_store import MetricStore, METRIC_COLUMNS, import_csv
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main(rows):
+    with tempfile.TemporaryDirectory() as tmp:
+        # A rates file, so import_csv stores the values as written
+        csv_path = os.path.join(tmp, "metrics_rates.csv")
+        timestamps = pd.date_range("2025-12-01", periods=rows, freq="1s")
+        df = pd.DataFrame(np.random.rand(rows, len(METRIC_COLUMNS)) * 100, columns=METRIC_COLUMNS)
+        df.insert(0, "timestamp", timestamps)
+        df.to_csv(csv_path, index=False)
+
+        store = MetricStore(os.path.join(tmp, "store"))
+        imported, t_import = timed(lambda: import_csv(csv_path, store))
+
+        csv_df, t_csv = timed(lambda: pd.read_csv(csv_path, parse_dates=["timestamp"]))
+        store_df, t_store = timed(lambda: store.read_range())
+        mid = timestamps[rows // 2]
+        hour_df, t_hour = timed(lambda: store.read_range(mid, mid + pd.Timedelta(hours=1)))
+
+        assert len(store_df) == len(csv_df) == imported
+        assert np.allclose(store_df[METRIC_COLUMNS].to_numpy(), csv_df[METRIC_COLUMNS].to_numpy(), rtol=1e-6)
+
+        csv_mb = os.path.getsize(csv_path) / 1e6
+        store_mb = sum(os.path.getsize(os.path.join(d, f))
+                       for d, _, files in os.walk(store.root) for f in files) / 1e6
+
+        print(f"rows:                 {rows}")
+        print(f"size on disk:         csv {csv_mb:.1f} MB, store {store_mb:.1f} MB")
+        print(f"one-off import:       {t_import:.2f}s")
+        print(f"pd.read_csv (full):   {t_csv * 1e3:.1f} ms")
+        print(f"store (full):         {t_store * 1e3:.1f} ms  ({t_csv / t_store:.0f}x)")
+        print(f"store (1h range):     {t_hour * 1e3:.2f} ms  ({len(hour_df)} rows)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark metric store vs CSV loading")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+    main(args.rows)
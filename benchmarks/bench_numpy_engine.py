@@ -0,0 +1,86 @@
+"""
+Checks the NumPy inference engine against Keras and times both.
+
+Correctness: models/lstm_model.h5 plus small random GRU (both reset_after
+modes), stacked LSTM and dropout models saved to a temporary .h5; every output
+must match Keras within 1e-5.
+
+Speed: NumpyModel.predict vs lstm_model.predict at batch sizes 1, 16 and 256.
+
+Usage: python -m benchmarks.bench_numpy_engine [--rounds 200]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from src.numpy_engine import NumpyModel
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODEL_PATH = os.path.join(ROOT, "models", "lstm_model.h5")
+TOLERANCE = 1e-5
+BATCHES = (1, 16, 256)
+
+
+def random_models():
+    from tensorflow.keras.models import Sequential
+    from tensorflow.keras.layers import LSTM, GRU, Dense, Dropout, Input
+
+    yield "gru reset_after", Sequential([Input((10, 5)), GRU(32), Dense(1, activation="sigmoid")])
+    yield "gru reset_before", Sequential([Input((10, 5)), GRU(32, reset_after=False), Dense(1, activation="sigmoid")])
+    yield "lstm 2 layers", Sequential([Input((10, 5)), LSTM(32, return_sequences=True), Dropout(0.2),
+                                       LSTM(16), Dense(1, activation="sigmoid")])
+
+
+def max_error(keras_model, engine, rng):
+    worst = 0.0
+    for batch in BATCHES:
+        # Scaled inputs live in [0, 1]; go a little wider to exercise saturation
+        X = rng.uniform(-1.0, 2.0, (batch, 10, 5)).astype(np.float32)
+        worst = max(worst, float(np.abs(engine.predict(X) - keras_model.predict(X, verbose=0)).max()))
+    return worst
+
+
+def median_time(fn, rounds):
+    fn()
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times))
+
+
+def main(rounds):
+    from tensorflow.keras.models import load_model
+
+    rng = np.random.default_rng(0)
+    keras_model = load_model(MODEL_PATH)
+    engine = NumpyModel.from_h5(MODEL_PATH)
+
+    err = max_error(keras_model, engine, rng)
+    assert err < TOLERANCE, f"lstm_model.h5 differs from Keras by {err}"
+    print(f"{'lstm_model.h5':<18} max |numpy - keras| = {err:.1e}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, model in random_models():
+            path = os.path.join(tmp, "model.h5")
+            model.save(path)
+            err = max_error(model, NumpyModel.from_h5(path), rng)
+            assert err < TOLERANCE, f"{name} differs from Keras by {err}"
+            print(f"{name:<18} max |numpy - keras| = {err:.1e}")
+
+    print(f"\n{'batch':>5} {'keras predict':>14} {'numpy':>10} {'speedup':>8}")
+    for batch in BATCHES:
+        X = rng.random((batch, 10, 5), dtype=np.float32)
+        t_keras = median_time(lambda: keras_model.predict(X, verbose=0), max(10, rounds // 10))
+        t_numpy = median_time(lambda: engine.predict(X), rounds)
+        print(f"{batch:>5} {t_keras * 1e3:>12.2f}ms {t_numpy * 1e3:>8.3f}ms {t_keras / t_numpy:>7.0f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check and benchmark the NumPy LSTM engine")
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+    main(args.rounds)
@@ -0,0 +1,71 @@
+"""
+Compares the old one-query-at-a-time Prometheus fetch with the pooled,
+concurrent PrometheusFetcher, against the local stub server.
+
+Usage: python -m benchmarks.bench_prometheus_fetch [--latency 0.05] [--rounds 20]
+"""
+import argparse
+import time
+
+import requests
+
+from benchmarks.prom_stub import start_stub
+from data.live_metrics import PrometheusFetcher, QUERIES
+
+
+def main(latency, rounds):
+    server, base_url, counters = start_stub(latency=latency, fail_on=("transmit_errs",))
+    url = base_url + "/api/v1/query"
+    try:
+        fetcher = PrometheusFetcher(url=url, ttl=0)
+        values = fetcher.fetch_all()
+        assert fetcher.last_errors.keys() == {"error_rate"}, fetcher.last_errors
+        assert all(values[k] > 0 for k in QUERIES if k != "error_rate")
+        print(f"error isolation:   error_rate failed alone ({fetcher.last_errors['error_rate'][:40]}...)")
+
+        healthy = PrometheusFetcher(url=url, ttl=0)
+        healthy.queries.pop("error_rate")
+        sequential = dict(QUERIES)
+        sequential.pop("error_rate")
+
+        # The previous implementation: new connection per query, one after another
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for q in sequential.values():
+                requests.get(url, params={"query": q}).json()["data"]["result"]
+        t_seq = (time.perf_counter() - start) / rounds
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            healthy.fetch_all()
+        t_par = (time.perf_counter() - start) / rounds
+
+        cached = PrometheusFetcher(url=url, ttl=15)
+        cached.queries.pop("error_rate")
+        before = counters.get("/api/v1/query", 0)
+        for _ in range(rounds):
+            cached.get()
+        cached_requests = counters["/api/v1/query"] - before
+        assert cached_requests == len(cached.queries), cached_requests
+
+        # A round with a failed query is not cached: the next refresh retries
+        failing = PrometheusFetcher(url=url, ttl=15)
+        before = counters["/api/v1/query"]
+        failing.get()
+        failing.get()
+        assert counters["/api/v1/query"] - before == 2 * len(QUERIES)
+
+        print(f"stub latency:      {latency * 1e3:.0f} ms per request, {len(sequential)} queries")
+        print(f"sequential:        {t_seq * 1e3:.1f} ms per refresh")
+        print(f"concurrent pooled: {t_par * 1e3:.1f} ms per refresh ({t_seq / t_par:.1f}x)")
+        print(f"TTL cache:         {rounds} refreshes -> {cached_requests} HTTP requests")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark Prometheus fetching")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    main(args.latency, args.rounds)
@@ -0,0 +1,101 @@
+"""
+Raw history snapshot cost: deque of sample dicts vs the RingBuffer.
+
+For each capacity, both are filled with that many 2 s samples and then read
+the way a dashboard render does:
+
+    deque      pd.DataFrame(list(deque)) + pd.to_datetime (the old
+               get_latest_metrics_df)
+    frame      RingBuffer.frame(): column copies, what the collector hands out
+    frame/view RingBuffer.frame(copy=False): a DataFrame over the buffer itself
+    view       RingBuffer.view(): the raw NumPy slices
+
+Also reported: the cost of one append and the memory each layout holds.
+
+Usage: python -m benchmarks.bench_ring_buffer [--capacities 200 10000 1000000]
+"""
+import argparse
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from src.metric_store import METRIC_COLUMNS
+from src.ring_buffer import RingBuffer
+
+
+def samples(n, seed=0):
+    rng = np.random.default_rng(seed)
+    start = datetime.now() - timedelta(seconds=2 * n)
+    values = rng.uniform(0, 100, (n, len(METRIC_COLUMNS)))
+    return [dict(timestamp=start + timedelta(seconds=2 * i), **dict(zip(METRIC_COLUMNS, row.tolist())))
+            for i, row in enumerate(values)]
+
+
+def best_of(fn, budget=1.0, max_runs=50):
+    """Best time of up to `max_runs` calls, stopping after ~`budget` seconds."""
+    best, spent, runs = float("inf"), 0.0, 0
+    while runs < max_runs and (runs < 3 or spent < budget):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best, spent, runs = min(best, elapsed), spent + elapsed, runs + 1
+    return best
+
+
+def filled(kind, capacity):
+    """(container, bytes held): the deque holds the sample dicts, the ring only arrays."""
+    tracemalloc.start()
+    rows = samples(capacity)
+    if kind == "deque":
+        container = deque(rows, maxlen=capacity)
+    else:
+        container = RingBuffer(capacity)
+        for row in rows:
+            container.append(pd.Timestamp(row["timestamp"]).value, [row[c] for c in METRIC_COLUMNS])
+        del rows
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return container, size
+
+
+def old_snapshot(history):
+    df = pd.DataFrame(list(history))
+    df["timestamp"] = pd.to_datetime(df["timestamp"])
+    return df
+
+
+def main(capacities):
+    print(f"{'capacity':>9} {'read':<11} {'ms':>10}")
+    for capacity in capacities:
+        history, deque_bytes = filled("deque", capacity)
+        ring, ring_bytes = filled("ring", capacity)
+        # Same content, same column order
+        assert np.allclose(old_snapshot(history)[METRIC_COLUMNS].to_numpy(), ring.frame()[METRIC_COLUMNS].to_numpy())
+
+        reads = {
+            "deque": lambda: old_snapshot(history),
+            "frame": lambda: ring.frame(),
+            "frame/view": lambda: ring.frame(copy=False),
+            "view": lambda: ring.view(),
+        }
+        for name, read in reads.items():
+            print(f"{capacity:>9} {name:<11} {best_of(read) * 1e3:>10.3f}")
+
+        sample = history[-1]
+        row = [sample[c] for c in METRIC_COLUMNS]
+        ts = pd.Timestamp(sample["timestamp"]).value
+        append_deque = best_of(lambda: [history.append(sample) for _ in range(1000)]) / 1000
+        append_ring = best_of(lambda: [ring.append(ts, row) for _ in range(1000)]) / 1000
+        print(f"{'':>9} append: deque {append_deque * 1e6:.2f} µs, ring {append_ring * 1e6:.2f} µs; "
+              f"memory: deque {deque_bytes / 1e6:.2f} MB, ring {ring_bytes / 1e6:.2f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark raw history snapshots")
+    parser.add_argument("--capacities", type=int, nargs="+", default=[200, 10_000, 1_000_000])
+    args = parser.parse_args()
+    main(args.capacities)
@@ -0,0 +1,72 @@
+"""
+Fallback anomaly detection: RuleBasedDetector vs the old row-by-row detector.
+
+IterrowsDetector is the SimpleAnomalyDetector the dashboard used before
+(X.iterrows(), hard-coded 85/80/70). Both run on the same random frames,
+with a share of rows pushed over each threshold; the codes must be
+identical.
+
+Usage: python -m benchmarks.bench_rules [--rows 200 10000 100000]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.metric_store import METRIC_COLUMNS
+from src.rules import RuleBasedDetector
+
+
+class IterrowsDetector:
+    def predict(self, X):
+        predictions = []
+        for _, row in X.iterrows():
+            cpu = row.get('cpu_usage', 0)
+            memory = row.get('memory_usage', 0)
+
+            if cpu > 85 or memory > 80:
+                predictions.append(-1)
+            elif cpu > 70 or memory > 70:
+                predictions.append(0)
+            else:
+                predictions.append(1)
+        return np.array(predictions)
+
+
+def make_frame(n, seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.uniform(0, 100, (n, len(METRIC_COLUMNS))).astype(np.float32), columns=METRIC_COLUMNS)
+    # Exact threshold values too, where > and >= would differ
+    X.loc[X.index[::97], "cpu_usage"] = 85.0
+    X.loc[X.index[::89], "memory_usage"] = 70.0
+    return X
+
+
+def best_of(fn, runs):
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(sizes):
+    rules = RuleBasedDetector()
+    print(f"{'rows':>8} {'iterrows ms':>12} {'rules ms':>9} {'speedup':>8}  codes -1/0/1")
+    for n in sizes:
+        X = make_frame(n)
+        runs = 3 if n <= 100_000 else 1
+        slow, expected = best_of(lambda: IterrowsDetector().predict(X), runs)
+        fast, codes = best_of(lambda: rules.predict(X), max(runs, 5))
+        assert np.array_equal(codes, expected), "rule engine disagrees with the iterrows detector"
+        counts = "/".join(str(int((codes == c).sum())) for c in (-1, 0, 1))
+        print(f"{n:>8} {slow * 1e3:>12.1f} {fast * 1e3:>9.3f} {slow / fast:>7.0f}x  {counts}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the rule-based anomaly detector")
+    parser.add_argument("--rows", type=int, nargs="+", default=[200, 10_000, 100_000])
+    args = parser.parse_args()
+    main(args.rows)
@@ -0,0 +1,86 @@
+"""
+Streaming (stateful) scoring vs rescoring full windows.
+
+Accuracy: streaming scores against the exact windowed model on a random walk,
+for several resync intervals (resync_every=1 is exact by construction).
+
+Speed: one new sample for each of --hosts hosts per tick, on one core (BLAS
+limited to one thread): StreamingScorer.update vs NumpyModel.predict on the
+hosts' latest windows.
+
+Usage: python -m benchmarks.bench_streaming_scorer [--hosts 100 500 1000] [--ticks 200]
+"""
+import os
+
+# One core: the point is how many hosts a single scoring process can keep up with
+for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+    os.environ.setdefault(var, "1")
+
+import argparse
+import time
+
+import numpy as np
+
+from src.numpy_engine import NumpyModel
+from src.streaming_scorer import StreamingScorer
+from src.windowing import sliding_windows
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODEL_PATH = os.path.join(ROOT, "models", "lstm_model.h5")
+TIMESTEPS = 10
+
+
+def random_walk(rng, n, hosts):
+    steps = rng.normal(0.0, 0.03, (n, hosts, 5)).astype(np.float32)
+    return np.clip(0.5 + np.cumsum(steps, axis=0), 0.0, 1.0)
+
+
+def accuracy(model, rng):
+    X = random_walk(rng, 2000, 1)[:, 0]
+    exact = model.predict(sliding_windows(X, TIMESTEPS))[:, 0]
+    print(f"{'resync_every':>12} {'max drift':>10} {'mean drift':>11} {'steps per sample':>17}")
+    for resync_every in (1, 5, 10, 20, 50):
+        scorer = StreamingScorer(model, TIMESTEPS, resync_every)
+        got = scorer.feed("host", np.arange(len(X)), X)[TIMESTEPS - 1:]
+        drift = np.abs(got - exact)
+        steps = (scorer.steps + scorer.resyncs * TIMESTEPS) / len(got)
+        print(f"{resync_every:>12} {drift.max():>10.4f} {drift.mean():>11.4f} {steps:>17.1f}")
+
+
+def throughput(model, rng, hosts, ticks):
+    X = random_walk(rng, ticks + TIMESTEPS, hosts)
+    names = [f"host-{i:05d}" for i in range(hosts)]
+
+    scorer = StreamingScorer(model, TIMESTEPS)
+    for t in range(TIMESTEPS):
+        scorer.update(names, [t] * hosts, X[t])
+    start = time.perf_counter()
+    for t in range(TIMESTEPS, TIMESTEPS + ticks):
+        scorer.update(names, [t] * hosts, X[t])
+    t_stream = (time.perf_counter() - start) / ticks
+
+    windows = np.ascontiguousarray(np.moveaxis(X, 1, 0))  # (hosts, time, features)
+    start = time.perf_counter()
+    for t in range(TIMESTEPS, TIMESTEPS + ticks):
+        model.predict(windows[:, t - TIMESTEPS + 1:t + 1])
+    t_window = (time.perf_counter() - start) / ticks
+
+    print(f"{hosts:>6} {t_window * 1e3:>13.2f}ms {t_stream * 1e3:>12.2f}ms "
+          f"{t_window / t_stream:>7.1f}x {hosts / t_stream:>14,.0f}")
+
+
+def main(hosts, ticks):
+    rng = np.random.default_rng(0)
+    model = NumpyModel.from_h5(MODEL_PATH)
+    accuracy(model, rng)
+    print(f"\n{'hosts':>6} {'window rescore':>15} {'streaming':>14} {'speedup':>8} {'samples/s/core':>14}")
+    for n in hosts:
+        throughput(model, rng, n, ticks)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the streaming LSTM scorer")
+    parser.add_argument("--hosts", type=int, nargs="+", default=[100, 500, 1000])
+    parser.add_argument("--ticks", type=int, default=200)
+    args = parser.parse_args()
+    main(args.hosts, args.ticks)
@@ -0,0 +1,57 @@
+"""
+Compares the strided sliding-window builder with the list comprehension
+that create_lstm / update_live_data used before.
+
+Usage: python -m benchmarks.bench_windowing [--rows 10000 100000 1000000]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from src.windowing import make_sequences
+
+
+def comprehension_sequences(X, y, timesteps):
+    X_seq, y_seq = [], []
+    for i in range(len(X) - timesteps):
+        X_seq.append(X[i:i+timesteps])
+        y_seq.append(y[i+timesteps])
+    return np.array(X_seq), np.array(y_seq)
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(rows, timesteps, features, repeat):
+    print(f"{'rows':>10} {'dtype':>8} {'comprehension':>15} {'strided':>12} {'speedup':>10}")
+    for n in rows:
+        for dtype in (np.float32, np.float64):
+            X = np.random.rand(n, features).astype(dtype)
+            y = np.random.randint(0, 2, n)
+
+            X_ref, y_ref = comprehension_sequences(X, y, timesteps)
+            X_new, y_new = make_sequences(X, y, timesteps, dtype=dtype)
+            assert np.array_equal(X_ref, X_new) and np.array_equal(y_ref, y_new)
+            del X_ref, y_ref
+
+            t_old = best_of(lambda: comprehension_sequences(X, y, timesteps), repeat)
+            t_new = best_of(lambda: make_sequences(X, y, timesteps, dtype=dtype), repeat)
+            print(f"{n:>10} {np.dtype(dtype).name:>8} {t_old * 1e3:>13.1f}ms "
+                  f"{t_new * 1e3:>10.3f}ms {t_old / t_new:>9.0f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark LSTM sequence windowing")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--timesteps", type=int, default=10)
+    parser.add_argument("--features", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    main(args.rows, args.timesteps, args.features, args.repeat)
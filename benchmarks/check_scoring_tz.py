@@ -0,0 +1,67 @@
+"""
+Checks that the scoring service picks up agent rows whatever the host's time
+zone is.
+
+Agents stamp samples with a naive datetime.now(), while the service's first
+pass starts `lookback` before time.time_ns(). For each zone, a child process
+(TZ set to the zone) writes agent-style rows through a StoreSink into a
+temporary store, runs one ScoringService pass and checks that every row was
+scored. Zones west of UTC used to score nothing.
+
+Usage: python -m benchmarks.check_scoring_tz [--zones UTC America/Los_Angeles Asia/Tokyo]
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from src.metric_store import MetricStore, METRIC_COLUMNS, LOCAL_TZ
+from src.metric_writer import StoreSink
+from src.scoring_service import ScoringService, results_store
+
+
+def check(rows):
+    root = tempfile.mkdtemp()
+    try:
+        store = MetricStore(os.path.join(root, "store"))
+        now = datetime.now()
+        values = np.random.default_rng(0).uniform(0, 100, (rows, len(METRIC_COLUMNS)))
+        StoreSink(store).write_rows([[now - timedelta(seconds=2 * (rows - i))] + row.tolist()
+                                     for i, row in enumerate(values)])
+        service = ScoringService(store, results_store(os.path.join(root, "results")))
+        return service.run_once()
+    finally:
+        shutil.rmtree(root)
+
+
+def main(zones, rows):
+    failed = []
+    for zone in zones:
+        result = subprocess.run([sys.executable, "-m", "benchmarks.check_scoring_tz", "--child", "--rows", str(rows)],
+                                env={**os.environ, "TZ": zone}, capture_output=True, text=True)
+        lines = (result.stdout.strip() or result.stderr.strip()).splitlines()
+        scored = lines[-1] if lines else f"exit code {result.returncode}"
+        print(f"{zone:<22} {scored}")
+        if result.returncode != 0:
+            failed.append(zone)
+    if failed:
+        raise SystemExit(f"rows left unscored under: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check scoring under several host time zones")
+    parser.add_argument("--zones", nargs="+", default=["UTC", "America/Los_Angeles", "Asia/Tokyo"])
+    parser.add_argument("--rows", type=int, default=20)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        scored = check(args.rows)
+        print(f"{scored}/{args.rows} rows scored ({LOCAL_TZ})")
+        sys.exit(0 if scored == args.rows else 1)
+    main(args.zones, args.rows)
@@ -0,0 +1,101 @@
+"""
+Load generator for the ingest server.
+
+Starts `ingest_server.py` in a subprocess (one process, so one core) against
+a temporary store, then simulates N agents, each pushing one sample per
+interval over its own connection. Reports delivered frames/s, ack latency
+and the server's CPU usage.
+
+Usage: python -m benchmarks.load_ingest [--agents 1000] [--interval 1] [--duration 30]
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import psutil
+
+from src.ingest import encode_frame, raise_fd_limit, ACK, DEFAULT_PORT
+from src.metric_store import MetricStore, METRIC_COLUMNS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def agent(index, port, interval, deadline, latencies, failures):
+    host = f"agent-{index:05d}"
+    # Spread connections and sends evenly over one interval
+    await asyncio.sleep(interval * index / max(1, agent.count))
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    except OSError:
+        failures.append(host)
+        return
+    next_send = time.monotonic()
+    while time.monotonic() < deadline:
+        row = [time.time_ns()] + list(np.random.rand(len(METRIC_COLUMNS)) * 100)
+        start = time.perf_counter()
+        writer.write(encode_frame(host, [row]))
+        await writer.drain()
+        if await reader.readexactly(1) != ACK:
+            failures.append(host)
+        latencies.append(time.perf_counter() - start)
+        next_send += interval
+        await asyncio.sleep(max(0.0, next_send - time.monotonic()))
+    writer.close()
+
+
+async def run_agents(n, port, interval, duration):
+    agent.count = n
+    latencies, failures = [], []
+    deadline = time.monotonic() + duration
+    await asyncio.gather(*(agent(i, port, interval, deadline, latencies, failures) for i in range(n)))
+    return latencies, failures
+
+
+def main(agents, interval, duration, port):
+    raise_fd_limit()
+    with tempfile.TemporaryDirectory() as tmp:
+        server = subprocess.Popen(
+            [sys.executable, os.path.join(ROOT, "ingest_server.py"), "--port", str(port),
+             "--store", tmp, "--report_interval", "0"],
+            stdout=subprocess.DEVNULL,
+        )
+        try:
+            time.sleep(2)
+            proc = psutil.Process(server.pid)
+            cpu_before = proc.cpu_times()
+            wall_start = time.perf_counter()
+
+            latencies, failures = asyncio.run(run_agents(agents, port, interval, duration))
+
+            wall = time.perf_counter() - wall_start
+            cpu_after = proc.cpu_times()
+            server_cpu = (cpu_after.user + cpu_after.system) - (cpu_before.user + cpu_before.system)
+        finally:
+            server.terminate()
+            server.wait()
+
+        store = MetricStore(tmp)
+        stored = sum(len(store.read_arrays(host=h)[0]) for h in store.hosts())
+        lat_ms = np.array(latencies) * 1e3
+
+        print(f"agents:             {agents} (1 sample every {interval}s, {duration}s run)")
+        print(f"frames acked:       {len(latencies)}  ({len(latencies) / wall:.0f}/s, target {agents / interval:.0f}/s)")
+        print(f"rows stored:        {stored} across {len(store.hosts())} host partitions")
+        print(f"ack latency:        p50 {np.percentile(lat_ms, 50):.2f} ms, p99 {np.percentile(lat_ms, 99):.2f} ms")
+        print(f"server CPU:         {100 * server_cpu / wall:.0f}% of one core")
+        print(f"failed agents:      {len(set(failures))}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the ingest server")
+    parser.add_argument("--agents", type=int, default=1000)
+    parser.add_argument("--interval", type=float, default=1.0)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT + 1)
+    args = parser.parse_args()
+    main(args.agents, args.interval, args.duration, args.port)
@@ -0,0 +1,89 @@
+"""
+Minimal stand-in for the Prometheus HTTP API, for exercising the fetchers
+without a real server.
+
+    /api/v1/query        instant vector, one sample per query
+    /api/v1/query_range  matrix; one point per `step` between start and end
+
+Every response is delayed by `latency` seconds; queries containing any of
+`fail_on`, and every request after the first `fail_after`, get HTTP 500.
+
+Usage: python -m benchmarks.prom_stub [--port 9091] [--latency 0.05]
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+MAX_POINTS = 11_000   # Prometheus' default per-series point limit
+
+
+def make_handler(latency=0.05, fail_on=(), counters=None, fail_after=None):
+    counters = counters if counters is not None else {}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def _reply(self, status, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = {k: v[0] for k, v in parse_qs(url.query).items()}
+            query = params.get("query", "")
+            counters[url.path] = counters.get(url.path, 0) + 1
+            time.sleep(latency)
+
+            failing = fail_after is not None and sum(counters.values()) > fail_after
+            if failing or any(token in query for token in fail_on):
+                return self._reply(500, {"status": "error", "error": "stub failure"})
+
+            # Deterministic value per query so results can be checked
+            base = sum(map(ord, query)) % 100
+            if url.path == "/api/v1/query":
+                result = [{"metric": {}, "value": [time.time(), str(float(base))]}]
+                return self._reply(200, {"status": "success", "data": {"resultType": "vector", "result": result}})
+
+            if url.path == "/api/v1/query_range":
+                start, end = float(params["start"]), float(params["end"])
+                step = float(str(params.get("step", "60")).rstrip("s"))
+                n = int((end - start) // step) + 1
+                if n > MAX_POINTS:
+                    return self._reply(400, {"status": "error", "error": "exceeded maximum resolution"})
+                values = [[start + i * step, str(base + (start + i * step) % 7)] for i in range(n)]
+                result = [{"metric": {}, "values": values}]
+                return self._reply(200, {"status": "success", "data": {"resultType": "matrix", "result": result}})
+
+            self._reply(404, {"status": "error", "error": "not found"})
+
+    return Handler
+
+
+def start_stub(port=0, latency=0.05, fail_on=(), fail_after=None):
+    """Starts the stub in a background thread. Returns (server, base_url, counters)."""
+    counters = {}
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(latency, fail_on, counters, fail_after))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}", counters
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stub Prometheus query API")
+    parser.add_argument("--port", type=int, default=9091)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(args.latency))
+    print(f"Stub Prometheus on http://127.0.0.1:{args.port}")
+    server.serve_forever()
@@ -1,29 +1,105 @@
-import requests
-import pandas as pd
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
 PROM_URL = "http://localhost:9090/api/v1/query"
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+QUERIES_PATH = os.environ.get("BPREDICTOR_PROMETHEUS_QUERIES",
+                              os.path.join(BASE_DIR, "../config/prometheus_queries.json"))
+
+TIMEOUT = (2.0, 5.0)     # connect, read seconds
+CACHE_TTL = 15.0         # default Prometheus scrape interval
+
+# Same queries as the range backfill in src/live_metrics.py
+with open(QUERIES_PATH) as f:
+    QUERIES = json.load(f)
+
+
+class PrometheusFetcher:
+    """
+    Runs all QUERIES concurrently over one pooled requests.Session.
+
+    A failing query only affects its own value (reported as 0.0 and listed
+    in `last_errors`). Complete results are cached for `ttl` seconds so
+    dashboards refreshing within one scrape interval don't hit Prometheus
+    again; a round with any failed query is not cached, so the next call retries.
+    """
+
+    def __init__(self, url=PROM_URL, queries=QUERIES, timeout=TIMEOUT, ttl=CACHE_TTL):
+        self.url = url
+        self.queries = dict(queries)
+        self.timeout = timeout
+        self.ttl = ttl
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=len(self.queries))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._pool = ThreadPoolExecutor(max_workers=len(self.queries), thread_name_prefix="prom")
+        self._lock = threading.Lock()
+        self._cached = None
+        self._cached_at = 0.0
+        self.last_errors = {}
+
+    def fetch_metric(self, query):
+        r = self.session.get(self.url, params={"query": query}, timeout=self.timeout)
+        r.raise_for_status()
+        result = r.json()["data"]["result"]
+        if not result:
+            return 0.0
+        return float(result[0]["value"][1])
+
+    def fetch_all(self):
+        """Returns {metric: value} for every query, fetched concurrently."""
+        futures = {name: self._pool.submit(self.fetch_metric, q) for name, q in self.queries.items()}
+        values, errors = {}, {}
+        for name, future in futures.items():
+            try:
+                values[name] = future.result()
+            except Exception as e:
+                values[name] = 0.0
+                errors[name] = str(e)
+        self.last_errors = errors
+        return values
+
+    def get(self):
+        """Cached fetch_all: one round of queries per `ttl` seconds at most."""
+        with self._lock:
+            if self._cached is not None and time.monotonic() - self._cached_at < self.ttl:
+                return dict(self._cached)
+            # Naive local time, like the agents' samples
+            result = {"timestamp": datetime.now(), **self.fetch_all()}
+            if self.last_errors:
+                self._cached = None
+            else:
+                self._cached, self._cached_at = result, time.monotonic()
+            return dict(result)
+
+    def close(self):
+        self._pool.shutdown(wait=False)
+        self.session.close()
+
+
+_fetcher = None
+_fetcher_lock = threading.Lock()
+
+
+def get_fetcher():
+    global _fetcher
+    with _fetcher_lock:
+        if _fetcher is None:
+            _fetcher = PrometheusFetcher()
+        return _fetcher
 
-QUERIES = {
-    "cpu_usage": "100 - (avg by(instance)(rate(node_cpu_seconds_total{mode='idle'}[1m])) * 100)",
-    "memory_usage": "(node_memory_Active_bytes / node_memory_MemTotal_bytes) * 100",
-    "disk_io": "rate(node_disk_io_time_seconds_total[1m])",
-    "network_latency": "rate(node_network_receive_errs_total[1m])",
-    "error_rate": "rate(node_network_transmit_errs_total[1m])"
-}
 
 def fetch_metric(query):
-    r = requests.get(PROM_URL, params={"query": query})
-    result = r.json()["data"]["result"]
-    if not result:
-        return 0.0
-    return float(result[0]["value"][1])
+    return get_fetcher().fetch_metric(query)
 
 def get_live_metrics():
-    data = {
-        "timestamp": datetime.utcnow(),
-    }
-    for k, q in QUERIES.items():
-        data[k] = fetch_metric(q)
-
-    return pd.DataFrame([data])
+    return pd.DataFrame([get_fetcher().get()])
@@ -1,22 +1,56 @@
-import psutil
-import pandas as pd
-import time
-from datetime import datetime
+import argparse
 
-print(" B-Predictor Agent Started (LIVE DEVICE DATA)")
+from src.live_agent import collect_metrics
+from src.metric_store import DEFAULT_HOST
+from src.metric_writer import BufferedWriter, CsvSink, StoreSink
+
+parser = argparse.ArgumentParser(description="Collect live device metrics")
+parser.add_argument("--interval", type=float, default=2.0, help="seconds between samples")
+parser.add_argument("--store", action="store_true",
+                    help="append to the columnar store (data/store) instead of data/metrics_rates.csv")
+parser.add_argument("--push", metavar="SERVER:PORT",
+                    help="send batches to an ingest server (spooled locally while it is unreachable)")
+parser.add_argument("--host", default=None,
+                    help=f"host name to tag samples with (default: {DEFAULT_HOST} for --store, hostname for --push)")
+parser.add_argument("--daily", action="store_true", help="write one CSV per day (data/metrics_rates-YYYY-MM-DD.csv)")
+parser.add_argument("--flush_rows", type=int, default=30, help="flush after this many buffered samples")
+parser.add_argument("--flush_interval", type=float, default=60.0, help="flush at least every N seconds")
+parser.add_argument("--fsync_interval", type=float, default=300.0, help="fsync at most every N seconds (0 = every flush)")
+parser.add_argument("--score", action="store_true",
+                    help="print the LSTM incident risk for every sample (streaming scorer, no TensorFlow)")
+args = parser.parse_args()
 
-while True:
-    data = {
-        "timestamp": datetime.now(),
-        "cpu_usage": psutil.cpu_percent(interval=1),
-        "memory_usage": psutil.virtual_memory().percent,
-        "disk_io": psutil.disk_io_counters().read_bytes / 1e6,
-        "network_latency": psutil.net_io_counters().bytes_sent / 1e6,
-        "error_rate": 0
-    }
+print(" B-Predictor Agent Started (LIVE DEVICE DATA)")
 
-    df = pd.DataFrame([data])
-    df.to_csv("data/metrics.csv", mode="a", header=False, index=False)
+if args.push:
+    from src.ingest import PushSink
+    server, port = args.push.rsplit(":", 1)
+    sink = PushSink(server, int(port), host=args.host)
+elif args.store:
+    sink = StoreSink(host=args.host or DEFAULT_HOST)
+else:
+    # Not metrics.csv: its disk_io/network_latency are cumulative MB, these are MB/s
+    sink = CsvSink("data/metrics_rates.csv", daily=args.daily)
+writer = BufferedWriter(sink, flush_rows=args.flush_rows, flush_interval=args.flush_interval,
+                        fsync_interval=args.fsync_interval)
+writer.install_signal_handlers()
 
-    time.sleep(2)
+scorer = None
+if args.score:
+    from src.streaming_scorer import get_streaming_scorer, input_columns
+    scorer = get_streaming_scorer()
+    score_columns = input_columns(scorer)
 
+try:
+    while not writer.stop_requested.is_set():
+        # Non-blocking: CPU % and disk/network MB/s are deltas since the previous sample
+        sample = collect_metrics()
+        writer.append(sample)
+        if scorer is not None:
+            risk = scorer.score(args.host or DEFAULT_HOST, sample["timestamp"],
+                                [sample[c] for c in score_columns])
+            print(f"{sample['timestamp']:%H:%M:%S} risk {'warming up' if risk is None else f'{risk:.1%}'}")
+        # Returns early on SIGTERM
+        writer.stop_requested.wait(args.interval)
+finally:
+    writer.close()
@@ -0,0 +1,24 @@
+import argparse
+import asyncio
+
+from src.ingest import IngestServer, DEFAULT_PORT
+from src.metric_store import MetricStore, STORE_DIR
+
+# Usage: python ingest_server.py [--port 9400]
+# Agents push to it with: python device_agent.py --push 127.0.0.1:9400
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Receive metric frames from device agents")
+    parser.add_argument("--bind", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--store", default=STORE_DIR, help="metric store root directory")
+    parser.add_argument("--flush_interval", type=float, default=1.0)
+    parser.add_argument("--report_interval", type=float, default=10.0)
+    args = parser.parse_args()
+
+    server = IngestServer(MetricStore(args.store), host=args.bind, port=args.port,
+                          flush_interval=args.flush_interval)
+    try:
+        asyncio.run(server.serve(report_interval=args.report_interval))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,38 @@
+import argparse
+import signal
+import threading
+
+from src.metric_store import MetricStore, STORE_DIR
+from src.scoring_service import ScoringService, results_store, RESULTS_DIR, SCORE_INTERVAL, LOOKBACK
+
+# Usage: python score_daemon.py [--interval 2]
+# Scores what the agents / ingest server write to data/store; the dashboard
+# (streamlit run run.py) then only reads data/results.
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score the metric store on a schedule for the dashboard")
+    parser.add_argument("--interval", type=float, default=SCORE_INTERVAL, help="seconds between scoring passes")
+    parser.add_argument("--hosts", nargs="+", default=None, help="hosts to score (default: every host in the store)")
+    parser.add_argument("--lookback", type=float, default=LOOKBACK,
+                        help="seconds of history to score, or replay as LSTM context, on start")
+    parser.add_argument("--resync_every", type=int, default=None,
+                        help="rebuild each host's LSTM state from its window every N samples (default: timesteps)")
+    parser.add_argument("--store", default=STORE_DIR, help="metric store root directory")
+    parser.add_argument("--results", default=RESULTS_DIR, help="results store root directory")
+    parser.add_argument("--once", action="store_true", help="run a single pass and exit")
+    args = parser.parse_args()
+
+    service = ScoringService(MetricStore(args.store), results_store(args.results), hosts=args.hosts,
+                             lookback=args.lookback, resync_every=args.resync_every)
+    if args.once:
+        rows = service.run_once()
+        service.write_heartbeat(args.interval)
+        print(f"Scored {rows} rows in {service.last_run_seconds:.2f}s")
+    else:
+        stop = threading.Event()
+        signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+        print(f" B-Predictor scoring service started (every {args.interval}s)")
+        try:
+            service.run(args.interval, stop)
+        except KeyboardInterrupt:
+            pass
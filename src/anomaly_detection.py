@@ -1,8 +1,9 @@
-from sklearn.ensemble import IsolationForest
 import pickle
 import os
 
 def train_anomaly(df):
+    from sklearn.ensemble import IsolationForest
+
     BASE_DIR = os.path.dirname(os.path.abspath(__file__))
     MODELS_DIR = os.path.join(BASE_DIR, "../models")
     os.makedirs(MODELS_DIR, exist_ok=True)
@@ -0,0 +1,149 @@
+"""
+Live Plotly charts with bounded payloads.
+
+A LiveChart keeps its figure (layout, threshold lines, trace styles) and
+refreshes only the trace data. Points are fed to per-trace M4 aggregates:
+for each time bucket the first, minimum, maximum and last point, which is
+all a line chart needs to draw that pixel column exactly. Only points newer
+than the last refresh are processed, and when the visible span needs more
+buckets than the chart has pixels, neighbouring buckets are merged (bucket
+size doubles). A figure therefore never holds more than ~4 points per pixel
+whatever the history length, and spikes are never dropped.
+"""
+import numpy as np
+
+CHART_WIDTH = 1000              # px of a full-width chart
+BASE_BUCKET_NS = 1_000_000      # bucket sizes are 1 ms * 2**k
+
+
+def _reduce(keys, t, v):
+    """
+    One row per distinct key. `t` and `v` are (n, 4) first/min/max/last
+    columns, rows sorted by key then time. NaNs never win min or max.
+    """
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    ends = np.r_[starts[1:], len(keys)] - 1
+    counts = np.diff(np.r_[starts, len(keys)])
+    segment = np.repeat(np.arange(len(starts)), counts)
+
+    def extreme(column, reduce):
+        # Row of each key's earliest extreme; all-NaN keys keep their first row
+        hit = np.flatnonzero(column == np.repeat(reduce.reduceat(column, starts), counts))
+        hit_segment = segment[hit]
+        first = np.diff(hit_segment, prepend=-1) != 0
+        rows = starts.copy()
+        rows[hit_segment[first]] = hit[first]
+        return rows
+
+    lowest, highest = extreme(v[:, 1], np.fmin), extreme(v[:, 2], np.fmax)
+    out_t = np.stack([t[starts, 0], t[lowest, 1], t[highest, 2], t[ends, 3]], axis=1)
+    out_v = np.stack([v[starts, 0], v[lowest, 1], v[highest, 2], v[ends, 3]], axis=1)
+    return keys[starts], out_t, out_v
+
+
+def m4(ts, values, width):
+    """One-shot M4 of a whole series: (timestamps, values) of at most ~4 * width points."""
+    series = M4Series(width)
+    series.extend(ts, values)
+    return series.points()
+
+
+class M4Series:
+    """Incremental M4 aggregates of one append-only series, at most `width` buckets."""
+
+    def __init__(self, width=CHART_WIDTH):
+        self.width = width
+        self.bucket_ns = BASE_BUCKET_NS
+        self.keys = np.empty(0, dtype=np.int64)
+        self.t = np.empty((0, 4), dtype=np.int64)
+        self.v = np.empty((0, 4), dtype=np.float64)
+        self.last_ns = None
+
+    def __len__(self):
+        return len(self.keys)
+
+    def extend(self, ts, values):
+        """Adds the points newer than the last one seen (ts: sorted int64 ns). Returns how many."""
+        ts = np.asarray(ts, dtype=np.int64)
+        values = np.asarray(values, dtype=np.float64)
+        if self.last_ns is not None:
+            new = slice(np.searchsorted(ts, self.last_ns, side="right"), None)
+            ts, values = ts[new], values[new]
+        if len(ts) == 0:
+            return 0
+
+        # Coarsen first so the whole span fits in `width` buckets, then reduce
+        # the new points once
+        first = self.t[0, 0] if len(self.keys) else ts[0]
+        factor = 1
+        while ts[-1] // (self.bucket_ns * factor) - first // (self.bucket_ns * factor) >= self.width:
+            factor *= 2
+        if factor > 1:
+            self.bucket_ns *= factor
+            if len(self.keys):
+                self.keys, self.t, self.v = _reduce(self.keys // factor, self.t, self.v)
+
+        keys = ts // self.bucket_ns
+        # Only the open (last) bucket can receive points; older ones are final
+        tail = len(self.keys) - 1 if len(self.keys) and self.keys[-1] == keys[0] else len(self.keys)
+        k, t, v = _reduce(np.r_[self.keys[tail:], keys],
+                          np.r_[self.t[tail:], np.repeat(ts[:, None], 4, axis=1)],
+                          np.r_[self.v[tail:], np.repeat(values[:, None], 4, axis=1)])
+        self.keys = np.r_[self.keys[:tail], k]
+        self.t = np.r_[self.t[:tail], t]
+        self.v = np.r_[self.v[:tail], v]
+        self.last_ns = int(ts[-1])
+        return len(ts)
+
+    def trim(self, start_ns):
+        """Drops buckets that ended before `start_ns`. Returns how many."""
+        keep = self.t[:, 3] >= start_ns
+        dropped = len(keep) - int(keep.sum())
+        if dropped:
+            self.keys, self.t, self.v = self.keys[keep], self.t[keep], self.v[keep]
+        return dropped
+
+    def points(self):
+        """(timestamps ns, values) to plot, in time order without repeats."""
+        t, v = self.t.copy(), self.v.copy()
+        # min and max go in the order they happened
+        swap = t[:, 1] > t[:, 2]
+        t[swap, 1:3] = t[swap][:, ::-1][:, 1:3]
+        v[swap, 1:3] = v[swap][:, ::-1][:, 1:3]
+        t, v = t.ravel(), v.ravel()
+        keep = np.r_[True, t[1:] != t[:-1]]
+        return t[keep], v[keep]
+
+
+class LiveChart:
+    """
+    A Plotly figure built once whose traces are refreshed from appended
+    points only. One M4Series per trace, in `figure.data` order.
+    """
+
+    def __init__(self, figure, width=CHART_WIDTH):
+        self.figure = figure
+        self.width = width
+        self.reset()
+
+    def reset(self):
+        """Forgets all points, for series that are rewritten rather than appended to."""
+        self.series = [M4Series(self.width) for _ in self.figure.data]
+
+    def update(self, ts_ns, columns, start_ns=None):
+        """
+        ts_ns: sorted int64 timestamps, columns: one value array per trace.
+        Points before `start_ns` leave the chart. Returns the figure.
+        """
+        changed = 0
+        for series, values in zip(self.series, columns):
+            changed += series.extend(ts_ns, values)
+            if start_ns is not None:
+                changed += series.trim(start_ns)
+        if changed:
+            with self.figure.batch_update():
+                for trace, series in zip(self.figure.data, self.series):
+                    t, v = series.points()
+                    trace.x = t.view("datetime64[ns]")
+                    trace.y = v
+        return self.figure
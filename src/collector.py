@@ -0,0 +1,131 @@
+import threading
+import time
+from datetime import datetime
+
+try:
+    from .history import TieredHistory, RAW_MINUTES
+except ImportError:
+    from history import TieredHistory, RAW_MINUTES
+
+SAMPLE_INTERVAL = 2.0     # seconds between readings
+HISTORY_SIZE = int(RAW_MINUTES * 60 / SAMPLE_INTERVAL)   # raw readings kept in the shared history
+LEASE_TTL = 60.0          # a session that stops rerunning for this long is released
+
+
+class MetricsCollector:
+    """
+    One background sampler per process feeding a lock-protected tiered
+    history (raw readings plus minute and hour rollups) that every dashboard
+    session reads from.
+
+    Sessions hold a lease (acquire/release, refreshed with touch). The thread
+    runs while at least one lease is alive; leases that are not refreshed
+    within `lease_ttl` expire, so closed browser tabs don't keep it running.
+    """
+
+    def __init__(self, sample_fn, interval=SAMPLE_INTERVAL, history=None, lease_ttl=LEASE_TTL):
+        self.sample_fn = sample_fn
+        self.interval = interval
+        self.lease_ttl = lease_ttl
+        self.last_update_time = None
+        self.history = history or TieredHistory(interval=interval)
+        self._lock = threading.Lock()
+        self._leases = {}
+        self._thread = None
+        self._stop = None
+
+    # ----- session leases -----
+    def acquire(self, session_id):
+        with self._lock:
+            self._leases[session_id] = time.monotonic()
+            if self._thread is None or not self._thread.is_alive() or self._stop.is_set():
+                self._stop = threading.Event()
+                self._thread = threading.Thread(target=self._run, args=(self._stop,), daemon=True)
+                self._thread.start()
+
+    def touch(self, session_id):
+        with self._lock:
+            if session_id in self._leases:
+                self._leases[session_id] = time.monotonic()
+
+    def release(self, session_id):
+        with self._lock:
+            self._leases.pop(session_id, None)
+            if not self._leases and self._stop is not None:
+                self._stop.set()
+
+    def is_active(self, session_id):
+        with self._lock:
+            return session_id in self._leases
+
+    @property
+    def viewers(self):
+        with self._lock:
+            return len(self._leases)
+
+    # ----- history access -----
+    def collect_now(self):
+        """Take one reading immediately (e.g. for a manual refresh)."""
+        sample = self.sample_fn()
+        with self._lock:
+            self.history.append(sample)
+            self.last_update_time = datetime.now()
+        return sample
+
+    def append(self, sample):
+        with self._lock:
+            self.history.append(sample)
+            self.last_update_time = datetime.now()
+
+    def load(self, timestamps_ns, values):
+        """Bulk-loads older rows (e.g. from the metric store) into the history tiers."""
+        with self._lock:
+            self.history.load(timestamps_ns, values)
+            self.last_update_time = datetime.now()
+
+    def frame(self, tier="raw"):
+        """One history tier as a DataFrame (see TieredHistory.frame)."""
+        with self._lock:
+            return self.history.frame(tier)
+
+    def latest(self):
+        with self._lock:
+            return self.history.raw.latest()
+
+    def __len__(self):
+        with self._lock:
+            return len(self.history)
+
+    # ----- sampler thread -----
+    def _expire_leases(self, stop):
+        cutoff = time.monotonic() - self.lease_ttl
+        with self._lock:
+            for session_id in [s for s, seen in self._leases.items() if seen < cutoff]:
+                del self._leases[session_id]
+            if not self._leases:
+                stop.set()
+
+    def _run(self, stop):
+        while not stop.is_set():
+            try:
+                self.collect_now()
+                wait = self.interval
+            except Exception as e:
+                print(f"Error collecting metrics: {e}")
+                wait = 5
+            if stop.wait(wait):
+                break
+            self._expire_leases(stop)
+
+
+_collector = None
+_collector_lock = threading.Lock()
+
+
+def get_collector(sample_fn):
+    """Returns the process-wide collector, creating it on first use."""
+    global _collector
+    with _collector_lock:
+        if _collector is None:
+            _collector = MetricsCollector(sample_fn)
+        return _collector
@@ -6,17 +6,11 @@ AI-powered system monitoring with live metrics collection
 import streamlit as st
 import pandas as pd
 import numpy as np
-import pickle
-import plotly.express as px
-import plotly.graph_objects as go
-from tensorflow.keras.models import load_model
 import time
 import json
 import base64
 from datetime import datetime, timedelta
-import threading
-import queue
-from collections import deque
+import uuid
 import os
 import sys
 
@@ -34,20 +28,21 @@ except ImportError:
         st.warning("⚠️ live_agent.py not found. Using simulated metrics.")
         
         # Define fallback functions
-        import psutil
         from datetime import datetime
+        # Same sampler as live_agent, so disk/network are MB/s rates here too
+        try:
+            from .sampler import MetricsSampler
+        except ImportError:
+            try:
+                from sampler import MetricsSampler
+            except ImportError:
+                MetricsSampler = None
+        _sampler = MetricsSampler() if MetricsSampler is not None else None
         
         def collect_metrics():
             """Fallback metrics collection if live_agent is missing"""
             try:
-                return {
-                    "timestamp": datetime.now(),
-                    "cpu_usage": psutil.cpu_percent(interval=1),
-                    "memory_usage": psutil.virtual_memory().percent,
-                    "disk_io": psutil.disk_io_counters().read_bytes / 1e6,
-                    "network_latency": psutil.net_io_counters().bytes_sent / 1e6,
-                    "error_rate": 0.0
-                }
+                return _sampler.sample()
             except:
                 # Return simulated data if psutil fails
                 return {
@@ -70,58 +65,84 @@ except ImportError:
                 yield history
                 time.sleep(2)
 
+try:
+    from .windowing import sliding_windows
+    from .inference_cache import InferenceCache
+    from .model_registry import registry, get_model, load_pickle, resolve_model_path
+    from .inference import load_forecaster, source_version, KERAS_FILENAME
+    from .collector import get_collector, HISTORY_SIZE
+    from .metric_store import MetricStore, DEFAULT_HOST, to_ns, to_ns_array
+    from .streaming_scorer import get_streaming_scorer, input_columns
+    from .scaling import load_scaler, SCALER_FILENAME
+    from .warmup import start_warmup
+    from .rules import RuleBasedDetector
+    from .scoring_service import service_status, read_scored
+    from .charts import LiveChart, CHART_WIDTH
+except ImportError:
+    from windowing import sliding_windows
+    from inference_cache import InferenceCache
+    from model_registry import registry, get_model, load_pickle, resolve_model_path
+    from inference import load_forecaster, source_version, KERAS_FILENAME
+    from collector import get_collector, HISTORY_SIZE
+    from metric_store import MetricStore, DEFAULT_HOST, to_ns, to_ns_array
+    from streaming_scorer import get_streaming_scorer, input_columns
+    from scaling import load_scaler, SCALER_FILENAME
+    from warmup import start_warmup
+    from rules import RuleBasedDetector
+    from scoring_service import service_status, read_scored
+    from charts import LiveChart, CHART_WIDTH
+
 # ---------- GLOBAL DATA STORE ----------
-# Use session state for real-time data persistence
-if 'metrics_history' not in st.session_state:
-    st.session_state.metrics_history = deque(maxlen=200)  # Keep last 200 readings
+# One collector per process; sessions only hold a lease on it and read snapshots
+collector = get_collector(collect_metrics)
 
-if 'last_update_time' not in st.session_state:
-    st.session_state.last_update_time = datetime.now()
+if 'collector_session_id' not in st.session_state:
+    st.session_state.collector_session_id = uuid.uuid4().hex
 
 if 'data_stream_active' not in st.session_state:
     st.session_state.data_stream_active = False
 
+if 'lstm_inference_cache' not in st.session_state:
+    st.session_state.lstm_inference_cache = InferenceCache()
+
+if 'live_charts' not in st.session_state:
+    st.session_state.live_charts = {}
+
 # ---------- REALTIME DATA COLLECTION FUNCTION ----------
+def warm_start_history():
+    """Fill the shared history from agent data in the metric store (rollups: whole horizon, raw: raw window)"""
+    try:
+        start = to_ns(datetime.now()) - int(collector.history.horizon * 1e9)
+        collector.load(*MetricStore().read_arrays(start=start, columns=collector.history.columns))
+    except Exception as e:
+        print(f"Could not read metric store: {e}")
+
 def start_realtime_data_collection():
-    """Start background thread for collecting real-time metrics"""
-    if not st.session_state.data_stream_active:
-        st.session_state.data_stream_active = True
-        
-        # Create a simple thread to update metrics periodically
-        def update_metrics():
-            while st.session_state.data_stream_active:
-                try:
-                    # Collect live metrics
-                    live_data = collect_metrics()
-                    
-                    # Add to history
-                    st.session_state.metrics_history.append(live_data)
-                    st.session_state.last_update_time = datetime.now()
-                    
-                    # Wait before next collection
-                    time.sleep(2)  # Match the 2-second interval
-                except Exception as e:
-                    print(f"Error collecting metrics: {e}")
-                    time.sleep(5)
-        
-        # Start thread
-        thread = threading.Thread(target=update_metrics, daemon=True)
-        thread.start()
+    """Join the shared collector (starts its sampler thread if this is the first viewer)"""
+    st.session_state.data_stream_active = True
+    if len(collector) == 0:
+        warm_start_history()
+    collector.acquire(st.session_state.collector_session_id)
 
 def stop_realtime_data_collection():
-    """Stop the data collection"""
+    """Leave the shared collector (its thread stops once no session is watching)"""
     st.session_state.data_stream_active = False
+    collector.release(st.session_state.collector_session_id)
+
+def get_last_update_time():
+    return collector.last_update_time or datetime.now()
 
 def get_latest_metrics_df():
-    """Convert metrics history to DataFrame"""
-    if len(st.session_state.metrics_history) == 0:
-        # If no live data yet, collect some now
+    """Snapshot of the shared raw metrics history as a DataFrame"""
+    if len(collector) == 0:
+        # If no live data yet, collect some now (sampling is non-blocking,
+        # so a short spacing is enough for usable CPU/rate deltas)
         for _ in range(5):
             try:
-                st.session_state.metrics_history.append(collect_metrics())
+                collector.collect_now()
             except:
                 # If collect_metrics fails, create dummy data
-                st.session_state.metrics_history.append({
+                collector.append({
                     "timestamp": datetime.now(),
                     "cpu_usage": np.random.uniform(20, 80),
                     "memory_usage": np.random.uniform(30, 90),
@@ -129,16 +150,37 @@ def get_latest_metrics_df():
                     "network_latency": np.random.uniform(5, 50),
                     "error_rate": 0.0
                 })
-            time.sleep(0.5)
-    
-    # Convert to DataFrame
-    df = pd.DataFrame(list(st.session_state.metrics_history))
+            time.sleep(0.1)
     
-    # Ensure timestamp is datetime
-    if 'timestamp' in df.columns:
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-    
-    return df
+    # Column copies straight from the raw ring buffer (datetime64 timestamps)
+    return collector.frame()
+
+# ---------- LIVE FRAGMENTS ----------
+# Live sections rerun on their own timers as fragments, so the CSS, sidebar and
+# static chrome render once. st.fragment needs Streamlit 1.37 (1.33-1.36 call
+# it experimental_fragment); older versions, or BPREDICTOR_FRAGMENTS=0, fall
+# back to full-page reruns.
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+FRAGMENTS = _fragment is not None and os.environ.get("BPREDICTOR_FRAGMENTS", "1") != "0"
+KPI_REFRESH = 2          # seconds; the collector samples every 2s
+CHART_REFRESH = 5        # charts cover HISTORY_SIZE samples (10 min by default)
+ANOMALY_REFRESH = 10
+FULL_REFRESH = 3         # whole page, without fragments
+# Live Metrics zoom -> seconds shown; longer views use the collector's rollups
+HISTORY_ZOOMS = {"Live": 0, "Last hour": 3600, "Last 24 hours": 86_400, "Last 30 days": 30 * 86_400}
+
+def live_fragment(render, run_every):
+    """Renders `render()` as a fragment rerun every `run_every` seconds while streaming"""
+    if not FRAGMENTS:
+        return render()
+    return _fragment(render, run_every=run_every if st.session_state.data_stream_active else None)()
+
+def live_chart(name, build, width=CHART_WIDTH):
+    """This session's LiveChart `name`; `build()` makes its figure on first use only"""
+    charts = st.session_state.live_charts
+    if name not in charts:
+        charts[name] = LiveChart(build(), width)
+    return charts[name]
 
 # ---------- PAGE CONFIG ----------
 st.set_page_config(
@@ -511,6 +553,9 @@ st.components.v1.html(particle_js, height=0)
 # ---------- ENHANCED TECH INTRO ----------
 def render_tech_intro():
     """Render high-tech animated intro"""
+    # Load plotly and the models in the background while the intro is on screen
+    start_warmup()
+    
     with st.container():
         st.markdown('<div class="intro-container">', unsafe_allow_html=True)
         
@@ -615,44 +660,52 @@ class BPredictorDashboard:
         self.df = None
         self.anomaly_model = None
         self.lstm_model = None
+        self.lstm_model_path = None
+        self.lstm_backend = None
+        self.scaler = None
+        self.scaler_path = None
         self.X_seq = None
         self.y_pred = None
-        
-        # Start live data collection
-        start_realtime_data_collection()
-        
-        self.load_models()
-        self.update_live_data()
+        self.live_risk = None
+        self._data_time = None
+        self._data_version = None
+        
+        # With score_daemon.py running this is a read-only view over its results
+        self.service = service_status()
+        if self.service is None:
+            # Start live data collection
+            start_realtime_data_collection()
+            self.load_models()
+        else:
+            st.session_state.data_stream_active = True
+            self.lstm_backend = self.service.get('backend')
+        self.refresh_live_data()
     
     def load_models(self):
-        """Load anomaly and LSTM models"""
+        """Load anomaly and LSTM models (loaded once per process by the model registry)"""
         try:
-            # Try to load models from the same directory or parent
-            model_paths = [
-                "models/anomaly_model.pkl",
-                "../models/anomaly_model.pkl",
-                "anomaly_model.pkl"
-            ]
-            
-            for path in model_paths:
-                try:
-                    self.anomaly_model = pickle.load(open(path, "rb"))
-                    break
-                except:
-                    continue
+            try:
+                self.anomaly_model, _ = get_model("anomaly_model.pkl", load_pickle)
+            except Exception:
+                self.anomaly_model = None
             
-            lstm_paths = [
-                "models/lstm_model.h5",
-                "../models/lstm_model.h5",
-                "lstm_model.h5"
-            ]
+            try:
+                # TFLite when an up-to-date export exists, otherwise Keras
+                self.lstm_model, self.lstm_model_path, self.lstm_backend = load_forecaster()
+            except Exception:
+                self.lstm_model = None
             
-            for path in lstm_paths:
+            # Scaler the LSTM was trained with (scaler.json, or the legacy scaler.pkl)
+            for filename in (SCALER_FILENAME, "scaler.pkl"):
                 try:
-                    self.lstm_model = load_model(path)
+                    self.scaler, self.scaler_path = get_model(filename, load_scaler)
                     break
-                except:
-                    continue
+                except Exception:
+                    self.scaler, self.scaler_path = None, None
+            keras_path = resolve_model_path(KERAS_FILENAME)
+            if (self.scaler is not None and self.scaler.model_version and keras_path
+                    and self.scaler.model_version != source_version(keras_path)):
+                st.warning("⚠️ models/scaler.json was saved for a different LSTM model; retrain to refresh both.")
             
             if self.anomaly_model and self.lstm_model:
                 st.session_state['models_loaded'] = True
@@ -667,27 +720,41 @@ class BPredictorDashboard:
     
     def create_fallback_models(self):
         """Create simple fallback models for demo purposes"""
-        # Simple anomaly detection based on thresholds
-        class SimpleAnomalyDetector:
-            def predict(self, X):
-                # Simple rule: if CPU > 85% or Memory > 80%, flag as anomaly
-                predictions = []
-                for _, row in X.iterrows():
-                    cpu = row.get('cpu_usage', 0)
-                    memory = row.get('memory_usage', 0)
-                    
-                    if cpu > 85 or memory > 80:
-                        predictions.append(-1)  # Anomaly
-                    elif cpu > 70 or memory > 70:
-                        predictions.append(0)   # Warning
-                    else:
-                        predictions.append(1)   # Normal
-                return np.array(predictions)
-        
-        self.anomaly_model = SimpleAnomalyDetector()
+        self.anomaly_model = RuleBasedDetector()
+    
+    def refresh_live_data(self, max_age=1.0):
+        """update_live_data, unless this run or another fragment did since the last new sample"""
+        if self.service is None and st.session_state.data_stream_active:
+            # Fragment reruns don't go through __init__, so keep the collector lease alive here
+            collector.touch(st.session_state.collector_session_id)
+        now = time.monotonic()
+        version = collector.last_update_time if self.service is None else None
+        if self._data_time is not None and (now - self._data_time < max_age
+                                            or (version is not None and version == self._data_version)):
+            return
+        self.update_live_data()
+        self._data_time, self._data_version = now, version
+    
+    def last_update_time(self):
+        """Time of the newest sample: the collector's, or the last one scored by score_daemon.py (None if none yet)"""
+        if self.service is None:
+            return get_last_update_time()
+        if self.df is not None and not self.df.empty:
+            return self.df['timestamp'].iloc[-1].to_pydatetime()
+        return None
+    
+    def update_chart(self, chart, columns, df=None):
+        """Feeds `columns` (one per trace) of `df` (the live window) to `chart`; returns its figure"""
+        df = self.df if df is None else df
+        timestamps = df['timestamp'].to_numpy('datetime64[ns]').view(np.int64)
+        return chart.update(timestamps, [df[c].to_numpy(np.float64) for c in columns],
+                            start_ns=timestamps[0] if len(timestamps) else None)
     
     def update_live_data(self):
         """Update with live metrics from the system"""
+        if self.service is not None:
+            self.load_scored_data()
+            return
         try:
             # Get live metrics DataFrame
             self.df = get_latest_metrics_df()
@@ -709,16 +776,35 @@ class BPredictorDashboard:
                                 return "Normal"
                         
                         self.df["anomaly_label"] = self.df["anomaly"].apply(map_anomaly)
+                        
+                        # The rule-based fallback says which rule fired
+                        if hasattr(self.anomaly_model, "explain"):
+                            rule_names = self.anomaly_model.explain(self.df[available_cols])
+                            self.df["anomaly_reason"] = pd.Series(rule_names).map(self.anomaly_model.reasons).fillna("").to_numpy()
                 
                 # LSTM sequences if we have enough data
                 TIMESTEPS = 10
                 if len(self.df) >= TIMESTEPS and all(col in self.df.columns for col in self.feature_cols):
-                    self.X_seq = np.array([self.df[self.feature_cols].iloc[i:i+TIMESTEPS].values 
-                                          for i in range(len(self.df)-TIMESTEPS)]).astype(np.float32)
+                    # Strided view over one float32 copy of the features, scaled in
+                    # place as in training; the last window has no following
+                    # sample to forecast, so it is dropped
+                    input_cols = (self.scaler.columns if self.scaler is not None and self.scaler.columns
+                                  else self.feature_cols)
+                    features = self.df[input_cols].to_numpy(dtype=np.float32, copy=True)
+                    if self.scaler is not None:
+                        self.scaler.transform(features, out=features)
+                    self.X_seq = sliding_windows(features, TIMESTEPS)[:-1]
                     
                     # Try to get predictions if we have a model
                     if hasattr(self, 'lstm_model') and self.lstm_model:
-                        self.y_pred = self.lstm_model.predict(self.X_seq).flatten()
+                        # Only windows not scored on a previous rerun reach the model
+                        end_times = self.df['timestamp'].to_numpy()[TIMESTEPS-1:-1]
+                        self.y_pred = st.session_state.lstm_inference_cache.predict(
+                            self.lstm_model, self.X_seq, end_times,
+                            model_key=(registry.version(self.lstm_model_path),
+                                       self.scaler_path and registry.version(self.scaler_path))
+                        )
+                        self.live_risk = self.score_latest()
                     else:
                         # Simulate predictions based on recent trends
                         self.y_pred = self.simulate_predictions()
@@ -731,6 +817,47 @@ class BPredictorDashboard:
             # Create minimal demo data if live collection fails
             self.create_demo_data()
     
+    def load_scored_data(self):
+        """Latest samples with the anomaly labels and LSTM risk written by score_daemon.py"""
+        hosts = self.service.get('hosts') or [DEFAULT_HOST]
+        host = DEFAULT_HOST if DEFAULT_HOST in hosts else hosts[0]
+        try:
+            self.df = read_scored(HISTORY_SIZE, host)
+        except Exception as e:
+            st.error(f"Error reading scoring results: {str(e)}")
+            self.create_demo_data()
+            return
+        
+        self.X_seq = None
+        self.y_pred = None
+        self.live_risk = None
+        if self.df.empty:
+            return
+        self.df["anomaly"] = self.df["anomaly"].astype(int)
+        self.df["anomaly_label"] = self.df["anomaly"].map({-1: "Critical", 0: "Warning"}).fillna("Normal")
+        
+        # Risk at a sample forecasts the next one, as the windows in update_live_data
+        TIMESTEPS = 10
+        risk = self.df["risk"].to_numpy()
+        if len(self.df) >= TIMESTEPS:
+            self.y_pred = risk[TIMESTEPS-1:-1]
+        scored = risk[~np.isnan(risk)]
+        if len(scored):
+            self.live_risk = float(scored[-1])
+    
+    def score_latest(self):
+        """Feeds samples not seen yet to the shared streaming scorer; returns the newest risk"""
+        try:
+            scorer = get_streaming_scorer()
+        except Exception:
+            return None
+        timestamps = to_ns_array(self.df['timestamp'])
+        last = scorer.last_timestamp(DEFAULT_HOST)
+        new = slice(None) if last is None else slice(np.searchsorted(timestamps, last, side='right'), None)
+        if len(timestamps[new]):
+            scorer.feed(DEFAULT_HOST, timestamps[new], self.df[input_columns(scorer)].to_numpy(np.float32)[new])
+        return scorer.latest_score(DEFAULT_HOST)
+    
     def simulate_predictions(self):
         """Simulate predictions based on recent metric trends"""
         if len(self.df) < 5:
@@ -791,6 +918,9 @@ class BPredictorDashboard:
         # Data collection status
         status_color = "#00ff88" if st.session_state.data_stream_active else "#ffaa00"
         status_text = "ACTIVE" if st.session_state.data_stream_active else "READY"
+        last_update = self.last_update_time()
+        last_update = last_update.strftime('%H:%M:%S') if last_update else "no scored samples yet"
+        source = f"{collector.viewers} viewer(s)" if self.service is None else "score_daemon.py"
         
         st.sidebar.markdown(f"""
         <div style="background: rgba(10, 25, 47, 0.8); padding: 15px; border-radius: 10px; margin: 10px 0; border-left: 4px solid {status_color};">
@@ -799,7 +929,7 @@ class BPredictorDashboard:
                 <div style="font-family: 'Orbitron', sans-serif; color: {status_color};">DATA STREAM: {status_text}</div>
             </div>
             <div style="font-family: 'Exo 2', sans-serif; font-size: 0.8rem; color: #a0a0a0; margin-top: 5px;">
-                Last update: {st.session_state.last_update_time.strftime('%H:%M:%S')}
+                Last update: {last_update} • {source}
             </div>
         </div>
         """, unsafe_allow_html=True)
@@ -826,9 +956,48 @@ class BPredictorDashboard:
         </div>
         """, unsafe_allow_html=True)
         
-        # Get actual live metrics
-        if len(st.session_state.metrics_history) > 0:
-            latest = list(st.session_state.metrics_history)[-1]
+        with st.sidebar:
+            live_fragment(self.render_sidebar_metrics, KPI_REFRESH)
+        
+        # Data collection controls
+        st.sidebar.markdown("---")
+        col1, col2 = st.sidebar.columns(2)
+        with col1:
+            if st.button(" Refresh", use_container_width=True):
+                # Force immediate data collection
+                try:
+                    collector.collect_now()
+                    st.rerun()
+                except Exception as e:
+                    st.error(f"Error collecting: {e}")
+        
+        with col2:
+            if st.button(" Stop", use_container_width=True):
+                stop_realtime_data_collection()
+                st.rerun()
+        
+        # Model cache statistics (shared by all sessions in this process)
+        model_stats = registry.stats().values()
+        if model_stats:
+            loads = sum(m['loads'] for m in model_stats)
+            hits = sum(m['hits'] for m in model_stats)
+            saved = sum(m['saved_seconds'] for m in model_stats)
+            st.sidebar.caption(f"Model cache: {loads} loads, {hits} hits, ~{saved:.1f}s load time saved")
+        if self.lstm_backend:
+            st.sidebar.caption(f"LSTM inference backend: {self.lstm_backend}")
+        if self.service is not None:
+            st.sidebar.caption(f"Scores from score_daemon.py (pid {self.service['pid']}, "
+                               f"{self.service['rows_scored']} rows scored)")
+    
+    def render_sidebar_metrics(self):
+        """Latest reading cards in the sidebar"""
+        # Get actual live metrics (the scoring service's, when it runs)
+        if self.service is not None:
+            self.refresh_live_data()
+            latest = self.df.iloc[-1].to_dict() if not self.df.empty else None
+        else:
+            latest = collector.latest()
+        if latest is not None:
             
             # Determine colors based on values
             cpu_color = "#ff3333" if latest.get('cpu_usage', 0) > 80 else "#ffaa00" if latest.get('cpu_usage', 0) > 60 else "#00ff88"
@@ -837,12 +1006,12 @@ class BPredictorDashboard:
             metrics_display = [
                 ("CPU Usage", f"{latest.get('cpu_usage', 0):.1f}%", cpu_color),
                 ("Memory", f"{latest.get('memory_usage', 0):.1f}%", mem_color),
-                ("Disk I/O", f"{latest.get('disk_io', 0):.1f} MB", "#00ffea"),
-                ("Network", f"{latest.get('network_latency', 0):.1f} MB", "#ff00ff")
+                ("Disk I/O", f"{latest.get('disk_io', 0):.1f} MB/s", "#00ffea"),
+                ("Network", f"{latest.get('network_latency', 0):.1f} MB/s", "#ff00ff")
             ]
             
             for name, value, color in metrics_display:
-                st.sidebar.markdown(f"""
+                st.markdown(f"""
                 <div class="metric-card" style="border-left-color: {color};">
                     <div style="font-size: 0.9rem; color: #a0a0a0;">{name}</div>
                     <div class="metric-value" style="color: {color};">{value}</div>
@@ -850,26 +1019,7 @@ class BPredictorDashboard:
                 """, unsafe_allow_html=True)
         else:
             # Show placeholder if no data yet
-            st.sidebar.info("Collecting initial metrics...")
-        
-        # Data collection controls
-        st.sidebar.markdown("---")
-        col1, col2 = st.sidebar.columns(2)
-        with col1:
-            if st.button(" Refresh", use_container_width=True):
-                # Force immediate data collection
-                try:
-                    live_data = collect_metrics()
-                    st.session_state.metrics_history.append(live_data)
-                    st.session_state.last_update_time = datetime.now()
-                    st.rerun()
-                except Exception as e:
-                    st.error(f"Error collecting: {e}")
-        
-        with col2:
-            if st.button(" Stop", use_container_width=True):
-                stop_realtime_data_collection()
-                st.rerun()
+            st.info("Collecting initial metrics...")
     
     def render_dashboard(self):
         """Enhanced dashboard view with LIVE data"""
@@ -877,18 +1027,50 @@ class BPredictorDashboard:
         st.markdown('<div class="main-header" style="font-size: 3rem;">LIVE SYSTEM OVERVIEW</div>', unsafe_allow_html=True)
         
         # Update data before displaying
-        self.update_live_data()
+        self.refresh_live_data()
         
         # REAL KPI Cards from live data
+        live_fragment(self.render_kpi_cards, KPI_REFRESH)
+        
+        # Auto-refresh notice
+        if st.session_state.data_stream_active:
+            st.markdown("""
+            <div style="background: rgba(0, 255, 234, 0.1); padding: 10px; border-radius: 10px; margin: 20px 0; text-align: center; border: 1px solid rgba(0, 255, 234, 0.3);">
+                <div style="display: flex; align-items: center; justify-content: center; gap: 10px;">
+                    <div style="width: 8px; height: 8px; background: #00ff88; border-radius: 50%; animation: pulse 1s infinite;"></div>
+                    <span style="font-family: 'Exo 2', sans-serif; color: #00ffea;">LIVE DATA STREAM ACTIVE • Auto-refreshing with new metrics</span>
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        # Charts Section with LIVE DATA
+        st.markdown("---")
+        live_fragment(self.render_live_charts, CHART_REFRESH)
+        
+        # Live anomalies table
+        st.markdown("---")
+        st.subheader(" Recent Anomalies Detected")
+        live_fragment(self.render_recent_anomalies, ANOMALY_REFRESH)
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    def render_kpi_cards(self):
+        """Live KPI cards"""
+        self.refresh_live_data()
+        
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            total_metrics = len(st.session_state.metrics_history)
+            # The in-process collector is idle while score_daemon.py runs
+            if self.service is None:
+                total_metrics, source = len(collector), "Collected in real-time"
+            else:
+                total_metrics, source = len(self.df), "Scored by score_daemon.py"
             st.markdown(f"""
             <div class="tech-card">
                 <div style="font-size: 0.9rem; color: #a0a0a0;"> Live Metrics</div>
                 <div class="metric-value" style="color: #00ffea;">{total_metrics}</div>
-                <div style="font-size: 0.8rem; color: #00ff88;">Collected in real-time</div>
+                <div style="font-size: 0.8rem; color: #00ff88;">{source}</div>
             </div>
             """, unsafe_allow_html=True)
         
@@ -941,65 +1123,54 @@ class BPredictorDashboard:
                 <div style="font-size: 0.8rem; color: {time_color};">Real-time stream</div>
             </div>
             """, unsafe_allow_html=True)
-        
-        # Auto-refresh notice
-        if st.session_state.data_stream_active:
-            st.markdown("""
-            <div style="background: rgba(0, 255, 234, 0.1); padding: 10px; border-radius: 10px; margin: 20px 0; text-align: center; border: 1px solid rgba(0, 255, 234, 0.3);">
-                <div style="display: flex; align-items: center; justify-content: center; gap: 10px;">
-                    <div style="width: 8px; height: 8px; background: #00ff88; border-radius: 50%; animation: pulse 1s infinite;"></div>
-                    <span style="font-family: 'Exo 2', sans-serif; color: #00ffea;">LIVE DATA STREAM ACTIVE • Auto-refreshing with new metrics</span>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        # Charts Section with LIVE DATA
-        st.markdown("---")
+    
+    def render_live_charts(self):
+        """Live CPU and memory charts"""
+        import plotly.graph_objects as go
+        self.refresh_live_data()
+
+        def usage_figure(metric, color, fill=None, annotate=True):
+            fig = go.Figure(go.Scatter(mode='lines', line=dict(color=color, width=3), fill=fill))
+
+            # Add threshold lines
+            for y, dash, color, label in ((80, "dash", "#ff3333", "Critical"), (60, "dot", "#ffaa00", "Warning")):
+                annotation = dict(annotation_text=label, annotation_position="bottom right") if annotate else {}
+                fig.add_hline(y=y, line_dash=dash, line_color=color, **annotation)
+
+            fig.update_layout(template="plotly_dark",
+                            xaxis_title="timestamp", yaxis_title=metric,
+                            plot_bgcolor='rgba(10, 25, 47, 0.8)',
+                            paper_bgcolor='rgba(10, 25, 47, 0.8)',
+                            showlegend=False)
+            return fig
+
         col1, col2 = st.columns(2)
-        
+
         with col1:
             st.subheader(" Live CPU Usage")
             if not self.df.empty and 'cpu_usage' in self.df.columns and 'timestamp' in self.df.columns:
-                fig = px.line(self.df, x="timestamp", y="cpu_usage", 
-                             title=f"Real CPU Usage: {self.df['cpu_usage'].iloc[-1]:.1f}%", 
-                             template="plotly_dark")
-                fig.update_traces(line=dict(color='#00ffea', width=3))
-                
-                # Add threshold lines
-                fig.add_hline(y=80, line_dash="dash", line_color="#ff3333", 
-                            annotation_text="Critical", annotation_position="bottom right")
-                fig.add_hline(y=60, line_dash="dot", line_color="#ffaa00", 
-                            annotation_text="Warning", annotation_position="bottom right")
-                
-                fig.update_layout(plot_bgcolor='rgba(10, 25, 47, 0.8)',
-                                paper_bgcolor='rgba(10, 25, 47, 0.8)',
-                                showlegend=False)
+                chart = live_chart("cpu", lambda: usage_figure("cpu_usage", '#00ffea'), CHART_WIDTH // 2)
+                fig = self.update_chart(chart, ["cpu_usage"])
+                fig.layout.title.text = f"Real CPU Usage: {self.df['cpu_usage'].iloc[-1]:.1f}%"
                 st.plotly_chart(fig, use_container_width=True)
             else:
                 st.info("Collecting CPU data...")
-        
+
         with col2:
             st.subheader(" Live Memory Usage")
             if not self.df.empty and 'memory_usage' in self.df.columns and 'timestamp' in self.df.columns:
-                fig = px.line(self.df, x="timestamp", y="memory_usage", 
-                             title=f"Real Memory Usage: {self.df['memory_usage'].iloc[-1]:.1f}%", 
-                             template="plotly_dark")
-                fig.update_traces(line=dict(color='#ff00ff', width=3), fill='tozeroy')
-                
-                # Add threshold lines
-                fig.add_hline(y=80, line_dash="dash", line_color="#ff3333")
-                fig.add_hline(y=60, line_dash="dot", line_color="#ffaa00")
-                
-                fig.update_layout(plot_bgcolor='rgba(10, 25, 47, 0.8)',
-                                paper_bgcolor='rgba(10, 25, 47, 0.8)',
-                                showlegend=False)
+                chart = live_chart("memory", lambda: usage_figure("memory_usage", '#ff00ff', 'tozeroy', False),
+                                   CHART_WIDTH // 2)
+                fig = self.update_chart(chart, ["memory_usage"])
+                fig.layout.title.text = f"Real Memory Usage: {self.df['memory_usage'].iloc[-1]:.1f}%"
                 st.plotly_chart(fig, use_container_width=True)
             else:
                 st.info("Collecting memory data...")
+    
+    def render_recent_anomalies(self):
+        """Last 5 anomalies of the live data"""
+        self.refresh_live_data()
         
-        # Live anomalies table
-        st.markdown("---")
-        st.subheader(" Recent Anomalies Detected")
         if not self.df.empty and 'anomaly_label' in self.df.columns:
             anomalies = self.df[self.df['anomaly_label'].isin(['Critical', 'Warning'])]
             if not anomalies.empty:
@@ -1020,6 +1191,9 @@ class BPredictorDashboard:
                                 <div style="font-size: 0.9rem; color: #a0a0a0;">
                                     CPU: {row.get('cpu_usage', 'N/A'):.1f}% | Memory: {row.get('memory_usage', 'N/A'):.1f}%
                                 </div>
+                                <div style="font-size: 0.8rem; color: {severity_color};">
+                                    {row.get('anomaly_reason', '')}
+                                </div>
                             </div>
                             <div style="font-size: 1.5rem; color: {severity_color};">
                                 {'' if row['anomaly_label'] == 'Critical' else ''}
@@ -1032,22 +1206,20 @@ class BPredictorDashboard:
         else:
             st.info("Anomaly detection initializing...")
         
-        st.markdown('</div>', unsafe_allow_html=True)
-        
     def render_live_metrics(self):
         """Enhanced metrics view with LIVE data"""
         st.markdown('<div class="dashboard-container">', unsafe_allow_html=True)
         st.markdown('<div class="main-header" style="font-size: 3rem;"> LIVE SYSTEM METRICS</div>', unsafe_allow_html=True)
         
         # Update with latest data
-        self.update_live_data()
+        self.refresh_live_data()
         
         if self.df.empty or len(self.df) < 2:
             st.warning(" Collecting initial live data... Please wait a few seconds.")
             # Try to collect some data now
             for _ in range(3):
                 try:
-                    st.session_state.metrics_history.append(collect_metrics())
+                    collector.collect_now()
                 except:
                     pass
                 time.sleep(1)
@@ -1055,9 +1227,53 @@ class BPredictorDashboard:
             st.rerun()
             return
         
+        if self.service is None:
+            st.radio("History", list(HISTORY_ZOOMS), key='history_zoom', horizontal=True)
+        live_fragment(self.render_metric_views, CHART_REFRESH)
+        
+        # Refresh button
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            if st.button(" Refresh Live Data", use_container_width=True, type="primary"):
+                # Force new data collection
+                try:
+                    collector.collect_now()
+                    st.rerun()
+                except Exception as e:
+                    st.error(f"Error refreshing: {e}")
+        
+        with col2:
+            if st.button(" Export Data", use_container_width=True):
+                # Export current data
+                csv = self.df.to_csv(index=False)
+                st.download_button(
+                    label="Download CSV",
+                    data=csv,
+                    file_name=f"system_metrics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                    mime="text/csv"
+                )
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    def render_metric_views(self):
+        """Live stream status, metric charts and latest readings"""
+        import plotly.graph_objects as go
+        self.refresh_live_data()
+        
+        # Zoomed-out views read the rollup tier that covers them
+        seconds = HISTORY_ZOOMS[st.session_state.get('history_zoom', 'Live')]
+        tier = collector.history.tier_for(seconds) if self.service is None and seconds else 'raw'
+        if tier == 'raw':
+            df = self.df
+        else:
+            df = collector.frame(tier)
+            df = df[df['timestamp'] >= datetime.now() - timedelta(seconds=seconds)]
+        
         # Show data collection status
-        time_since_update = (datetime.now() - st.session_state.last_update_time).total_seconds()
+        last_update = self.last_update_time()
+        time_since_update = (datetime.now() - last_update).total_seconds() if last_update else float('inf')
         status_color = "#00ff88" if time_since_update < 5 else "#ffaa00" if time_since_update < 10 else "#ff3333"
+        updated = f"Updated {time_since_update:.0f} seconds ago" if last_update else "No scored samples yet"
         
         st.markdown(f"""
         <div style="background: rgba(0, 255, 234, 0.1); padding: 15px; border-radius: 10px; margin-bottom: 20px; border: 1px solid rgba(0, 255, 234, 0.3);">
@@ -1072,9 +1288,9 @@ class BPredictorDashboard:
                     </div>
                 </div>
                 <div style="text-align: right;">
-                    <div style="font-family: 'Orbitron', sans-serif; color: #00ffea;">{len(self.df)} live readings</div>
+                    <div style="font-family: 'Orbitron', sans-serif; color: #00ffea;">{len(df)} {'live readings' if tier == 'raw' else tier + ' averages'}</div>
                     <div style="font-family: 'Exo 2', sans-serif; font-size: 0.8rem; color: {status_color};">
-                        Updated {time_since_update:.0f} seconds ago
+                        {updated}
                     </div>
                 </div>
             </div>
@@ -1085,56 +1301,51 @@ class BPredictorDashboard:
         st.subheader(" All Live Metrics Overview")
         
         # Create a simpler visualization - individual metrics in subplots
-        fig = go.Figure()
-        
-        # Add each metric as a trace
-        metrics_to_plot = [col for col in self.feature_cols if col in self.df.columns]
+        metrics_to_plot = [col for col in self.feature_cols if col in df.columns]
         colors = ['#00ffea', '#ff00ff', '#ffaa00', '#00ff88', '#0088ff']
         metric_names = {
             'cpu_usage': 'CPU Usage (%)',
             'memory_usage': 'Memory Usage (%)',
-            'disk_io': 'Disk I/O (MB)',
-            'network_latency': 'Network (MB)',
+            'disk_io': 'Disk I/O (MB/s)',
+            'network_latency': 'Network (MB/s)',
             'error_rate': 'Error Rate'
         }
-        
-        for i, metric in enumerate(metrics_to_plot):
-            if metric in self.df.columns:
-                color = colors[i % len(colors)]
+
+        def overview_figure():
+            fig = go.Figure()
+
+            # Add each metric as a trace
+            for i, metric in enumerate(metrics_to_plot):
                 fig.add_trace(go.Scatter(
-                    x=self.df["timestamp"],
-                    y=self.df[metric],
                     mode='lines',
                     name=metric_names.get(metric, metric.replace('_', ' ').title()),
-                    line=dict(color=color, width=2),
+                    line=dict(color=colors[i % len(colors)], width=2),
                     yaxis=f"y{i+1}" if i > 0 else "y"
                 ))
-        
-        # Create layout with proper axis configuration
-        layout = {
-            'title': "All System Metrics - Live Feed",
-            'template': "plotly_dark",
-            'plot_bgcolor': 'rgba(10, 25, 47, 0.8)',
-            'paper_bgcolor': 'rgba(10, 25, 47, 0.8)',
-            'hovermode': 'x unified',
-            'height': 500,
-            'showlegend': True,
-            'legend': dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1,
-                bgcolor='rgba(10, 25, 47, 0.8)',
-                font=dict(color='white')
-            )
-        }
-        
-        # Add secondary axes properly
-        if len(metrics_to_plot) > 1:
+
+            # Create layout with proper axis configuration
+            layout = {
+                'title': "All System Metrics - Live Feed",
+                'template': "plotly_dark",
+                'plot_bgcolor': 'rgba(10, 25, 47, 0.8)',
+                'paper_bgcolor': 'rgba(10, 25, 47, 0.8)',
+                'hovermode': 'x unified',
+                'height': 500,
+                'showlegend': True,
+                'legend': dict(
+                    orientation="h",
+                    yanchor="bottom",
+                    y=1.02,
+                    xanchor="right",
+                    x=1,
+                    bgcolor='rgba(10, 25, 47, 0.8)',
+                    font=dict(color='white')
+                )
+            }
+
+            # Add secondary axes properly
             for i in range(1, len(metrics_to_plot)):
-                axis_name = f"yaxis{i+1}"
-                layout[axis_name] = dict(
+                layout[f"yaxis{i+1}"] = dict(
                     title=dict(
                         text=metric_names.get(metrics_to_plot[i], metrics_to_plot[i].replace('_', ' ').title()),
                         font=dict(color=colors[i % len(colors)])
@@ -1144,64 +1355,73 @@ class BPredictorDashboard:
                     side="right",
                     position=0.85
                 )
-        
-        # Set primary y-axis
-        if metrics_to_plot:
-            layout['yaxis'] = dict(
-                title=dict(
-                    text=metric_names.get(metrics_to_plot[0], metrics_to_plot[0].replace('_', ' ').title()),
-                    font=dict(color=colors[0])
-                ),
-                tickfont=dict(color=colors[0])
+
+            # Set primary y-axis
+            if metrics_to_plot:
+                layout['yaxis'] = dict(
+                    title=dict(
+                        text=metric_names.get(metrics_to_plot[0], metrics_to_plot[0].replace('_', ' ').title()),
+                        font=dict(color=colors[0])
+                    ),
+                    tickfont=dict(color=colors[0])
+                )
+
+            fig.update_layout(**layout)
+            return fig
+
+        def metric_figure(i, metric):
+            color = colors[i % len(colors)]
+            red, green, blue = (int(color[j:j+2], 16) for j in (1, 3, 5))
+            fig = go.Figure(go.Scatter(
+                mode='lines',
+                name=metric_names.get(metric, metric.replace('_', ' ').title()),
+                line=dict(color=color, width=3),
+                fill='tozeroy' if metric in ['cpu_usage', 'memory_usage'] else None,
+                fillcolor=f'rgba({red}, {green}, {blue}, 0.2)'
+            ))
+            fig.update_layout(
+                template="plotly_dark",
+                plot_bgcolor='rgba(10, 25, 47, 0.8)',
+                paper_bgcolor='rgba(10, 25, 47, 0.8)',
+                height=250,
+                showlegend=False,
+                margin=dict(l=20, r=20, t=40, b=20)
             )
-        
-        fig.update_layout(**layout)
-        
-        st.plotly_chart(fig, use_container_width=True)
-        
+            return fig
+
+        # Rollups update their newest row in place, so they are redrawn whole
+        chart = live_chart(f"overview:{tier}:" + ",".join(metrics_to_plot), overview_figure)
+        if tier != 'raw':
+            chart.reset()
+        st.plotly_chart(self.update_chart(chart, metrics_to_plot, df), use_container_width=True)
+
         # Alternative: Show metrics in separate subplots for clarity
         st.subheader(" Individual Metric Views")
-        
+
         # Create subplots for each metric
         for i, metric in enumerate(metrics_to_plot[:4]):  # Show first 4 metrics max
-            if metric in self.df.columns:
+            if metric in df.columns:
                 col1, col2 = st.columns([3, 1])
-                
+
                 with col1:
-                    # Create individual chart for each metric
-                    fig_single = go.Figure()
-                    fig_single.add_trace(go.Scatter(
-                        x=self.df["timestamp"],
-                        y=self.df[metric],
-                        mode='lines',
-                        name=metric_names.get(metric, metric.replace('_', ' ').title()),
-                        line=dict(color=colors[i % len(colors)], width=3),
-                        fill='tozeroy' if metric in ['cpu_usage', 'memory_usage'] else None,
-                        fillcolor=f'rgba{tuple(int(colors[i % len(colors)].lstrip("#")[j:j+2], 16) for j in (0, 2, 4)) + (0.2,)}'
-                    ))
-                    
-                    # Get latest value
-                    latest_value = self.df[metric].iloc[-1] if len(self.df) > 0 else 0
-                    
-                    fig_single.update_layout(
-                        title=f"{metric_names.get(metric, metric.replace('_', ' ').title())} - Current: {latest_value:.2f}",
-                        template="plotly_dark",
-                        plot_bgcolor='rgba(10, 25, 47, 0.8)',
-                        paper_bgcolor='rgba(10, 25, 47, 0.8)',
-                        height=250,
-                        showlegend=False,
-                        margin=dict(l=20, r=20, t=40, b=20)
-                    )
-                    
+                    # Individual chart for each metric, titled with the latest value
+                    chart = live_chart(f"metric:{tier}:{metric}", lambda: metric_figure(i, metric), CHART_WIDTH * 3 // 4)
+                    if tier != 'raw':
+                        chart.reset()
+                    fig_single = self.update_chart(chart, [metric], df)
+                    latest_value = df[metric].iloc[-1] if len(df) > 0 else 0
+                    fig_single.layout.title.text = \
+                        f"{metric_names.get(metric, metric.replace('_', ' ').title())} - Current: {latest_value:.2f}"
+
                     st.plotly_chart(fig_single, use_container_width=True)
                 
                 with col2:
                     # Show stats
-                    if len(self.df) > 0:
-                        current = self.df[metric].iloc[-1]
-                        avg = self.df[metric].mean()
-                        min_val = self.df[metric].min()
-                        max_val = self.df[metric].max()
+                    if len(df) > 0:
+                        current = df[f"{metric}_last" if tier != 'raw' else metric].iloc[-1]
+                        avg = df[metric].mean()
+                        min_val = df[f"{metric}_min" if tier != 'raw' else metric].min()
+                        max_val = df[f"{metric}_max" if tier != 'raw' else metric].max()
                         
                         # Determine color based on value for CPU and Memory
                         if metric in ['cpu_usage', 'memory_usage']:
@@ -1224,12 +1444,12 @@ class BPredictorDashboard:
         
         # Latest live metrics table
         st.subheader(" Latest Live Readings")
-        if len(self.df) > 0:
+        if len(df) > 0:
             # Show last 10 readings
-            latest_readings = self.df.tail(10).copy()
+            latest_readings = df.tail(10).copy()
             
             # Format timestamp for display
-            latest_readings['Time'] = latest_readings['timestamp'].dt.strftime('%H:%M:%S')
+            latest_readings['Time'] = latest_readings['timestamp'].dt.strftime('%H:%M:%S' if tier == 'raw' else '%m-%d %H:%M')
             
             # Select columns to display
             display_cols = ['Time'] + [col for col in self.feature_cols if col in latest_readings.columns]
@@ -1241,8 +1461,8 @@ class BPredictorDashboard:
                 latest_readings[display_cols].style.format({
                     'cpu_usage': '{:.1f}%',
                     'memory_usage': '{:.1f}%',
-                    'disk_io': '{:.1f} MB',
-                    'network_latency': '{:.1f} MB',
+                    'disk_io': '{:.1f} MB/s',
+                    'network_latency': '{:.1f} MB/s',
                     'error_rate': '{:.3f}'
                 }).apply(
                     lambda x: ['background: rgba(255, 51, 51, 0.1)' if v in ['Critical', -1] else 
@@ -1253,41 +1473,23 @@ class BPredictorDashboard:
                 use_container_width=True,
                 height=400
             )
-        
-        # Refresh button
-        col1, col2 = st.columns([3, 1])
-        with col1:
-            if st.button(" Refresh Live Data", use_container_width=True, type="primary"):
-                # Force new data collection
-                try:
-                    live_data = collect_metrics()
-                    st.session_state.metrics_history.append(live_data)
-                    st.session_state.last_update_time = datetime.now()
-                    st.rerun()
-                except Exception as e:
-                    st.error(f"Error refreshing: {e}")
-        
-        with col2:
-            if st.button(" Export Data", use_container_width=True):
-                # Export current data
-                csv = self.df.to_csv(index=False)
-                st.download_button(
-                    label="Download CSV",
-                    data=csv,
-                    file_name=f"system_metrics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                    mime="text/csv"
-                )
-        
-        st.markdown('</div>', unsafe_allow_html=True)
     
     def render_lstm_forecast(self):
         """LSTM forecast view"""
         st.markdown('<div class="dashboard-container">', unsafe_allow_html=True)
         st.markdown('<div class="main-header" style="font-size: 3rem;"> PREDICTIVE ANALYTICS</div>', unsafe_allow_html=True)
         
-        self.update_live_data()
+        self.refresh_live_data()
+        live_fragment(self.render_forecast, CHART_REFRESH)
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    def render_forecast(self):
+        """Live forecast chart and risk insights"""
+        import plotly.graph_objects as go
+        self.refresh_live_data()
         
-        if self.X_seq is None or self.y_pred is None:
+        if self.y_pred is None:
             st.warning(" Collecting more data for predictions... Need at least 10 data points.")
             # Show progress
             if len(self.df) > 0:
@@ -1295,39 +1497,48 @@ class BPredictorDashboard:
                 st.progress(progress, text=f"Data collected: {len(self.df)}/10 points")
             return
         
-        # Forecast chart
-        fig = go.Figure()
-        
-        # Actual predictions
-        fig.add_trace(go.Scatter(
-            x=self.df["timestamp"][10:],
-            y=self.y_pred,
-            mode='lines',
-            name='Incident Probability',
-            line=dict(color='#ff00ff', width=3),
-            fill='tozeroy',
-            fillcolor='rgba(255, 0, 255, 0.1)'
-        ))
-        
-        # Threshold lines
-        fig.add_hline(y=0.7, line_dash="dash", line_color="#ff3333", 
-                     annotation_text="Critical", annotation_position="bottom right")
-        fig.add_hline(y=0.5, line_dash="dot", line_color="#ffaa00", 
-                     annotation_text="Warning", annotation_position="bottom right")
-        
-        fig.update_layout(
-            title="LSTM Incident Probability Forecast (Live)",
-            template="plotly_dark",
-            yaxis_range=[0, 1],
-            plot_bgcolor='rgba(10, 25, 47, 0.8)',
-            paper_bgcolor='rgba(10, 25, 47, 0.8)',
-            yaxis_title="Risk Probability"
-        )
-        
+        def forecast_figure():
+            fig = go.Figure()
+
+            # Actual predictions
+            fig.add_trace(go.Scatter(
+                mode='lines',
+                name='Incident Probability',
+                line=dict(color='#ff00ff', width=3),
+                fill='tozeroy',
+                fillcolor='rgba(255, 0, 255, 0.1)'
+            ))
+
+            # Threshold lines
+            fig.add_hline(y=0.7, line_dash="dash", line_color="#ff3333",
+                         annotation_text="Critical", annotation_position="bottom right")
+            fig.add_hline(y=0.5, line_dash="dot", line_color="#ffaa00",
+                         annotation_text="Warning", annotation_position="bottom right")
+
+            fig.update_layout(
+                title="LSTM Incident Probability Forecast (Live)",
+                template="plotly_dark",
+                yaxis_range=[0, 1],
+                plot_bgcolor='rgba(10, 25, 47, 0.8)',
+                paper_bgcolor='rgba(10, 25, 47, 0.8)',
+                yaxis_title="Risk Probability"
+            )
+            return fig
+
+        # Forecast chart; simulated predictions are redrawn as a whole each refresh
+        chart = live_chart("forecast", forecast_figure)
+        timestamps = self.df['timestamp'].to_numpy('datetime64[ns]').view(np.int64)[10:]
+        if self.lstm_model is None and self.service is None:
+            chart.reset()
+        n = min(len(timestamps), len(self.y_pred))
+        fig = chart.update(timestamps[:n], [self.y_pred[:n]], start_ns=timestamps[0] if n else None)
         st.plotly_chart(fig, use_container_width=True)
         
         # Forecast insights
-        current_risk = self.y_pred[-1] if len(self.y_pred) > 0 else 0
+        if self.live_risk is not None:
+            current_risk = self.live_risk
+        else:
+            current_risk = self.y_pred[-1] if len(self.y_pred) > 0 else 0
         
         if current_risk < 0.3:
             risk_level = " LOW"
@@ -1369,15 +1580,14 @@ class BPredictorDashboard:
             </div>
         </div>
         """, unsafe_allow_html=True)
-        
-        st.markdown('</div>', unsafe_allow_html=True)
     
     def render_root_cause(self):
         """Root cause analysis with live data"""
+        import plotly.graph_objects as go
         st.markdown('<div class="dashboard-container">', unsafe_allow_html=True)
         st.markdown('<div class="main-header" style="font-size: 3rem;">🔍 ROOT CAUSE ANALYSIS</div>', unsafe_allow_html=True)
         
-        self.update_live_data()
+        self.refresh_live_data()
         
         if self.df.empty or len(self.df) < 5:
             st.info("Collecting data for analysis...")
@@ -1449,7 +1659,7 @@ class BPredictorDashboard:
         st.markdown('<div class="dashboard-container">', unsafe_allow_html=True)
         st.markdown('<div class="main-header" style="font-size: 3rem;"> DECISION INTELLIGENCE</div>', unsafe_allow_html=True)
         
-        self.update_live_data()
+        self.refresh_live_data()
         
         # AI Recommendations based on live data
         recommendations = []
@@ -1623,10 +1833,9 @@ if __name__ == "__main__":
         elif st.session_state['current_page'] == 'Decision Intelligence':
             dashboard.render_decision_intelligence()
         
-        # Add auto-refresh for live data
-        if st.session_state.data_stream_active:
-            # Auto-refresh every 3 seconds
-            time.sleep(3)
+        # Without fragments, refresh live data by rerunning the whole page
+        if st.session_state.data_stream_active and not FRAGMENTS:
+            time.sleep(FULL_REFRESH)
             st.rerun()
         
         # Add refresh button in sidebar
@@ -1636,9 +1845,7 @@ if __name__ == "__main__":
             if st.button(" Update Now", use_container_width=True):
                 # Force data collection
                 try:
-                    live_data = collect_metrics()
-                    st.session_state.metrics_history.append(live_data)
-                    st.session_state.last_update_time = datetime.now()
+                    collector.collect_now()
                     st.rerun()
                 except Exception as e:
                     st.error(f"Error: {e}")
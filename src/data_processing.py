@@ -1,29 +1,206 @@
+import glob
 import os
+import numpy as np
 import pandas as pd
-from sklearn.preprocessing import MinMaxScaler
 
-def load_and_process():
-    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-    metrics_path = os.path.join(BASE_DIR, "../data/metrics.csv")
-    incidents_path = os.path.join(BASE_DIR, "../data/incidents.csv")
+try:
+    from .metric_store import (MetricStore, DEFAULT_HOST, METRIC_COLUMNS, to_ns, to_ns_array,
+                               cumulative_to_rates, is_cumulative_csv)
+    from .windowing import make_sequences
+    from .incidents import load_incidents, label_samples, INCIDENTS_PATH
+    from .scaling import StreamingMinMaxScaler
+except ImportError:
+    from metric_store import (MetricStore, DEFAULT_HOST, METRIC_COLUMNS, to_ns, to_ns_array,
+                              cumulative_to_rates, is_cumulative_csv)
+    from windowing import make_sequences
+    from incidents import load_incidents, label_samples, INCIDENTS_PATH
+    from scaling import StreamingMinMaxScaler
 
-    metrics = pd.read_csv(metrics_path, parse_dates=["timestamp"])
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CHUNK_ROWS = 100_000
 
-    # Read incidents; handle empty or missing file gracefully by creating
-    # a zero-filled incidents series matching the metrics timestamps.
-    try:
-        incidents = pd.read_csv(incidents_path, parse_dates=["timestamp"])
-        if incidents.empty:
-            incidents = pd.DataFrame({"timestamp": metrics["timestamp"], "incident": 0})
-    except (pd.errors.EmptyDataError, FileNotFoundError):
-        incidents = pd.DataFrame({"timestamp": metrics["timestamp"], "incident": 0})
+def _csv_paths():
+    # The older cumulative metrics.csv first, then the metrics_rates.csv
+    # device_agent.py writes now, each followed by its `--daily` files
+    paths = []
+    for name in ("metrics", "metrics_rates"):
+        metrics_path = os.path.join(BASE_DIR, f"../data/{name}.csv")
+        paths += [metrics_path] if os.path.exists(metrics_path) else []
+        paths += sorted(glob.glob(os.path.join(BASE_DIR, f"../data/{name}-*.csv")))
+    return paths
 
-    # Merge and sort
-    df = metrics.merge(incidents, on="timestamp", how="left").fillna(0)
+def _read_csv(path):
+    # Whole file with disk_io/network_latency as MB/s, whichever way it stores them
+    metrics = pd.read_csv(path)
+    metrics["timestamp"] = pd.to_datetime(metrics["timestamp"], format="mixed")
+    if is_cumulative_csv(path):
+        values, _ = cumulative_to_rates(to_ns_array(metrics["timestamp"]), metrics[METRIC_COLUMNS].to_numpy())
+        metrics[METRIC_COLUMNS] = values
+    return metrics
+
+def load_metrics(start=None, end=None, host=DEFAULT_HOST):
+    """
+    Reads metrics for [start, end) from the columnar store when it has data
+    for `host`, otherwise falls back to the CSV files in data/.
+    """
+    store = MetricStore()
+    if store.has_data(host):
+        return store.read_range(start, end, host=host)
+
+    metrics = pd.concat([_read_csv(p) for p in _csv_paths()], ignore_index=True)
+    if start is not None:
+        metrics = metrics[metrics["timestamp"] >= pd.Timestamp(start)]
+    if end is not None:
+        metrics = metrics[metrics["timestamp"] < pd.Timestamp(end)]
+    return metrics
+
+def load_and_process(start=None, end=None, host=DEFAULT_HOST, lead_time=0):
+    """
+    Returns (df, scaler): metrics with an `incident` label column, scaled.
+    A sample is labelled 1 if it falls in an incident interval, or within
+    `lead_time` (seconds or a Timedelta string) before one.
+    """
+    metrics = load_metrics(start, end, host=host)
+
+    # Missing or empty incidents file -> every label is 0
+    intervals = load_incidents(INCIDENTS_PATH, lead_time)
+    timestamps = to_ns_array(metrics["timestamp"])
+    df = metrics.fillna(0)
+    df["incident"] = label_samples(timestamps, intervals)
 
     # Scale metrics
     metric_cols = [col for col in df.columns if col not in ["timestamp", "incident"]]
-    scaler = MinMaxScaler()
-    df[metric_cols] = scaler.fit_transform(df[metric_cols])
+    scaler = StreamingMinMaxScaler(columns=metric_cols)
+    df[metric_cols] = scaler.fit_transform(df[metric_cols].to_numpy(np.float64))
 
     return df, scaler
+
+
+# --- Streaming pipeline -------------------------------------------------
+# Same data as load_and_process, but never more than one chunk in memory:
+# one pass fits the scaler, a second pass scales, labels and windows.
+
+def iter_metric_chunks(chunk_rows=CHUNK_ROWS, start=None, end=None, host=DEFAULT_HOST):
+    """
+    Yields (timestamps_ns int64, values float32 (n, len(METRIC_COLUMNS)))
+    chunks for [start, end), from the store or the CSV fallback.
+    """
+    store = MetricStore()
+    if store.has_data(host):
+        yield from store.iter_chunks(chunk_rows, start, end, host=host)
+        return
+
+    start_ns, end_ns = to_ns(start), to_ns(end)
+    for path in _csv_paths():
+        cumulative, previous = is_cumulative_csv(path), None
+        for chunk in pd.read_csv(path, chunksize=chunk_rows):
+            ts = to_ns_array(pd.to_datetime(chunk["timestamp"], format="mixed"))
+            values = chunk[METRIC_COLUMNS].to_numpy(np.float64)
+            if cumulative:
+                values, previous = cumulative_to_rates(ts, values, previous=previous)
+            keep = np.ones(len(ts), dtype=bool)
+            if start_ns is not None:
+                keep &= ts >= start_ns
+            if end_ns is not None:
+                keep &= ts < end_ns
+            if keep.any():
+                yield ts[keep], values.astype(np.float32)[keep]
+
+def fit_scaler_streaming(chunk_rows=CHUNK_ROWS, start=None, end=None, host=DEFAULT_HOST):
+    """
+    Fits the scaler in one pass over the chunks. Returns (scaler, rows), rows
+    being the number of samples seen, for row-based splits.
+    """
+    scaler = StreamingMinMaxScaler(columns=METRIC_COLUMNS)
+    rows = 0
+    for ts, values in iter_metric_chunks(chunk_rows, start, end, host):
+        scaler.partial_fit(values)
+        rows += len(ts)
+    if scaler.data_min_ is None:
+        raise ValueError("No metrics found to fit the scaler on.")
+    return scaler, rows
+
+def row_timestamp(row, chunk_rows=CHUNK_ROWS, start=None, end=None, host=DEFAULT_HOST):
+    """Timestamp (ns) of the row-th sample in time order, or None past the end. Reads chunks up to it."""
+    seen = 0
+    for ts, _ in iter_metric_chunks(chunk_rows, start, end, host):
+        if row < seen + len(ts):
+            return int(ts[row - seen])
+        seen += len(ts)
+    return None
+
+def iter_blocks(timesteps=10, chunk_rows=CHUNK_ROWS, start=None, end=None,
+                host=DEFAULT_HOST, lead_time=0):
+    """
+    Yields unscaled (X float32 (n, features), y float32 (n,)) blocks: each
+    chunk prefixed with the last `timesteps` rows of the previous one, so
+    windowing every block gives exactly the windows of the full data.
+    """
+    intervals = load_incidents(INCIDENTS_PATH, lead_time)
+    tail_X = np.empty((0, len(METRIC_COLUMNS)), dtype=np.float32)
+    tail_y = np.empty(0, dtype=np.float32)
+    for ts, values in iter_metric_chunks(chunk_rows, start, end, host):
+        X = np.concatenate([tail_X, values])
+        y = np.concatenate([tail_y, label_samples(ts, intervals)])
+        if len(X) > timesteps:
+            yield X, y
+        tail_X, tail_y = X[-timesteps:], y[-timesteps:]
+
+def iter_sequences(scaler, timesteps=10, chunk_rows=CHUNK_ROWS, start=None, end=None,
+                   host=DEFAULT_HOST, lead_time=0):
+    """Yields scaled (X_seq float32 (k, timesteps, features), y_seq float32 (k,)) per chunk."""
+    for X, y in iter_blocks(timesteps, chunk_rows, start, end, host, lead_time):
+        yield make_sequences(scaler.transform(X), y, timesteps)
+
+def sequence_dataset(scaler, timesteps=10, batch_size=32, chunk_rows=CHUNK_ROWS,
+                     start=None, end=None, host=DEFAULT_HOST, lead_time=0):
+    """
+    tf.data.Dataset of (window, label) batches over iter_sequences. It re-reads
+    the source every epoch, so memory stays bounded by `chunk_rows`.
+    """
+    import tensorflow as tf
+
+    features = len(METRIC_COLUMNS)
+    dataset = tf.data.Dataset.from_generator(
+        lambda: iter_sequences(scaler, timesteps, chunk_rows, start, end, host, lead_time),
+        output_signature=(
+            tf.TensorSpec(shape=(None, timesteps, features), dtype=tf.float32),
+            tf.TensorSpec(shape=(None,), dtype=tf.float32),
+        ),
+    )
+    return dataset.unbatch().batch(batch_size).prefetch(tf.data.AUTOTUNE)
+
+def tfdata_dataset(scaler, timesteps=10, batch_size=32, chunk_rows=CHUNK_ROWS,
+                   start=None, end=None, host=DEFAULT_HOST, lead_time=0,
+                   shuffle_buffer=10_000, seed=None):
+    """
+    Input pipeline that overlaps data preparation with training: the
+    generator only reads raw blocks; scaling and windowing run in a parallel
+    map, windows are shuffled within `shuffle_buffer`, and batches are
+    prefetched while the previous step trains.
+    """
+    import tensorflow as tf
+
+    features = len(METRIC_COLUMNS)
+    scale = tf.constant(scaler.scale_)
+    offset = tf.constant(scaler.min_)
+
+    def scale_and_window(X, y):
+        # Same windows as Dataset.window(timesteps, shift=1), built in one op;
+        # the last window has no following label and is dropped
+        windows = tf.signal.frame(X * scale + offset, timesteps, 1, axis=0)[:-1]
+        return windows, y[timesteps:]
+
+    dataset = tf.data.Dataset.from_generator(
+        lambda: iter_blocks(timesteps, chunk_rows, start, end, host, lead_time),
+        output_signature=(
+            tf.TensorSpec(shape=(None, features), dtype=tf.float32),
+            tf.TensorSpec(shape=(None,), dtype=tf.float32),
+        ),
+    )
+    dataset = dataset.map(scale_and_window, num_parallel_calls=tf.data.AUTOTUNE, deterministic=False)
+    dataset = dataset.unbatch()
+    if shuffle_buffer:
+        dataset = dataset.shuffle(shuffle_buffer, seed=seed, reshuffle_each_iteration=True)
+    dataset = dataset.batch(batch_size, num_parallel_calls=tf.data.AUTOTUNE)
+    return dataset.prefetch(tf.data.AUTOTUNE)
@@ -0,0 +1,159 @@
+"""
+Tiered in-memory metric history.
+
+Raw samples for the last few minutes, plus 1-minute and 1-hour rollups
+(min/mean/max/last of every metric) that are updated as samples arrive, so
+long views never need the raw rows:
+
+    tier     resolution   kept by default   rows
+    raw      2 s          10 minutes         300
+    minute   1 min        24 hours         1 440
+    hour     1 h          30 days            720
+
+Each tier keeps a fixed number of rows (its retention over its resolution),
+so memory stays bounded however long the process runs. Retention is set per
+tier with BPREDICTOR_HISTORY_RAW_MINUTES, BPREDICTOR_HISTORY_MINUTE_HOURS and
+BPREDICTOR_HISTORY_HOUR_DAYS.
+"""
+import os
+from collections import deque
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .metric_store import METRIC_COLUMNS, from_ns, to_ns
+    from .ring_buffer import RingBuffer
+except ImportError:
+    from metric_store import METRIC_COLUMNS, from_ns, to_ns
+    from ring_buffer import RingBuffer
+
+RAW_MINUTES = float(os.environ.get("BPREDICTOR_HISTORY_RAW_MINUTES", 10))
+MINUTE_HOURS = float(os.environ.get("BPREDICTOR_HISTORY_MINUTE_HOURS", 24))
+HOUR_DAYS = float(os.environ.get("BPREDICTOR_HISTORY_HOUR_DAYS", 30))
+TIERS = ("raw", "minute", "hour")
+
+
+class Rollup:
+    """
+    Min/mean/max/last of each column per `period` seconds, for the last
+    `retention` seconds. The newest period stays open and is updated in place;
+    rows not newer than the last one added are ignored.
+    """
+
+    def __init__(self, period, retention, columns=METRIC_COLUMNS):
+        self.period_ns = int(period * 1e9)
+        self.columns = list(columns)
+        self._closed = deque(maxlen=max(1, int(retention // period)))
+        self._open = None     # [start_ns, count, sum, min, max, last]
+        self._last_ns = None
+
+    def __len__(self):
+        return len(self._closed) + (self._open is not None)
+
+    def extend(self, ts_ns, values):
+        """Adds rows: sorted int64 ns timestamps and (n, columns) values."""
+        ts_ns = np.asarray(ts_ns, dtype=np.int64)
+        values = np.asarray(values, dtype=np.float64)
+        if self._last_ns is not None:
+            newer = ts_ns > self._last_ns
+            ts_ns, values = ts_ns[newer], values[newer]
+        if len(ts_ns) == 0:
+            return
+        self._last_ns = int(ts_ns[-1])
+        keys = ts_ns - ts_ns % self.period_ns
+
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        ends = np.r_[starts[1:], len(keys)] - 1
+        # Only the last `maxlen + 1` periods can survive
+        keep = slice(-(self._closed.maxlen + 1), None)
+        groups = [list(g) for g in zip(keys[starts][keep],
+                                       np.diff(np.r_[starts, len(keys)])[keep],
+                                       np.add.reduceat(values, starts)[keep],
+                                       np.fmin.reduceat(values, starts)[keep],
+                                       np.fmax.reduceat(values, starts)[keep],
+                                       values[ends][keep])]
+
+        if self._open is not None and groups[0][0] == self._open[0]:
+            _, count, total, low, high, last = groups.pop(0)
+            row = self._open
+            row[1] += count
+            row[2] = row[2] + total
+            row[3] = np.fmin(row[3], low)
+            row[4] = np.fmax(row[4], high)
+            row[5] = last
+        if groups:
+            if self._open is not None:
+                self._closed.append(self._open)
+            self._closed.extend(groups[:-1])
+            self._open = groups[-1]
+
+    def frame(self):
+        """DataFrame: timestamp (period start), `<col>` (mean), `<col>_min`, `<col>_max`, `<col>_last`."""
+        rows = list(self._closed) + ([self._open] if self._open is not None else [])
+        if not rows:
+            return pd.DataFrame(columns=["timestamp"] + self.columns)
+        starts, counts, totals, lows, highs, lasts = (np.array(c) for c in zip(*rows))
+        df = pd.DataFrame({"timestamp": from_ns(starts)})
+        means = totals / counts[:, None]
+        for i, column in enumerate(self.columns):
+            df[column] = means[:, i]
+            df[f"{column}_min"] = lows[:, i]
+            df[f"{column}_max"] = highs[:, i]
+            df[f"{column}_last"] = lasts[:, i]
+        return df
+
+
+class TieredHistory:
+    """Raw samples (a RingBuffer) plus minute and hour rollups, each with its own retention."""
+
+    def __init__(self, columns=METRIC_COLUMNS, interval=2.0, raw_minutes=RAW_MINUTES,
+                 minute_hours=MINUTE_HOURS, hour_days=HOUR_DAYS):
+        self.columns = list(columns)
+        self.retention = {"raw": raw_minutes * 60, "minute": minute_hours * 3600, "hour": hour_days * 86400}
+        self.raw = RingBuffer(max(1, int(self.retention["raw"] / interval)), columns)
+        self.rollups = {"minute": Rollup(60, self.retention["minute"], columns),
+                        "hour": Rollup(3600, self.retention["hour"], columns)}
+
+    def __len__(self):
+        return len(self.raw)
+
+    @property
+    def horizon(self):
+        """Seconds of history the longest tier keeps."""
+        return max(self.retention.values())
+
+    def append(self, sample):
+        """sample: dict with `timestamp` and the metric columns."""
+        ts = np.array([to_ns(sample["timestamp"])], dtype=np.int64)
+        values = np.array([[sample.get(c, np.nan) for c in self.columns]], dtype=np.float64)
+        self.raw.append(ts[0], values[0])
+        for rollup in self.rollups.values():
+            rollup.extend(ts, values)
+
+    def load(self, ts_ns, values):
+        """
+        Bulk-adds older rows (e.g. from the metric store) to an empty history;
+        ignored once samples are in. Only rows inside the raw window (from
+        now) become raw samples.
+        """
+        if len(ts_ns) == 0 or len(self.raw):
+            return
+        for rollup in self.rollups.values():
+            rollup.extend(ts_ns, values)
+        recent = ts_ns >= to_ns(datetime.now()) - int(self.retention["raw"] * 1e9)
+        self.raw.extend(ts_ns[recent], values[recent])
+
+    def tier_for(self, seconds):
+        """Finest tier that covers the last `seconds`."""
+        for tier in TIERS:
+            if self.retention[tier] >= seconds:
+                return tier
+        return TIERS[-1]
+
+    def frame(self, tier="raw"):
+        """The tier as a DataFrame (a copy); raw has the metric columns, rollups see Rollup.frame."""
+        if tier != "raw":
+            return self.rollups[tier].frame()
+        return self.raw.frame()
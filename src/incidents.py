@@ -0,0 +1,70 @@
+import os
+import numpy as np
+import pandas as pd
+
+try:
+    from .metric_store import to_ns_array
+except ImportError:
+    from metric_store import to_ns_array
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+INCIDENTS_PATH = os.path.join(BASE_DIR, "../data/incidents.csv")
+
+def _delta_ns(lead_time):
+    """Seconds (int/float) or anything pd.Timedelta accepts ("5min") -> ns."""
+    if isinstance(lead_time, (int, float, np.integer, np.floating)):
+        return int(lead_time * 1e9)
+    return pd.Timedelta(lead_time).value
+
+def merge_intervals(starts, ends):
+    """Sorts [start, end) intervals and merges overlapping or touching ones."""
+    order = np.argsort(starts, kind="stable")
+    starts, ends = starts[order], ends[order]
+    if len(starts) == 0:
+        return starts, ends
+    reach = np.maximum.accumulate(ends)
+    new_group = np.ones(len(starts), dtype=bool)
+    new_group[1:] = starts[1:] > reach[:-1]
+    first = np.flatnonzero(new_group)
+    last = np.append(first[1:], len(starts)) - 1
+    return starts[first], reach[last]
+
+def load_incidents(path=INCIDENTS_PATH, lead_time=0):
+    """
+    Reads incidents.csv as sorted, non-overlapping [start, end) intervals in
+    int64 UTC ns (naive times are local), with each start moved `lead_time` earlier so samples leading up
+    to an incident are labelled too. Returns None for a missing or empty file.
+
+    Accepts `start,end` rows, or the legacy `timestamp,incident` rows, which
+    become point intervals (same labels as the old exact-timestamp merge).
+    """
+    try:
+        incidents = pd.read_csv(path)
+    except (pd.errors.EmptyDataError, FileNotFoundError):
+        return None
+    if incidents.empty:
+        return None
+
+    if "start" in incidents.columns:
+        starts = to_ns_array(pd.to_datetime(incidents["start"], format="mixed"))
+        ends = to_ns_array(pd.to_datetime(incidents["end"], format="mixed"))
+    else:
+        if "incident" in incidents.columns:
+            incidents = incidents[incidents["incident"].fillna(0) != 0]
+        starts = to_ns_array(pd.to_datetime(incidents["timestamp"], format="mixed"))
+        ends = starts + 1
+
+    return merge_intervals(starts - _delta_ns(lead_time), ends)
+
+def label_samples(timestamps_ns, intervals):
+    """
+    1.0 for samples inside any interval, else 0.0. `intervals` comes from
+    load_incidents (sorted, merged), so this is one searchsorted: O(n log m).
+    """
+    if intervals is None:
+        return np.zeros(len(timestamps_ns), dtype=np.float32)
+    starts, ends = intervals
+    idx = np.searchsorted(starts, timestamps_ns, side="right") - 1
+    inside = idx >= 0
+    inside[inside] = timestamps_ns[inside] < ends[idx[inside]]
+    return inside.astype(np.float32)
@@ -0,0 +1,126 @@
+import json
+import os
+import threading
+
+import numpy as np
+
+try:
+    from .model_registry import get_model, load_keras_model, resolve_model_path, model_signature, file_hash
+    from .numpy_engine import load_numpy_model
+except ImportError:
+    from model_registry import get_model, load_keras_model, resolve_model_path, model_signature, file_hash
+    from numpy_engine import load_numpy_model
+
+KERAS_FILENAME = "lstm_model.h5"
+TFLITE_FILENAME = "lstm_model.tflite"
+
+# auto: TFLite with a light runtime and an up-to-date export, else the NumPy
+# engine over the .h5, else Keras. tflite / numpy / keras force one backend.
+BACKEND = os.environ.get("BPREDICTOR_INFERENCE_BACKEND", "auto")
+
+
+def light_tflite_interpreter_class():
+    """A TFLite interpreter that does not pull in TensorFlow, or None."""
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+        return Interpreter
+    except ImportError:
+        pass
+    try:
+        from tflite_runtime.interpreter import Interpreter
+        return Interpreter
+    except ImportError:
+        return None
+
+
+def tflite_interpreter_class():
+    """The lightest available TFLite interpreter; full TensorFlow is the last resort."""
+    interpreter = light_tflite_interpreter_class()
+    if interpreter is not None:
+        return interpreter
+    import tensorflow as tf
+    return tf.lite.Interpreter
+
+
+class TFLiteModel:
+    """
+    Keras-style predict() over a TFLite interpreter. The input is resized to
+    each batch shape on demand; a lock makes the shared instance safe to call
+    from several Streamlit sessions.
+    """
+
+    def __init__(self, path, num_threads=None):
+        self.interpreter = tflite_interpreter_class()(model_path=path, num_threads=num_threads)
+        self.input_index = self.interpreter.get_input_details()[0]["index"]
+        self.output_index = self.interpreter.get_output_details()[0]["index"]
+        self._shape = None
+        self._lock = threading.Lock()
+
+    def predict(self, X, verbose=0):
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        with self._lock:
+            if X.shape != self._shape:
+                self.interpreter.resize_tensor_input(self.input_index, X.shape)
+                self.interpreter.allocate_tensors()
+                self._shape = X.shape
+            self.interpreter.set_tensor(self.input_index, X)
+            self.interpreter.invoke()
+            return self.interpreter.get_tensor(self.output_index).copy()
+
+
+def load_tflite(path):
+    return TFLiteModel(path)
+
+
+_source_versions = {}
+
+
+def source_version(path):
+    """Content hash of a model file, cached until its mtime/size change."""
+    signature = model_signature(path)
+    cached = _source_versions.get(path)
+    if cached is None or cached[0] != signature:
+        cached = _source_versions[path] = (signature, file_hash(path))
+    return cached[1]
+
+
+def tflite_is_current(tflite_path, keras_path):
+    """True when the TFLite export was made from the current .h5 (see export_tflite)."""
+    if keras_path is None:
+        return True
+    try:
+        with open(tflite_path + ".json") as f:
+            exported_from = json.load(f)["source_version"]
+    except (OSError, ValueError, KeyError):
+        return False
+    return exported_from == source_version(keras_path)
+
+
+def load_forecaster(backend=BACKEND):
+    """
+    Loads the LSTM through the model registry. Returns (model, path, backend);
+    every backend's model has predict(X, verbose=0) -> (n, 1).
+    """
+    if backend == "tflite" or (backend == "auto" and light_tflite_interpreter_class() is not None):
+        tflite_path = resolve_model_path(TFLITE_FILENAME)
+        keras_path = resolve_model_path(KERAS_FILENAME)
+        if tflite_path and (backend == "tflite" or tflite_is_current(tflite_path, keras_path)):
+            try:
+                model, path = get_model(TFLITE_FILENAME, load_tflite)
+                return model, path, "tflite"
+            except Exception:
+                if backend == "tflite":
+                    raise
+        elif backend == "tflite":
+            raise FileNotFoundError(f"{TFLITE_FILENAME} not found in models/ (run train_lstm.py --export)")
+
+    if backend in ("auto", "numpy"):
+        try:
+            model, path = get_model(KERAS_FILENAME, load_numpy_model)
+            return model, path, "numpy"
+        except Exception:
+            if backend == "numpy":
+                raise
+
+    model, path = get_model(KERAS_FILENAME, load_keras_model)
+    return model, path, "keras"
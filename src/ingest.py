@@ -0,0 +1,302 @@
+"""
+Fleet ingestion: agents push batched, zlib-compressed metric frames over TCP
+to one server, which tags them by host and writes per-host store partitions.
+
+Wire format, both directions length-prefixed:
+
+    agent -> server   [u32 big-endian length][zlib(JSON {"host", "columns", "rows"})]
+    server -> agent   [1 byte] ACK (frame accepted) or NACK (rejected)
+
+`rows` is a list of [epoch_ns, value, ...] in `columns` order.
+"""
+import asyncio
+import json
+import os
+import re
+import signal
+import socket
+import struct
+import time
+import zlib
+
+import numpy as np
+
+try:
+    from .metric_store import MetricStore, METRIC_COLUMNS, to_ns
+except ImportError:
+    from metric_store import MetricStore, METRIC_COLUMNS, to_ns
+
+DEFAULT_PORT = 9400
+MAX_FRAME_BYTES = 16 * 1024 * 1024           # compressed body
+MAX_DECOMPRESSED_BYTES = 64 * 1024 * 1024    # JSON it inflates to
+ACK, NACK = b"\x01", b"\x00"
+HEADER = struct.Struct(">I")
+# Host names become directory names: no separators, and no "." or ".."
+HOST_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]{0,127}$")
+FD_LIMIT = 65536    # soft fd limit to ask for when the hard one is unlimited
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SPOOL_DIR = os.path.join(BASE_DIR, "../data/spool")
+
+
+class FrameRejected(Exception):
+    """The server NACKed a frame; resending the same bytes will not help."""
+
+
+def encode_frame(host, rows, columns=METRIC_COLUMNS):
+    payload = json.dumps({"host": host, "columns": list(columns), "rows": rows}, separators=(",", ":"))
+    body = zlib.compress(payload.encode())
+    return HEADER.pack(len(body)) + body
+
+
+def decode_frame(body):
+    inflater = zlib.decompressobj()
+    payload = inflater.decompress(body, MAX_DECOMPRESSED_BYTES)
+    if inflater.unconsumed_tail:
+        raise ValueError(f"frame inflates to more than {MAX_DECOMPRESSED_BYTES} bytes")
+    message = json.loads(payload)
+    if not HOST_NAME.match(str(message.get("host", ""))):
+        raise ValueError(f"invalid host name: {message.get('host')!r}")
+    return message
+
+
+def raise_fd_limit():
+    """Each agent holds a socket; lift the soft fd limit to the hard one."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    # macOS reports an unlimited hard limit but rejects it, and caps at OPEN_MAX (10240)
+    target = hard if hard != resource.RLIM_INFINITY else max(soft, FD_LIMIT)
+    for limit in (target, min(target, 10240)):
+        if limit <= soft:
+            return
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (limit, hard))
+            return
+        except (ValueError, OSError):
+            continue
+
+
+# ---------- server ----------
+class IngestServer:
+    """
+    asyncio TCP server. Frames are decoded and buffered per host on arrival
+    and written to the store by a periodic flush task, so disk writes are
+    batched across all agents of a host. A frame is ACKed once buffered;
+    at most `flush_interval` seconds of data is lost if the server dies.
+    """
+
+    def __init__(self, store=None, host="127.0.0.1", port=DEFAULT_PORT, flush_interval=1.0):
+        self.store = store or MetricStore()
+        self.bind_host = host
+        self.port = port
+        self.flush_interval = flush_interval
+        self.pending = {}
+        self.stats = {"connections": 0, "frames": 0, "rows": 0, "rejected": 0}
+        self._server = None
+        self._clients = set()
+
+    async def handle(self, reader, writer):
+        self.stats["connections"] += 1
+        self._clients.add(writer)
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(HEADER.size)
+                except asyncio.IncompleteReadError:
+                    break
+                (length,) = HEADER.unpack(header)
+                if length > MAX_FRAME_BYTES:
+                    writer.write(NACK)
+                    break
+                body = await reader.readexactly(length)
+                try:
+                    self.accept(decode_frame(body))
+                    writer.write(ACK)
+                except Exception as e:
+                    self.stats["rejected"] += 1
+                    print(f"Rejected frame: {e}")
+                    writer.write(NACK)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.stats["connections"] -= 1
+            self._clients.discard(writer)
+            writer.close()
+
+    def accept(self, message):
+        columns = message.get("columns", METRIC_COLUMNS)
+        rows = message["rows"]
+        if not rows:
+            return
+        timestamps = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+        data = np.asarray([r[1:] for r in rows], dtype=np.float32)
+        values = np.zeros((len(rows), len(self.store.columns)), dtype=np.float32)
+        for j, col in enumerate(self.store.columns):
+            if col in columns:
+                values[:, j] = data[:, columns.index(col)]
+        self.pending.setdefault(message["host"], []).append((timestamps, values))
+        self.stats["frames"] += 1
+        self.stats["rows"] += len(rows)
+
+    def flush(self):
+        pending, self.pending = self.pending, {}
+        for host, batches in pending.items():
+            timestamps = np.concatenate([b[0] for b in batches])
+            values = np.concatenate([b[1] for b in batches])
+            order = np.argsort(timestamps, kind="stable")
+            self.store.append_arrays(timestamps[order], values[order], host=host)
+
+    def stop(self):
+        """Stops accepting connections and hangs up on connected agents (their handlers see EOF)."""
+        if self._server is not None:
+            self._server.close()
+        for writer in list(self._clients):
+            writer.close()
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self.flush()
+
+    async def serve(self, report_interval=None):
+        raise_fd_limit()
+        self._server = await asyncio.start_server(self.handle, self.bind_host, self.port, backlog=4096)
+        flusher = asyncio.create_task(self._flush_loop())
+        reporter = asyncio.create_task(self._report_loop(report_interval)) if report_interval else None
+        # SIGTERM stops accepting frames and falls through to the final flush
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, self.stop)
+        except (NotImplementedError, RuntimeError):
+            pass  # Windows, or not the main thread: Ctrl+C / cancellation still stop the server
+        print(f"Ingest server listening on {self.bind_host}:{self.port}")
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            # Hang up first so the handlers end on EOF instead of being cancelled mid-read
+            self.stop()
+            await asyncio.sleep(0)
+            flusher.cancel()
+            if reporter:
+                reporter.cancel()
+            self.flush()
+
+    async def _report_loop(self, interval):
+        last_frames, last_rows = 0, 0
+        while True:
+            await asyncio.sleep(interval)
+            frames, rows = self.stats["frames"], self.stats["rows"]
+            print(f"agents={self.stats['connections']} frames/s={(frames - last_frames) / interval:.0f} "
+                  f"rows/s={(rows - last_rows) / interval:.0f} rejected={self.stats['rejected']}")
+            last_frames, last_rows = frames, rows
+
+
+# ---------- agent push sink ----------
+class PushSink:
+    """
+    BufferedWriter sink that sends each batch to the ingestion server.
+
+    If the server is unreachable (or NACKs), the frame is appended to a local
+    spool file and retried with exponential backoff; spooled frames are
+    replayed in order before new data once the server is back.
+    """
+
+    def __init__(self, server="127.0.0.1", port=DEFAULT_PORT, host=None, columns=METRIC_COLUMNS,
+                 spool_dir=SPOOL_DIR, timeout=5.0, max_backoff=60.0, max_spool_bytes=256 * 1024 * 1024):
+        self.server = server
+        self.port = port
+        self.host = host or socket.gethostname()
+        self.columns = list(columns)
+        self.timeout = timeout
+        self.max_backoff = max_backoff
+        self.max_spool_bytes = max_spool_bytes
+        self.spool_path = os.path.join(spool_dir, f"{self.host}.spool")
+        self._sock = None
+        self._backoff = 1.0
+        self._retry_at = 0.0
+
+    def _connect(self):
+        if self._sock is None:
+            self._sock = socket.create_connection((self.server, self.port), timeout=self.timeout)
+            self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return self._sock
+
+    def _disconnect(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def _send(self, frame):
+        sock = self._connect()
+        sock.sendall(frame)
+        reply = sock.recv(1)
+        if reply == NACK:
+            raise FrameRejected("frame rejected by ingest server")
+        if reply != ACK:
+            raise ConnectionError("connection closed by ingest server")
+
+    def _spool(self, frame):
+        os.makedirs(os.path.dirname(self.spool_path), exist_ok=True)
+        size = os.path.getsize(self.spool_path) if os.path.exists(self.spool_path) else 0
+        if size + len(frame) > self.max_spool_bytes:
+            print(f"Spool full ({size} bytes), dropping {len(frame)} byte frame")
+            return
+        with open(self.spool_path, "ab") as f:
+            f.write(frame)
+
+    def _replay_spool(self):
+        if not os.path.exists(self.spool_path):
+            return
+        with open(self.spool_path, "rb") as f:
+            data = f.read()
+        offset = 0
+        try:
+            while offset + HEADER.size <= len(data):
+                (length,) = HEADER.unpack_from(data, offset)
+                end = offset + HEADER.size + length
+                if end > len(data):
+                    # Torn write at the tail (agent killed mid-spool)
+                    data = data[:offset]
+                    break
+                try:
+                    self._send(data[offset:end])
+                except FrameRejected:
+                    print(f"Dropping spooled frame rejected by the server ({length} bytes)")
+                offset = end
+        finally:
+            # Keep whatever was not delivered for the next attempt
+            remaining = data[offset:]
+            if remaining:
+                with open(self.spool_path, "wb") as f:
+                    f.write(remaining)
+            else:
+                os.remove(self.spool_path)
+
+    def write_rows(self, rows, fsync=False):
+        payload = [[to_ns(row[0])] + [float(v) for v in row[1:]] for row in rows]
+        frame = encode_frame(self.host, payload, self.columns)
+
+        if time.monotonic() >= self._retry_at:
+            try:
+                self._replay_spool()
+                self._send(frame)
+                self._backoff = 1.0
+                return
+            except FrameRejected as e:
+                print(f"Dropping batch of {len(rows)} rows: {e}")
+                return
+            except OSError as e:
+                print(f"Ingest server unavailable ({e}); spooling, retry in {self._backoff:.0f}s")
+                self._disconnect()
+                self._retry_at = time.monotonic() + self._backoff
+                self._backoff = min(self._backoff * 2, self.max_backoff)
+        self._spool(frame)
+
+    def close(self):
+        self._disconnect()
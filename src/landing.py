@@ -1,6 +1,13 @@
 import streamlit as st
 
+try:
+    from .warmup import start_warmup
+except ImportError:
+    from warmup import start_warmup
+
 def show_landing():
+    # Import the dashboard's heavy modules while the landing page is up
+    start_warmup()
 
     st.markdown("""
     <style>
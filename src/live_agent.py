@@ -1,18 +1,18 @@
-import psutil
 import time
-from datetime import datetime
+
+try:
+    from .sampler import MetricsSampler
+except ImportError:
+    from sampler import MetricsSampler
+
+
+_sampler = MetricsSampler()
+
 
 def collect_metrics():
-    return {
-        "timestamp": datetime.now(),
-        "cpu_usage": psutil.cpu_percent(interval=1),
-        "memory_usage": psutil.virtual_memory().percent,
-        "disk_io": psutil.disk_io_counters().read_bytes / 1e6,
-        "network_latency": psutil.net_io_counters().bytes_sent / 1e6,
-        "error_rate": 0.0
-    }
-
-def stream_metrics():
+    return _sampler.sample()
+
+def stream_metrics(interval=2):
     history = []
     while True:
         data = collect_metrics()
@@ -23,5 +23,4 @@ def stream_metrics():
             history.pop(0)
 
         yield history
-        time.sleep(2)
-
+        time.sleep(interval)
@@ -1,29 +1,198 @@
-import requests
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
-from datetime import datetime
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from .metric_store import MetricStore, DEFAULT_HOST, NS_PER_DAY
+except ImportError:
+    from metric_store import MetricStore, DEFAULT_HOST, NS_PER_DAY
 
 PROM_URL = "http://localhost:9090/api/v1/query_range"
+MAX_POINTS = 11_000      # Prometheus rejects ranges with more points per series
+TIMEOUT = (2.0, 30.0)    # connect, read seconds
+RETRIES = 3
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CHECKPOINT_PATH = os.path.join(BASE_DIR, "../data/backfill_checkpoint.json")
+QUERIES_PATH = os.environ.get("BPREDICTOR_PROMETHEUS_QUERIES",
+                              os.path.join(BASE_DIR, "../config/prometheus_queries.json"))
 
-def fetch_metric(metric, start, end, step="60s"):
+# One PromQL query per dashboard feature column, for range and instant queries
+# (data/live_metrics.py reads the same file)
+with open(QUERIES_PATH) as f:
+    QUERIES = json.load(f)
+
+def fetch_metric(metric, start, end, step="60s", session=None, url=PROM_URL):
     params = {
         "query": metric,
         "start": start,
         "end": end,
         "step": step
     }
-    r = requests.get(PROM_URL, params=params).json()
-    values = r["data"]["result"][0]["values"]
+    r = (session or requests).get(url, params=params, timeout=TIMEOUT)
+    r.raise_for_status()
+    result = r.json()["data"]["result"]
+    values = result[0]["values"] if result else []
 
     return pd.DataFrame(values, columns=["timestamp", metric])
 
-def fetch_all_metrics():
-    end = datetime.utcnow().timestamp()
-    start = end - 3600
+def plan_pages(start, end, step, max_points=MAX_POINTS):
+    """
+    Splits [start, end] (epoch seconds) into query_range pages of at most
+    `max_points` points each, on the same step grid as one big query.
+    """
+    span = step * max_points
+    pages = []
+    page_start = start
+    while page_start <= end:
+        pages.append((page_start, min(end, page_start + span - step)))
+        page_start += span
+    return pages
+
+def fetch_page(session, page_start, page_end, step, url=PROM_URL, queries=QUERIES):
+    """
+    Fetches every query for one page and aligns them on the step grid by
+    integer offset (not by timestamp string). Returns (timestamps_ns, values).
+    """
+    n = int(round((page_end - page_start) / step)) + 1
+    values = np.full((n, len(queries)), np.nan, dtype=np.float32)
+    for j, query in enumerate(queries.values()):
+        for attempt in range(RETRIES):
+            try:
+                df = fetch_metric(query, page_start, page_end, f"{step}s", session=session, url=url)
+                break
+            except (requests.RequestException, ValueError):
+                if attempt == RETRIES - 1:
+                    raise
+                time.sleep(2 ** attempt)
+        if df.empty:
+            continue
+        offsets = np.rint((df["timestamp"].to_numpy(float) - page_start) / step).astype(np.int64)
+        keep = (offsets >= 0) & (offsets < n)
+        values[offsets[keep], j] = df[query].to_numpy(float)[keep]
+
+    # Drop grid points no query had data for; fill single-metric gaps forward
+    present = ~np.isnan(values).all(axis=1)
+    frame = pd.DataFrame(values[present]).ffill().fillna(0.0)
+    grid = page_start + step * np.arange(n)[present]
+    return (grid * 1e9).astype(np.int64), frame.to_numpy(np.float32)
+
+def _unwritten(store, host, timestamps, values):
+    """
+    Drops the rows of a page that its day partitions already hold (anything
+    at or before the day's newest row), so a page written just before a crash,
+    and written again on resume, is stored once and the partition stays sorted.
+    """
+    days = timestamps // NS_PER_DAY
+    keep = np.ones(len(timestamps), dtype=bool)
+    for day in np.unique(days):
+        last = store.last_ns(host, day_of=int(day) * NS_PER_DAY)
+        if last is not None:
+            keep &= (days != day) | (timestamps > last)
+    return timestamps[keep], values[keep]
+
+def _load_checkpoint(path, job):
+    if path and os.path.exists(path):
+        with open(path) as f:
+            saved = json.load(f)
+        if all(saved.get(k) == v for k, v in job.items()):
+            return saved["next_page"]
+    return 0
+
+def _save_checkpoint(path, job, next_page):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({**job, "next_page": next_page}, f)
+    os.replace(tmp, path)
+
+def backfill(start, end, step=60, store=None, host=DEFAULT_HOST, url=PROM_URL,
+             checkpoint_path=CHECKPOINT_PATH, workers=4, max_points=MAX_POINTS):
+    """
+    Backfills [start, end] (epoch seconds) into the metric store.
+
+    Pages are fetched `workers` at a time but written strictly in order, and
+    the checkpoint records the next unwritten page after every write, so an
+    interrupted run restarted with the same arguments resumes where it stopped.
+    Rows at or before the newest stored row of their day are skipped, so a
+    page is never stored twice. Returns the number of rows written by this call.
+    """
+    store = store or MetricStore()
+    start, end = int(start), int(end)
+    pages = plan_pages(start, end, step, max_points)
+    job = {"start": start, "end": end, "step": step, "host": host, "url": url}
+    next_page = _load_checkpoint(checkpoint_path, job)
+    if checkpoint_path:
+        os.makedirs(os.path.dirname(os.path.abspath(checkpoint_path)), exist_ok=True)
+    if next_page:
+        print(f"Resuming backfill at page {next_page + 1}/{len(pages)}")
+
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_maxsize=workers))
+    session.mount("https://", HTTPAdapter(pool_maxsize=workers))
+    written = 0
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        in_flight = {}
+        for i in range(next_page, len(pages)):
+            # Keep a bounded number of pages in flight, written in page order
+            while len(in_flight) < workers * 2 and i + len(in_flight) < len(pages):
+                k = i + len(in_flight)
+                in_flight[k] = pool.submit(fetch_page, session, *pages[k], step, url)
+            timestamps, values = _unwritten(store, host, *in_flight.pop(i).result())
+            store.append_arrays(timestamps, values, host=host)
+            written += len(timestamps)
+            if checkpoint_path:
+                _save_checkpoint(checkpoint_path, job, i + 1)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+    if checkpoint_path and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    return written
+
+def fetch_all_metrics(hours=1, step=60, store=None, host=DEFAULT_HOST, url=PROM_URL):
+    """
+    Appends Prometheus history up to now to the metric store: at most the
+    last `hours`, and only points newer than the host's last stored row, so
+    repeated calls never write a row twice. Returns the number of rows written.
+    """
+    store = store or MetricStore()
+    end = int(time.time())
+    start = end - int(hours * 3600)
+    last_ns = store.last_ns(host)
+    if last_ns is not None:
+        # Next point on the step grid after the last row
+        start = max(start, last_ns // 1_000_000_000 + step)
+    if start > end:
+        return 0
+    return backfill(start, end, step=step, store=store, host=host, url=url, checkpoint_path=None)
+
 
-    cpu = fetch_metric("node_cpu_seconds_total", start, end)
-    mem = fetch_metric("node_memory_MemAvailable_bytes", start, end)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill Prometheus history into the metric store")
+    parser.add_argument("--days", type=float, default=1.0)
+    parser.add_argument("--step", type=int, default=60, help="seconds between points")
+    parser.add_argument("--url", default=PROM_URL)
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--fresh", action="store_true", help="ignore an unfinished backfill checkpoint")
+    args = parser.parse_args()
 
-    df = cpu.merge(mem, on="timestamp")
-    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="s")
+    end = int(time.time())
+    start = end - int(args.days * 86400)
+    if not args.fresh and os.path.exists(CHECKPOINT_PATH):
+        # Re-run the interrupted job over its original range
+        with open(CHECKPOINT_PATH) as f:
+            saved = json.load(f)
+        if (saved["step"], saved["host"], saved["url"]) == (args.step, args.host, args.url):
+            start, end = saved["start"], saved["end"]
 
-    df.to_csv("data/metrics.csv", index=False)
+    rows = backfill(start, end, step=args.step, host=args.host, url=args.url, workers=args.workers)
+    print(f"Backfilled {rows} rows")
@@ -1,15 +1,127 @@
-import numpy as np
 from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import LSTM, Dense, Input
-from tensorflow.keras.callbacks import EarlyStopping
+from tensorflow.keras.layers import LSTM, GRU, Dense, Input
+from tensorflow.keras.callbacks import EarlyStopping, Callback
 import os
+import sys
+import json
+import shutil
+import tempfile
+import time
 
-def create_lstm(X_train, y_train, timesteps=10, features=5, epochs=20, batch_size=32):
-    X_train_seq, y_train_seq = [], []
-    for i in range(len(X_train) - timesteps):
-        X_train_seq.append(X_train[i:i+timesteps])
-        y_train_seq.append(y_train[i+timesteps])
-    X_train_seq, y_train_seq = np.array(X_train_seq), np.array(y_train_seq)
+try:
+    from .windowing import make_sequences
+except ImportError:
+    from windowing import make_sequences
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELS_DIR = os.path.join(BASE_DIR, "../models")
+CELLS = {"lstm": LSTM, "gru": GRU}
+CELLS_BY_CLASS = {cell.__name__ for cell in CELLS.values()}
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, in MB."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        import psutil
+        return psutil.Process().memory_info().peak_wset / 2**20
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+class ThroughputReport(Callback):
+    """
+    Prints training samples/sec per epoch (counted as batches * batch_size)
+    and keeps per-epoch wall time, samples/sec, peak RSS and metrics in `epochs`.
+    """
+
+    def __init__(self, batch_size):
+        super().__init__()
+        self.batch_size = batch_size
+        self.epochs = []
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._batches = 0
+        self._start = time.perf_counter()
+
+    def on_train_batch_end(self, batch, logs=None):
+        self._batches += 1
+
+    def on_epoch_end(self, epoch, logs=None):
+        seconds = time.perf_counter() - self._start
+        samples = self._batches * self.batch_size
+        self.epochs.append({
+            "epoch": epoch + 1,
+            "seconds": seconds,
+            "samples": samples,
+            "samples_per_sec": samples / seconds,
+            "peak_rss_mb": peak_rss_mb(),
+            **{k: float(v) for k, v in (logs or {}).items()},
+        })
+        print(f"\nepoch {epoch + 1}: {samples / seconds:,.0f} samples/sec ({seconds:.1f}s)")
+
+def configure_threads(intra_op=0, inter_op=0):
+    """Sets TF's thread pools (0 = TF default); must run before any op executes."""
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(intra_op)
+    tf.config.threading.set_inter_op_parallelism_threads(inter_op)
+
+def build_lstm(timesteps=10, features=5, units=64, layers=1, cell="lstm", dropout=0.0):
+    """`layers` stacked LSTM or GRU layers of `units` each, then a sigmoid output."""
+    Cell = CELLS[cell]
+    recurrent = [Cell(units, dropout=dropout, return_sequences=i < layers - 1) for i in range(layers)]
+    model = Sequential([Input(shape=(timesteps, features))] + recurrent + [Dense(1, activation='sigmoid')])
+    model.compile(optimizer='adam', loss='binary_crossentropy', metrics=['accuracy'])
+    return model
+
+def save_lstm(model):
+    os.makedirs(MODELS_DIR, exist_ok=True)
+    model.save(os.path.join(MODELS_DIR, "lstm_model.h5"))
+
+def export_tflite(model, path=os.path.join(MODELS_DIR, "lstm_model.tflite"), source_path=None):
+    """
+    Writes a TFLite copy of `model` for the light inference backend.
+
+    The recurrent layers are unrolled first: the converter cannot lower the
+    rolled loop with a dynamic batch size, and timesteps is small. With
+    `source_path` (the .h5 it came from), its content hash is written to
+    <path>.json so the dashboard can tell when the export is stale.
+    """
+    import tensorflow as tf
+    from tensorflow.keras.models import Sequential as _Sequential
+
+    config = model.get_config()
+    for layer in config["layers"]:
+        if layer["class_name"] in CELLS_BY_CLASS:
+            layer["config"]["unroll"] = True
+    unrolled = _Sequential.from_config(config)
+    unrolled.set_weights(model.get_weights())
+
+    saved_model_dir = tempfile.mkdtemp()
+    try:
+        unrolled.export(saved_model_dir, format="tf_saved_model", verbose=False)
+        flatbuffer = tf.lite.TFLiteConverter.from_saved_model(saved_model_dir).convert()
+    finally:
+        shutil.rmtree(saved_model_dir, ignore_errors=True)
+
+    with open(path, "wb") as f:
+        f.write(flatbuffer)
+    if source_path is not None:
+        try:
+            from .model_registry import file_hash
+        except ImportError:
+            from model_registry import file_hash
+        with open(path + ".json", "w") as f:
+            json.dump({"source": os.path.basename(source_path), "source_version": file_hash(source_path)}, f)
+    return path
+
+def early_stopping(validation, patience=3):
+    # Without validation data there is no val_loss to watch
+    return EarlyStopping(monitor="val_loss" if validation else "loss",
+                         patience=patience, restore_best_weights=True)
+
+def create_lstm(X_train, y_train, timesteps=10, features=5, epochs=20, batch_size=32, callbacks=None,
+                validation_split=0.2, patience=3, **arch):
+    X_train_seq, y_train_seq = make_sequences(X_train, y_train, timesteps)
 
     if X_train_seq.size == 0 or len(X_train_seq) == 0:
         raise ValueError(
@@ -17,19 +129,28 @@ def create_lstm(X_train, y_train, timesteps=10, features=5, epochs=20, batch_siz
             "Reduce `timesteps` or provide more data."
         )
 
-    model = Sequential([
-        Input(shape=(timesteps, features)),
-        LSTM(64),
-        Dense(1, activation='sigmoid')
-    ])
-    model.compile(optimizer='adam', loss='binary_crossentropy', metrics=['accuracy'])
+    # validation_split takes the last windows, i.e. the most recent history
+    model = build_lstm(timesteps, features, **arch)
     model.fit(X_train_seq, y_train_seq, epochs=epochs, batch_size=batch_size,
-              callbacks=[EarlyStopping(patience=3)])
+              validation_split=validation_split,
+              callbacks=[early_stopping(validation_split > 0, patience)] + list(callbacks or []))
 
-    # Save model
-    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-    MODELS_DIR = os.path.join(BASE_DIR, "../models")
-    os.makedirs(MODELS_DIR, exist_ok=True)
-    model.save(os.path.join(MODELS_DIR, "lstm_model.h5"))
+    save_lstm(model)
+    return model
 
+def create_lstm_from_dataset(dataset, timesteps=10, features=5, epochs=20, callbacks=None,
+                             validation_data=None, patience=3, **arch):
+    """Same as create_lstm, for a batched tf.data.Dataset of (window, label)."""
+    model = build_lstm(timesteps, features, **arch)
+    model.fit(dataset, epochs=epochs, validation_data=validation_data,
+              callbacks=[early_stopping(validation_data is not None, patience)] + list(callbacks or []))
+
+    save_lstm(model)
     return model
+
+
+if __name__ == "__main__":
+    # Export the current models/lstm_model.h5 without retraining
+    from tensorflow.keras.models import load_model
+    h5_path = os.path.join(MODELS_DIR, "lstm_model.h5")
+    print(f"Exported {export_tflite(load_model(h5_path), source_path=h5_path)}")
@@ -0,0 +1,320 @@
+"""
+Columnar metrics store.
+
+Samples are kept as raw little-endian column files, one directory per host
+and UTC day:
+
+    data/store/<host>/<YYYY-MM-DD>/timestamp.i8     int64 UTC epoch nanoseconds
+    data/store/<host>/<YYYY-MM-DD>/<metric>.f4      float32 values
+
+Appending is a plain binary write per column and reading a range is a
+memory map plus a binary search, so neither side re-parses text.
+
+Naive timestamps (what the agents' datetime.now() produces) are local time:
+they are converted to UTC on the way in, and frames read back carry naive
+local timestamps again.
+"""
+import argparse
+import os
+import time
+import zoneinfo
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STORE_DIR = os.path.join(BASE_DIR, "../data/store")
+
+METRIC_COLUMNS = ["cpu_usage", "memory_usage", "disk_io", "network_latency", "error_rate"]
+# MB/s since MetricsSampler; data/metrics.csv (and metrics-<day>.csv) hold them as cumulative MB
+RATE_COLUMNS = ["disk_io", "network_latency"]
+RATES_CSV_PREFIX = "metrics_rates"
+DEFAULT_HOST = "local"
+NS_PER_DAY = 86_400 * 1_000_000_000
+
+
+def _local_zone():
+    """The host's IANA zone (TZ, else /etc/localtime), or its current UTC offset if neither names one."""
+    name = os.environ.get("TZ", "").lstrip(":")
+    if not name and os.path.islink("/etc/localtime"):
+        name = os.path.realpath("/etc/localtime").partition("zoneinfo/")[2]
+    try:
+        return zoneinfo.ZoneInfo(name)
+    except (ValueError, zoneinfo.ZoneInfoNotFoundError):
+        return datetime.now().astimezone().tzinfo
+
+
+LOCAL_TZ = _local_zone()
+# UTC hosts skip the conversion, so frames over ring buffers stay zero-copy
+LOCAL_IS_UTC = str(LOCAL_TZ) in ("UTC", "Etc/UTC", "GMT", "Etc/GMT")
+
+
+def to_ns(value):
+    """
+    Timestamp-like scalar (datetime, str, epoch ns) -> int64 UTC epoch ns,
+    None passes through. Naive values are local time.
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is None:
+        # A repeated hour (DST ending) is read as standard time
+        ts = ts.tz_localize(LOCAL_TZ, ambiguous=False, nonexistent="shift_forward")
+    return ts.value
+
+
+def to_ns_array(values):
+    """to_ns for a whole column of datetimes (array, Series or DatetimeIndex)."""
+    index = pd.DatetimeIndex(values)
+    if index.tz is None:
+        index = index.tz_localize(LOCAL_TZ, ambiguous=np.zeros(len(index), dtype=bool),
+                                  nonexistent="shift_forward")
+    return index.as_unit("ns").asi8
+
+
+def from_ns(timestamps_ns):
+    """int64 UTC epoch ns -> datetime64[ns] naive local time (the inverse of to_ns)."""
+    timestamps_ns = np.asarray(timestamps_ns, dtype=np.int64)
+    if LOCAL_IS_UTC:
+        return timestamps_ns.view("datetime64[ns]")
+    index = pd.DatetimeIndex(timestamps_ns.view("datetime64[ns]"), tz="UTC")
+    return index.tz_convert(LOCAL_TZ).tz_localize(None).to_numpy()
+
+
+def _day_name(day_index):
+    return str(np.datetime64(int(day_index), "D"))
+
+
+def _read_column(path, dtype):
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r")
+
+
+class MetricStore:
+    def __init__(self, root=STORE_DIR, columns=METRIC_COLUMNS):
+        self.root = root
+        self.columns = list(columns)
+
+    # ----- layout -----
+    def hosts(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(h for h in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, h)))
+
+    def partitions(self, host=DEFAULT_HOST):
+        host_dir = os.path.join(self.root, host)
+        if not os.path.isdir(host_dir):
+            return []
+        return sorted(d for d in os.listdir(host_dir) if os.path.isdir(os.path.join(host_dir, d)))
+
+    def has_data(self, host=DEFAULT_HOST):
+        return bool(self.partitions(host))
+
+    def _partition_dir(self, host, day):
+        """<root>/<host>/<day>, refusing host names that would resolve outside the root."""
+        root = os.path.realpath(self.root)
+        part_dir = os.path.realpath(os.path.join(root, host, day))
+        if os.path.dirname(os.path.dirname(part_dir)) != root:
+            raise ValueError(f"invalid host name: {host!r}")
+        return part_dir
+
+    # ----- writing -----
+    def append_arrays(self, timestamps_ns, values, host=DEFAULT_HOST, fsync=False):
+        """
+        Appends rows to the host's day partitions.
+        timestamps_ns: int64 (n,), values: (n, len(columns)) in column order.
+        """
+        timestamps_ns = np.asarray(timestamps_ns, dtype="<i8")
+        values = np.asarray(values, dtype="<f4").reshape(len(timestamps_ns), len(self.columns))
+        if len(timestamps_ns) == 0:
+            return
+
+        days = timestamps_ns // NS_PER_DAY
+        # Rows normally arrive in time order, so each day is one contiguous run
+        boundaries = np.flatnonzero(np.diff(days)) + 1
+        for lo, hi in zip(np.r_[0, boundaries], np.r_[boundaries, len(days)]):
+            part_dir = self._partition_dir(host, _day_name(days[lo]))
+            os.makedirs(part_dir, exist_ok=True)
+            chunks = [("timestamp.i8", timestamps_ns[lo:hi])]
+            chunks += [(f"{col}.f4", values[lo:hi, j]) for j, col in enumerate(self.columns)]
+            for name, data in chunks:
+                with open(os.path.join(part_dir, name), "ab") as f:
+                    f.write(np.ascontiguousarray(data).tobytes())
+                    if fsync:
+                        f.flush()
+                        os.fsync(f.fileno())
+
+    # ----- reading -----
+    def _read_partition(self, host, day, columns):
+        part_dir = os.path.join(self.root, host, day)
+        ts = _read_column(os.path.join(part_dir, "timestamp.i8"), "<i8")
+        cols = [_read_column(os.path.join(part_dir, f"{c}.f4"), "<f4") for c in columns]
+        # A crash between column writes can leave files of unequal length
+        n = min([len(ts)] + [len(c) for c in cols])
+        return ts[:n], [c[:n] for c in cols]
+
+    def _scan(self, start, end, host, columns):
+        """Yields (timestamps, columns, selection) for each partition overlapping [start, end)."""
+        start_ns, end_ns = to_ns(start), to_ns(end)
+        first_day = None if start_ns is None else _day_name(start_ns // NS_PER_DAY)
+        last_day = None if end_ns is None else _day_name((end_ns - 1) // NS_PER_DAY)
+
+        for day in self.partitions(host):
+            if (first_day and day < first_day) or (last_day and day > last_day):
+                continue
+            ts, cols = self._read_partition(host, day, columns)
+            if np.all(ts[1:] >= ts[:-1]):
+                lo = 0 if start_ns is None else np.searchsorted(ts, start_ns, side="left")
+                hi = len(ts) if end_ns is None else np.searchsorted(ts, end_ns, side="left")
+                sel = slice(lo, hi)
+            else:
+                sel = np.ones(len(ts), dtype=bool)
+                if start_ns is not None:
+                    sel &= ts >= start_ns
+                if end_ns is not None:
+                    sel &= ts < end_ns
+            yield ts, cols, sel
+
+    def read_arrays(self, start=None, end=None, host=DEFAULT_HOST, columns=None):
+        """
+        Returns (timestamps_ns int64 (n,), values float32 (n, len(columns)))
+        for start <= t < end. Either bound may be None.
+        """
+        columns = self.columns if columns is None else list(columns)
+
+        ts_parts, value_parts = [], []
+        for ts, cols, sel in self._scan(start, end, host, columns):
+            ts_parts.append(np.asarray(ts[sel]))
+            value_parts.append(np.column_stack([c[sel] for c in cols]) if cols
+                               else np.empty((len(ts_parts[-1]), 0), dtype="<f4"))
+
+        if not ts_parts:
+            return np.empty(0, dtype=np.int64), np.empty((0, len(columns)), dtype=np.float32)
+        return np.concatenate(ts_parts), np.concatenate(value_parts)
+
+    def iter_chunks(self, chunk_rows=100_000, start=None, end=None, host=DEFAULT_HOST, columns=None):
+        """
+        Like read_arrays, but yields (timestamps_ns, values) pieces of at most
+        `chunk_rows` rows, so only one piece is held in memory at a time.
+        """
+        columns = self.columns if columns is None else list(columns)
+        for ts, cols, sel in self._scan(start, end, host, columns):
+            if isinstance(sel, slice):
+                bounds = range(sel.start, sel.stop, chunk_rows)
+                pieces = (slice(lo, min(lo + chunk_rows, sel.stop)) for lo in bounds)
+            else:
+                rows = np.flatnonzero(sel)
+                pieces = (rows[lo:lo + chunk_rows] for lo in range(0, len(rows), chunk_rows))
+            for piece in pieces:
+                yield np.asarray(ts[piece]), np.column_stack([c[piece] for c in cols])
+
+    def read_range(self, start=None, end=None, host=DEFAULT_HOST, columns=None):
+        """Same as read_arrays, as a DataFrame with a datetime64 (local time) `timestamp` column."""
+        columns = self.columns if columns is None else list(columns)
+        ts, values = self.read_arrays(start, end, host=host, columns=columns)
+        df = pd.DataFrame(values, columns=columns)
+        df.insert(0, "timestamp", from_ns(ts))
+        return df
+
+    def last_ns(self, host=DEFAULT_HOST, day_of=None):
+        """
+        UTC epoch ns of the host's newest row, or None if it has none.
+        With `day_of` (epoch ns), only the UTC day partition holding it is read.
+        """
+        days = self.partitions(host) if day_of is None else [_day_name(day_of // NS_PER_DAY)]
+        for day in reversed(days):
+            if not os.path.isdir(os.path.join(self.root, host, day)):
+                continue
+            ts, _ = self._read_partition(host, day, self.columns)
+            if len(ts):
+                return int(ts[-1])
+        return None
+
+    def tail(self, n, host=DEFAULT_HOST, columns=None):
+        """Last n rows of the host, reading only as many day partitions as needed."""
+        columns = self.columns if columns is None else list(columns)
+        frames, remaining = [], n
+        for day in reversed(self.partitions(host)):
+            ts, cols = self._read_partition(host, day, columns)
+            take = min(remaining, len(ts))
+            if take:
+                frame = pd.DataFrame({c: np.asarray(v[-take:]) for c, v in zip(columns, cols)})
+                frame.insert(0, "timestamp", from_ns(ts[-take:]))
+                frames.append(frame)
+                remaining -= take
+            if remaining == 0:
+                break
+        if not frames:
+            return pd.DataFrame(columns=["timestamp"] + columns)
+        return pd.concat(frames[::-1], ignore_index=True)
+
+
+def is_cumulative_csv(path):
+    """True for CSVs written before rates (metrics.csv, metrics-<day>.csv), False for metrics_rates*.csv."""
+    return not os.path.basename(path).startswith(RATES_CSV_PREFIX)
+
+
+def cumulative_to_rates(timestamps_ns, values, columns=METRIC_COLUMNS, previous=None):
+    """
+    Turns the cumulative MB totals in the RATE_COLUMNS of `values` (rows in
+    time order) into MB/s, as MetricsSampler reports them: 0 for the first
+    row and across counter resets. `previous` is the (timestamp_ns, row)
+    before these rows, to carry the deltas across chunks.
+    Returns (values with rates, (timestamp_ns, row) to pass as the next `previous`).
+    """
+    values = np.array(values, dtype=np.float64)
+    index = [columns.index(c) for c in RATE_COLUMNS if c in columns]
+    if len(timestamps_ns) == 0 or not index:
+        return values, previous
+    last = (int(timestamps_ns[-1]), values[-1].copy())
+    totals = values[:, index]
+    if previous is None:
+        previous = (timestamps_ns[0], values[0])
+    prev_ts = np.r_[previous[0], timestamps_ns[:-1]]
+    prev_totals = np.vstack([np.asarray(previous[1], dtype=np.float64)[index], totals[:-1]])
+    elapsed = (np.asarray(timestamps_ns) - prev_ts)[:, None] / 1e9
+    delta = totals - prev_totals
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rates = np.where((delta >= 0) & (elapsed > 0), delta / elapsed, 0.0)
+    values[:, index] = rates
+    return values, last
+
+
+def import_csv(csv_path, store=None, host=DEFAULT_HOST, chunksize=1_000_000):
+    """
+    One-off import of an existing metrics CSV into the store; cumulative
+    disk/network totals (is_cumulative_csv) are stored as rates. Returns rows imported.
+    """
+    store = store or MetricStore()
+    cumulative = is_cumulative_csv(csv_path)
+    previous = None
+    total = 0
+    for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+        # Older files mix minute and microsecond timestamp formats
+        ts = pd.to_datetime(chunk["timestamp"], format="mixed")
+        chunk = chunk.assign(timestamp=ts).sort_values("timestamp", kind="stable")
+        timestamps = to_ns_array(chunk["timestamp"])
+        values = chunk.reindex(columns=store.columns).fillna(0.0).to_numpy(np.float64)
+        if cumulative:
+            values, previous = cumulative_to_rates(timestamps, values, store.columns, previous)
+        store.append_arrays(timestamps, values, host=host)
+        total += len(chunk)
+    return total
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import metrics CSV files into the columnar store")
+    parser.add_argument("csv", nargs="+", help="CSV files with timestamp + metric columns")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--root", default=STORE_DIR)
+    args = parser.parse_args()
+
+    store = MetricStore(args.root)
+    for path in args.csv:
+        start = time.perf_counter()
+        rows = import_csv(path, store, host=args.host)
+        print(f"Imported {rows} rows from {path} in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,131 @@
+import os
+import signal
+import threading
+import time
+
+import numpy as np
+
+try:
+    from .metric_store import MetricStore, METRIC_COLUMNS, DEFAULT_HOST, to_ns
+except ImportError:
+    from metric_store import MetricStore, METRIC_COLUMNS, DEFAULT_HOST, to_ns
+
+
+class CsvSink:
+    """
+    Appends rows as CSV lines to one long-lived file handle.
+    With daily=True, data/metrics_rates.csv becomes data/metrics_rates-YYYY-MM-DD.csv
+    (by sample date) so old days can be rotated away.
+    """
+
+    def __init__(self, path="data/metrics_rates.csv", columns=METRIC_COLUMNS, daily=False):
+        self.path = path
+        self.columns = list(columns)
+        self.daily = daily
+        self._file = None
+        self._file_path = None
+
+    def _path_for(self, timestamp):
+        if not self.daily:
+            return self.path
+        root, ext = os.path.splitext(self.path)
+        return f"{root}-{timestamp:%Y-%m-%d}{ext}"
+
+    def _open(self, path):
+        if self._file_path == path:
+            return self._file
+        self.close()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, "a", newline="")
+        self._file_path = path
+        if new_file:
+            self._file.write(",".join(["timestamp"] + self.columns) + "\n")
+        return self._file
+
+    def write_rows(self, rows, fsync=False):
+        f = None
+        for row in rows:
+            f = self._open(self._path_for(row[0]))
+            f.write(",".join(map(str, row)) + "\n")
+        if f is not None:
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._file_path = None
+
+
+class StoreSink:
+    """Appends rows to the columnar metric store (already partitioned per day)."""
+
+    def __init__(self, store=None, host=DEFAULT_HOST):
+        self.store = store or MetricStore()
+        self.host = host
+
+    def write_rows(self, rows, fsync=False):
+        timestamps = [to_ns(row[0]) for row in rows]
+        values = np.array([row[1:] for row in rows], dtype=np.float32)
+        self.store.append_arrays(timestamps, values, host=self.host, fsync=fsync)
+
+    def close(self):
+        pass
+
+
+class BufferedWriter:
+    """
+    Collects samples in memory as plain tuples and hands them to a sink in
+    batches: after `flush_rows` rows or `flush_interval` seconds, whichever
+    comes first. Data is fsync'ed at most every `fsync_interval` seconds
+    (0 = every flush) and on close.
+    """
+
+    def __init__(self, sink, columns=METRIC_COLUMNS, flush_rows=30, flush_interval=60.0, fsync_interval=300.0):
+        self.sink = sink
+        self.columns = list(columns)
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self._rows = []
+        self._last_flush = time.monotonic()
+        self._last_fsync = time.monotonic()
+        # Set by the SIGTERM handler; the sampling loop checks it and closes
+        self.stop_requested = threading.Event()
+
+    def append(self, sample):
+        self._rows.append((sample["timestamp"],) + tuple(sample.get(c, 0.0) for c in self.columns))
+        if len(self._rows) >= self.flush_rows or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self, fsync=False):
+        now = time.monotonic()
+        fsync = fsync or now - self._last_fsync >= self.fsync_interval
+        if self._rows:
+            # Detach the batch first so it is never handed to the sink twice
+            rows, self._rows = self._rows, []
+            self.sink.write_rows(rows, fsync=fsync)
+            if fsync:
+                self._last_fsync = now
+        self._last_flush = now
+
+    def close(self):
+        self.flush(fsync=True)
+        self.sink.close()
+
+    def install_signal_handlers(self):
+        """
+        On SIGTERM (e.g. systemd/docker stop) only sets stop_requested; the
+        loop appending samples exits and calls close() itself, so the handler
+        never writes while a flush is in progress.
+        """
+        signal.signal(signal.SIGTERM, lambda signum, frame: self.stop_requested.set())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,150 @@
+import hashlib
+import os
+import pickle
+import threading
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELS_DIR = os.path.join(BASE_DIR, "../models")
+
+
+def resolve_model_path(filename):
+    """Returns the first existing location of a model artifact, or None."""
+    candidates = [
+        os.path.join("models", filename),
+        os.path.join("..", "models", filename),
+        filename,
+        os.path.join(MODELS_DIR, filename),
+    ]
+    for path in candidates:
+        if os.path.isfile(path):
+            return os.path.abspath(path)
+    return None
+
+
+def model_signature(path):
+    """Identifies a model file version by path, mtime and size."""
+    if not path or not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+def file_hash(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_pickle(path):
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def load_keras_model(path):
+    from tensorflow.keras.models import load_model
+    return load_model(path)
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of loaded model artifacts, shared by every Streamlit
+    session and by root-cause analysis.
+
+    Each call stats the file; the artifact is only reloaded when its
+    mtime/size changed *and* its content hash differs from the loaded one.
+    Failed loads are cached too, so a broken file is not retried every rerun.
+    Entries are per (path, loader): one .h5 can be served by several engines.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._path_locks = {}
+        self._entries = {}
+
+    def _path_lock(self, path):
+        with self._lock:
+            return self._path_locks.setdefault(path, threading.Lock())
+
+    def get(self, path, loader):
+        path = os.path.abspath(path)
+        signature = model_signature(path)
+        if signature is None:
+            raise FileNotFoundError(path)
+
+        key = (path, loader)
+        entry = self._entries.get(key)
+        if entry is not None and entry["signature"] == signature:
+            return self._hit(entry)
+
+        with self._path_lock(path):
+            entry = self._entries.get(key)
+            if entry is not None and entry["signature"] == signature:
+                return self._hit(entry)
+
+            digest = file_hash(path)
+            if entry is not None and entry["hash"] == digest:
+                # Touched but not changed: keep the loaded model
+                entry["signature"] = signature
+                return self._hit(entry)
+
+            start = time.perf_counter()
+            model, error = None, None
+            try:
+                model = loader(path)
+            except Exception as e:
+                error = e
+            elapsed = time.perf_counter() - start
+
+            self._entries[key] = {
+                "model": model,
+                "error": error,
+                "signature": signature,
+                "hash": digest,
+                "loads": (entry["loads"] if entry else 0) + 1,
+                "hits": entry["hits"] if entry else 0,
+                "last_load_seconds": elapsed,
+                "total_load_seconds": (entry["total_load_seconds"] if entry else 0.0) + elapsed,
+                "saved_seconds": entry["saved_seconds"] if entry else 0.0,
+            }
+            if error is not None:
+                raise error
+            return model
+
+    def _hit(self, entry):
+        entry["hits"] += 1
+        entry["saved_seconds"] += entry["last_load_seconds"]
+        if entry["error"] is not None:
+            raise entry["error"]
+        return entry["model"]
+
+    def version(self, path):
+        """Content hash of the currently loaded version of `path`, if any."""
+        path = os.path.abspath(path)
+        entries = [e for (p, _), e in list(self._entries.items()) if p == path]
+        if not entries:
+            return None
+        # Prefer an entry that matches the file as it is now
+        signature = model_signature(path)
+        current = [e for e in entries if e["signature"] == signature]
+        return (current or entries)[0]["hash"]
+
+    def stats(self):
+        return {
+            f"{path} ({getattr(loader, '__name__', loader)})":
+                {k: v for k, v in entry.items() if k not in ("model", "error")}
+            for (path, loader), entry in list(self._entries.items())
+        }
+
+
+registry = ModelRegistry()
+
+
+def get_model(filename, loader):
+    """Loads models/<filename> through the shared registry; returns (model, path)."""
+    path = resolve_model_path(filename)
+    if path is None:
+        raise FileNotFoundError(f"{filename} not found in models/")
+    return registry.get(path, loader), path
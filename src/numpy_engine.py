@@ -0,0 +1,177 @@
+import json
+
+import numpy as np
+
+# Keras activations used by the forecasting models
+ACTIVATIONS = {
+    "tanh": np.tanh,
+    # tanh form of the logistic: no overflow warnings for large |x|
+    "sigmoid": lambda x: 0.5 * (1.0 + np.tanh(0.5 * x)),
+    "relu": lambda x: np.maximum(x, 0.0),
+    "linear": lambda x: x,
+}
+
+
+def _activation(name):
+    if name not in ACTIVATIONS:
+        raise ValueError(f"Unsupported activation: {name}")
+    return ACTIVATIONS[name]
+
+
+class LSTMLayer:
+    """Keras LSTM (gate order i, f, c, o) as NumPy float32 matmuls."""
+
+    def __init__(self, config, weights):
+        self.units = config["units"]
+        self.return_sequences = config.get("return_sequences", False)
+        self.activation = _activation(config.get("activation", "tanh"))
+        self.recurrent_activation = _activation(config.get("recurrent_activation", "sigmoid"))
+        kernel, recurrent_kernel = weights[0], weights[1]
+        bias = weights[2] if len(weights) > 2 else np.zeros(4 * self.units, np.float32)
+        self.kernel = np.asarray(kernel, np.float32)
+        self.recurrent_kernel = np.asarray(recurrent_kernel, np.float32)
+        self.bias = np.asarray(bias, np.float32)
+
+    def initial_state(self, batch):
+        zeros = np.zeros((batch, self.units), np.float32)
+        return zeros, zeros.copy()
+
+    def project(self, X):
+        """Input contribution for every timestep in one matmul: (..., 4 * units)."""
+        return X @ self.kernel + self.bias
+
+    def step(self, projected, state):
+        """One timestep from the projected input; returns the new (h, c)."""
+        h, c = state
+        z = projected + h @ self.recurrent_kernel
+        u = self.units
+        i = self.recurrent_activation(z[:, :u])
+        f = self.recurrent_activation(z[:, u:2 * u])
+        c = f * c + i * self.activation(z[:, 2 * u:3 * u])
+        o = self.recurrent_activation(z[:, 3 * u:])
+        return o * self.activation(c), c
+
+    @staticmethod
+    def output(state):
+        return state[0]
+
+    def __call__(self, X):
+        projected = self.project(X)
+        state = self.initial_state(len(X))
+        outputs = []
+        for t in range(X.shape[1]):
+            state = self.step(projected[:, t], state)
+            outputs.append(state[0])
+        return np.stack(outputs, axis=1) if self.return_sequences else outputs[-1]
+
+
+class GRULayer:
+    """Keras GRU (gate order z, r, h), with or without reset_after."""
+
+    def __init__(self, config, weights):
+        self.units = config["units"]
+        self.return_sequences = config.get("return_sequences", False)
+        self.reset_after = config.get("reset_after", True)
+        self.activation = _activation(config.get("activation", "tanh"))
+        self.recurrent_activation = _activation(config.get("recurrent_activation", "sigmoid"))
+        self.kernel = np.asarray(weights[0], np.float32)
+        self.recurrent_kernel = np.asarray(weights[1], np.float32)
+        bias = np.asarray(weights[2], np.float32) if len(weights) > 2 else None
+        if bias is None:
+            bias = np.zeros((2, 3 * self.units) if self.reset_after else 3 * self.units, np.float32)
+        # reset_after keeps separate input and recurrent biases
+        self.input_bias = bias[0] if self.reset_after else bias
+        self.recurrent_bias = bias[1] if self.reset_after else np.zeros(3 * self.units, np.float32)
+
+    def initial_state(self, batch):
+        return (np.zeros((batch, self.units), np.float32),)
+
+    def project(self, X):
+        return X @ self.kernel + self.input_bias
+
+    def step(self, projected, state):
+        (h,) = state
+        u = self.units
+        x_z, x_r, x_h = projected[:, :u], projected[:, u:2 * u], projected[:, 2 * u:]
+        if self.reset_after:
+            inner = h @ self.recurrent_kernel + self.recurrent_bias
+            z = self.recurrent_activation(x_z + inner[:, :u])
+            r = self.recurrent_activation(x_r + inner[:, u:2 * u])
+            hh = self.activation(x_h + r * inner[:, 2 * u:])
+        else:
+            inner = h @ self.recurrent_kernel[:, :2 * u]
+            z = self.recurrent_activation(x_z + inner[:, :u])
+            r = self.recurrent_activation(x_r + inner[:, u:])
+            hh = self.activation(x_h + (r * h) @ self.recurrent_kernel[:, 2 * u:])
+        return (z * h + (1.0 - z) * hh,)
+
+    @staticmethod
+    def output(state):
+        return state[0]
+
+    __call__ = LSTMLayer.__call__
+
+
+class DenseLayer:
+    def __init__(self, config, weights):
+        self.activation = _activation(config.get("activation", "linear"))
+        self.kernel = np.asarray(weights[0], np.float32)
+        self.bias = np.asarray(weights[1], np.float32) if len(weights) > 1 else 0.0
+
+    def __call__(self, X):
+        return self.activation(X @ self.kernel + self.bias)
+
+
+LAYERS = {"LSTM": LSTMLayer, "GRU": GRULayer, "Dense": DenseLayer}
+# Inference-time no-ops
+PASSTHROUGH = {"InputLayer", "Dropout"}
+
+
+class NumpyModel:
+    """
+    Runs a Sequential recurrent model saved as Keras .h5 with NumPy only:
+    no TensorFlow import, no graph dispatch. Batched over the leading axis,
+    with Keras-style predict(X, verbose=0) -> (n, 1).
+    """
+
+    def __init__(self, layers, input_shape=None):
+        self.layers = layers
+        self.input_shape = input_shape
+
+    @classmethod
+    def from_h5(cls, path):
+        import h5py
+
+        with h5py.File(path, "r") as f:
+            if "model_config" not in f.attrs:
+                raise ValueError(f"{path} has no model_config; only Keras .h5 models are supported")
+            config = json.loads(f.attrs["model_config"])
+            if config["class_name"] != "Sequential":
+                raise ValueError(f"Only Sequential models are supported, got {config['class_name']}")
+
+            layers, input_shape = [], None
+            for layer in config["config"]["layers"]:
+                kind, layer_config = layer["class_name"], layer["config"]
+                if kind == "InputLayer":
+                    input_shape = layer_config.get("batch_shape") or layer_config.get("batch_input_shape")
+                if kind in PASSTHROUGH:
+                    continue
+                if kind not in LAYERS:
+                    raise ValueError(f"Unsupported layer for the NumPy engine: {kind}")
+                group = f["model_weights"][layer_config["name"]]
+                weights = [group[name][()] for name in group.attrs["weight_names"]]
+                layers.append(LAYERS[kind](layer_config, weights))
+        return cls(layers, input_shape)
+
+    def __call__(self, X):
+        out = np.asarray(X, dtype=np.float32)
+        for layer in self.layers:
+            out = layer(out)
+        return out
+
+    def predict(self, X, verbose=0):
+        return self(X)
+
+
+def load_numpy_model(path):
+    return NumpyModel.from_h5(path)
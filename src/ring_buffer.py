@@ -0,0 +1,81 @@
+"""
+Fixed-capacity ring buffer of metric rows in preallocated NumPy columns.
+
+Timestamps are int64 UTC epoch nanoseconds and metrics float32, one array per
+column. Every row is written twice, at `i` and `i + capacity` (a mirrored
+buffer), so the newest n rows are always one contiguous slice of each
+column: append is O(1), and reading needs neither a copy nor a reorder.
+"""
+import numpy as np
+import pandas as pd
+
+try:
+    from .metric_store import METRIC_COLUMNS, from_ns
+except ImportError:
+    from metric_store import METRIC_COLUMNS, from_ns
+
+
+class RingBuffer:
+    def __init__(self, capacity, columns=METRIC_COLUMNS):
+        self.capacity = int(capacity)
+        self.columns = list(columns)
+        self.timestamps = np.zeros(2 * self.capacity, dtype=np.int64)
+        self.values = np.zeros((len(self.columns), 2 * self.capacity), dtype=np.float32)
+        self.head = 0       # next write position, in [0, capacity)
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def append(self, timestamp_ns, row):
+        """One row: epoch-ns timestamp and one value per column."""
+        i, mirror = self.head, self.head + self.capacity
+        self.timestamps[i] = self.timestamps[mirror] = timestamp_ns
+        self.values[:, i] = self.values[:, mirror] = row
+        self.head = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def extend(self, timestamps_ns, rows):
+        """Many rows at once (rows: (n, columns)); only the last `capacity` are kept."""
+        timestamps_ns = np.asarray(timestamps_ns, dtype=np.int64)[-self.capacity:]
+        rows = np.asarray(rows, dtype=np.float32)[-self.capacity:]
+        n = len(timestamps_ns)
+        index = (self.head + np.arange(n)) % self.capacity
+        for offset in (0, self.capacity):
+            self.timestamps[index + offset] = timestamps_ns
+            self.values[:, index + offset] = rows.T
+        self.head = (self.head + n) % self.capacity
+        self.size = min(self.size + n, self.capacity)
+
+    def _window(self, n):
+        n = self.size if n is None else min(n, self.size)
+        end = self.head + self.capacity
+        return slice(end - n, end)
+
+    def view(self, n=None):
+        """
+        (timestamps (n,), values (columns, n)) of the newest n rows (all by
+        default), oldest first. Zero-copy: later appends overwrite them.
+        """
+        window = self._window(n)
+        return self.timestamps[window], self.values[:, window]
+
+    def frame(self, n=None, copy=True):
+        """
+        The newest n rows as a DataFrame: datetime64 `timestamp` (local time)
+        plus the columns. copy=False wraps the buffer itself (same caveat as
+        view; on non-UTC hosts the timestamps are converted, so a copy).
+        """
+        timestamps, values = self.view(n)
+        data = {"timestamp": from_ns(timestamps)}
+        data.update(zip(self.columns, values))
+        return pd.DataFrame(data, copy=copy)
+
+    def latest(self):
+        """Newest row as a sample dict, or None when empty."""
+        if self.size == 0:
+            return None
+        i = self.head + self.capacity - 1
+        sample = {"timestamp": pd.Timestamp(from_ns(self.timestamps[i:i + 1])[0])}
+        sample.update(zip(self.columns, self.values[:, i].tolist()))
+        return sample
@@ -1,14 +1,20 @@
 # src/root_cause.py
-import shap
 import numpy as np
-from tensorflow.keras.models import load_model
+
+try:
+    from .model_registry import get_model, load_keras_model
+except ImportError:
+    from model_registry import get_model, load_keras_model
 
 def get_shap_values(X_background, X_sample):
     """
     Returns SHAP values for LSTM time-series model
     Shape: (samples, timesteps, features)
     """
-    model = load_model("models/lstm_model.h5")
+    # shap pulls in TensorFlow and numba; only pay for it when explaining
+    import shap
+
+    model, _ = get_model("lstm_model.h5", load_keras_model)
 
     # Use GradientExplainer (correct for LSTM)
     explainer = shap.GradientExplainer(
@@ -0,0 +1,81 @@
+"""
+Rule-based anomaly detection, evaluated on whole columns.
+
+Rules come from config/anomaly_rules.json (or the file named by
+BPREDICTOR_ANOMALY_RULES):
+
+    {"rules": [{"name": "cpu_critical", "column": "cpu_usage", "op": ">",
+                "threshold": 85, "level": -1, "reason": "CPU usage above 85%"}, ...]}
+
+`level` uses the anomaly model's codes: -1 anomaly, 0 warning (1 is normal,
+when nothing matches). A row gets the most severe level among the rules it
+matches, and its reason is that rule's. Rules on a column the data doesn't
+have never match.
+"""
+import json
+import operator
+import os
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RULES_PATH = os.environ.get("BPREDICTOR_ANOMALY_RULES", os.path.join(BASE_DIR, "../config/anomaly_rules.json"))
+NORMAL = 1
+OPERATORS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le}
+
+# Used when the rules file is missing, so the fallback detector always works
+DEFAULT_RULES = [
+    {"name": "cpu_critical", "column": "cpu_usage", "op": ">", "threshold": 85, "level": -1,
+     "reason": "CPU usage above 85%"},
+    {"name": "memory_critical", "column": "memory_usage", "op": ">", "threshold": 80, "level": -1,
+     "reason": "Memory usage above 80%"},
+    {"name": "cpu_warning", "column": "cpu_usage", "op": ">", "threshold": 70, "level": 0,
+     "reason": "CPU usage above 70%"},
+    {"name": "memory_warning", "column": "memory_usage", "op": ">", "threshold": 70, "level": 0,
+     "reason": "Memory usage above 70%"},
+]
+
+
+def load_rules(path=RULES_PATH):
+    """The rules in `path`, or DEFAULT_RULES if it does not exist."""
+    if not os.path.exists(path):
+        return DEFAULT_RULES
+    with open(path) as f:
+        return json.load(f)["rules"]
+
+
+class RuleBasedDetector:
+    """Threshold rules as a drop-in for the anomaly model: predict(X) -> -1/0/1 per row."""
+
+    def __init__(self, rules=None):
+        rules = load_rules() if rules is None else rules
+        for rule in rules:
+            if rule["op"] not in OPERATORS:
+                raise ValueError(f"Rule {rule['name']}: unknown operator {rule['op']!r}")
+        # Most severe first, so the first match of a row is the one reported
+        self.rules = sorted(rules, key=lambda r: r["level"])
+        self.reasons = {rule["name"]: rule["reason"] for rule in self.rules}
+
+    def matches(self, X):
+        """(rules, n) boolean matrix of which rule matches which row of DataFrame `X`."""
+        masks = np.zeros((len(self.rules), len(X)), dtype=bool)
+        for i, rule in enumerate(self.rules):
+            if rule["column"] in X:
+                values = np.asarray(X[rule["column"]], dtype=np.float64)
+                masks[i] = OPERATORS[rule["op"]](values, rule["threshold"])
+        return masks
+
+    def predict(self, X):
+        masks = self.matches(X)
+        levels = np.array([rule["level"] for rule in self.rules], dtype=np.int64)
+        return np.where(masks, levels[:, None], NORMAL).min(axis=0, initial=NORMAL)
+
+    def explain(self, X):
+        """Name of the rule behind each row's level ('' for normal rows)."""
+        masks = self.matches(X)
+        if not self.rules:
+            return np.full(len(X), "", dtype=object)
+        names = np.array([rule["name"] for rule in self.rules] + [""], dtype=object)
+        # First matching rule per row; rows without a match get the trailing ''
+        first = np.where(masks.any(axis=0), masks.argmax(axis=0), len(self.rules))
+        return names[first]
@@ -0,0 +1,70 @@
+import psutil
+import threading
+import time
+from datetime import datetime
+
+
+class MetricsSampler:
+    """
+    Non-blocking psutil sampler.
+
+    Keeps the previous CPU times and I/O counters and derives CPU % and
+    per-second disk/network rates from the deltas, instead of blocking for
+    a second in psutil.cpu_percent(interval=1). The first call has no
+    previous reading, so it reports CPU % since boot and zero rates.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._prev = None
+
+    @staticmethod
+    def _read():
+        disk = psutil.disk_io_counters()
+        net = psutil.net_io_counters()
+        return {
+            "time": time.monotonic(),
+            "cpu": psutil.cpu_times(),
+            "disk_bytes": disk.read_bytes if disk else 0,
+            "net_bytes": net.bytes_sent if net else 0,
+        }
+
+    @staticmethod
+    def _cpu_percent(prev, cur):
+        # Same accounting as psutil.cpu_percent: busy = total - idle - iowait
+        def busy_total(t):
+            # guest time is already counted in user/nice on Linux
+            total = sum(t) - getattr(t, "guest", 0.0) - getattr(t, "guest_nice", 0.0)
+            idle = t.idle + getattr(t, "iowait", 0.0)
+            return total - idle, total
+
+        busy, total = busy_total(cur)
+        if prev is not None:
+            prev_busy, prev_total = busy_total(prev)
+            busy, total = busy - prev_busy, total - prev_total
+        if total <= 0:
+            return 0.0
+        return round(min(max(100.0 * busy / total, 0.0), 100.0), 1)
+
+    def sample(self):
+        with self._lock:
+            cur = self._read()
+            prev, self._prev = self._prev, cur
+
+        if prev is None:
+            cpu = self._cpu_percent(None, cur["cpu"])
+            disk_rate = net_rate = 0.0
+        else:
+            elapsed = max(cur["time"] - prev["time"], 1e-6)
+            cpu = self._cpu_percent(prev["cpu"], cur["cpu"])
+            disk_rate = max(cur["disk_bytes"] - prev["disk_bytes"], 0) / 1e6 / elapsed
+            net_rate = max(cur["net_bytes"] - prev["net_bytes"], 0) / 1e6 / elapsed
+
+        return {
+            "timestamp": datetime.now(),
+            "cpu_usage": cpu,
+            "memory_usage": psutil.virtual_memory().percent,
+            "disk_io": disk_rate,            # MB/s read
+            "network_latency": net_rate,     # MB/s sent
+            "error_rate": 0.0
+        }
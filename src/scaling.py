@@ -0,0 +1,137 @@
+import json
+import os
+import pickle
+import time
+
+import numpy as np
+
+SCALER_FORMAT = 1
+SCALER_FILENAME = "scaler.json"
+
+
+class StreamingMinMaxScaler:
+    """
+    Min-max scaler that can be fitted chunk by chunk (partial_fit) and applies
+    itself as one precomputed float32 affine transform: X * scale_ + min_.
+
+    Same statistics and output as sklearn's MinMaxScaler (constant columns
+    get a range of 1), without needing sklearn at inference time.
+    """
+
+    def __init__(self, feature_range=(0.0, 1.0), columns=None):
+        self.feature_range = tuple(feature_range)
+        self.columns = list(columns) if columns is not None else None
+        self.data_min_ = None
+        self.data_max_ = None
+        self.n_samples_seen_ = 0
+        self.scale_ = None
+        self.min_ = None
+        self.model_version = None
+
+    def partial_fit(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim != 2 or len(X) == 0:
+            return self
+        lo, hi = np.nanmin(X, axis=0), np.nanmax(X, axis=0)
+        if self.data_min_ is None:
+            self.data_min_, self.data_max_ = lo, hi
+        else:
+            self.data_min_ = np.fmin(self.data_min_, lo)
+            self.data_max_ = np.fmax(self.data_max_, hi)
+        self.n_samples_seen_ += len(X)
+        self._precompute()
+        return self
+
+    def fit(self, X):
+        self.data_min_ = self.data_max_ = None
+        self.n_samples_seen_ = 0
+        return self.partial_fit(X)
+
+    def _precompute(self):
+        low, high = self.feature_range
+        data_range = self.data_max_ - self.data_min_
+        data_range[data_range == 0.0] = 1.0
+        scale = (high - low) / data_range
+        self.scale_ = scale.astype(np.float32)
+        self.min_ = (low - self.data_min_ * scale).astype(np.float32)
+
+    def transform(self, X, out=None):
+        """float32 (..., features) -> float32, scaled. Works on windows too."""
+        if self.scale_ is None:
+            raise ValueError("Scaler is not fitted yet.")
+        X = np.asarray(X, dtype=np.float32)
+        out = np.multiply(X, self.scale_, out=out)
+        out += self.min_
+        return out
+
+    def fit_transform(self, X):
+        return self.fit(X).transform(X)
+
+    def inverse_transform(self, X):
+        X = np.asarray(X, dtype=np.float32)
+        return (X - self.min_) / self.scale_
+
+    def to_dict(self):
+        return {
+            "format": SCALER_FORMAT,
+            "model_version": self.model_version,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "columns": self.columns,
+            "feature_range": list(self.feature_range),
+            "n_samples_seen": int(self.n_samples_seen_),
+            "data_min": self.data_min_.tolist(),
+            "data_max": self.data_max_.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        if state.get("format") != SCALER_FORMAT:
+            raise ValueError(f"Unsupported scaler format: {state.get('format')}")
+        scaler = cls(state["feature_range"], state.get("columns"))
+        scaler.data_min_ = np.asarray(state["data_min"], dtype=np.float64)
+        scaler.data_max_ = np.asarray(state["data_max"], dtype=np.float64)
+        scaler.n_samples_seen_ = state.get("n_samples_seen", 0)
+        scaler.model_version = state.get("model_version")
+        scaler._precompute()
+        return scaler
+
+    @classmethod
+    def from_sklearn(cls, scaler, columns=None):
+        """Wraps a fitted sklearn MinMaxScaler (the legacy scaler.pkl)."""
+        if columns is None and hasattr(scaler, "feature_names_in_"):
+            columns = list(scaler.feature_names_in_)
+        converted = cls(scaler.feature_range, columns)
+        converted.data_min_ = np.asarray(scaler.data_min_, dtype=np.float64)
+        converted.data_max_ = np.asarray(scaler.data_max_, dtype=np.float64)
+        converted.n_samples_seen_ = int(np.max(scaler.n_samples_seen_))
+        converted._precompute()
+        return converted
+
+    def save(self, path, model_path=None):
+        """
+        Writes the scaler as JSON. With `model_path`, the model file's content
+        hash is recorded as the version tag, so a mismatched pair can be detected.
+        """
+        if model_path is not None:
+            try:
+                from .model_registry import file_hash
+            except ImportError:
+                from model_registry import file_hash
+            self.model_version = file_hash(model_path)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(tmp, path)
+
+
+def load_scaler(path):
+    """Loads scaler.json, or a legacy pickled sklearn MinMaxScaler."""
+    if path.endswith(".json"):
+        with open(path) as f:
+            return StreamingMinMaxScaler.from_dict(json.load(f))
+    with open(path, "rb") as f:
+        scaler = pickle.load(f)
+    if isinstance(scaler, StreamingMinMaxScaler):
+        return scaler
+    return StreamingMinMaxScaler.from_sklearn(scaler)
@@ -0,0 +1,213 @@
+"""
+Headless scoring service.
+
+Reads new samples from the metric store, runs the anomaly model and the LSTM
+(streaming scorer, no TensorFlow) on a schedule, and appends the results to
+a second columnar store that dashboards only read:
+
+    data/results/<host>/<YYYY-MM-DD>/anomaly.f4   -1 anomaly, 0 warning, 1 normal
+    data/results/<host>/<YYYY-MM-DD>/risk.f4      LSTM risk for the window ending
+                                                  at that sample (NaN while warming up)
+    data/results/service.json                     heartbeat
+
+Results share the metric rows' timestamps, so a view joins the two on time.
+"""
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .metric_store import MetricStore, METRIC_COLUMNS, to_ns
+    from .model_registry import get_model, load_pickle
+    from .anomaly_detection import predict_anomaly
+    from .rules import RuleBasedDetector
+    from .streaming_scorer import get_streaming_scorer, input_columns
+except ImportError:
+    from metric_store import MetricStore, METRIC_COLUMNS, to_ns
+    from model_registry import get_model, load_pickle
+    from anomaly_detection import predict_anomaly
+    from rules import RuleBasedDetector
+    from streaming_scorer import get_streaming_scorer, input_columns
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BASE_DIR, "../data/results")
+RESULT_COLUMNS = ["anomaly", "risk"]
+HEARTBEAT_FILENAME = "service.json"
+SCORE_INTERVAL = 2.0      # seconds between scoring passes
+LOOKBACK = 3600.0         # seconds of history scored (or used as LSTM context) on start
+
+
+def results_store(root=RESULTS_DIR):
+    return MetricStore(root, columns=RESULT_COLUMNS)
+
+
+class ScoringService:
+    """
+    Scores every host in `store` incrementally. A per-host cursor (the last
+    scored timestamp, recovered from the results store on start) makes each
+    pass read only new rows; the LSTM keeps per-host recurrent state in a
+    StreamingScorer, so a pass costs one step per new sample.
+    """
+
+    def __init__(self, store=None, results=None, hosts=None, lookback=LOOKBACK, resync_every=None):
+        self.store = store or MetricStore()
+        self.results = results or results_store()
+        self.hosts = hosts
+        self.lookback_ns = int(lookback * 1e9)
+        self.resync_every = resync_every
+        self.rows_scored = 0
+        self.last_run_seconds = None
+        self.backend = None
+        self._cursors = {}
+        self._primed = set()
+        self._scorer = None
+
+    def _cursor(self, host):
+        if host not in self._cursors:
+            self._cursors[host] = self.results.last_ns(host)
+        return self._cursors[host]
+
+    def _anomaly_model(self):
+        try:
+            model, _ = get_model("anomaly_model.pkl", load_pickle)
+            return model
+        except Exception:
+            return RuleBasedDetector()
+
+    def _streaming_scorer(self):
+        try:
+            scorer = get_streaming_scorer(resync_every=self.resync_every)
+        except Exception:
+            self.backend = None
+            return None
+        if scorer is not self._scorer:
+            # New model or scaler: host state starts over, so re-read context
+            self._scorer = scorer
+            self._primed.clear()
+        self.backend = "numpy (streaming)"
+        return scorer
+
+    def _read_new(self, host, now_ns):
+        """(timestamps, values, first row to write) of the host's unscored rows plus LSTM context."""
+        cursor = self._cursor(host)
+        if host in self._primed:
+            start = cursor + 1
+        else:
+            # Unprimed scorer: replay up to `lookback` before the cursor as context
+            start = (now_ns if cursor is None else cursor) - self.lookback_ns
+        ts, values = self.store.read_arrays(start=start, host=host)
+        first = 0 if cursor is None else int(np.searchsorted(ts, cursor, side="right"))
+        return ts, values, first
+
+    def _score_lstm(self, scorer, batches):
+        """Risk for every row of every host, feeding rows of all hosts in lockstep."""
+        columns = input_columns(scorer)
+        index = [self.store.columns.index(c) for c in columns]
+        risks = {host: np.full(len(ts), np.nan, dtype=np.float32) for host, (ts, _, _) in batches.items()}
+        for k in range(max(len(ts) for ts, _, _ in batches.values())):
+            hosts = [h for h, (ts, _, _) in batches.items() if len(ts) > k]
+            scores = scorer.update(hosts, [batches[h][0][k] for h in hosts],
+                                   np.stack([batches[h][1][k, index] for h in hosts]))
+            for host, score in zip(hosts, scores):
+                risks[host][k] = score
+        return risks
+
+    def run_once(self):
+        """One scoring pass over all hosts. Returns the number of result rows written."""
+        start = time.perf_counter()
+        # The store holds UTC (naive agent timestamps are converted on write)
+        now_ns = time.time_ns()
+        hosts = self.hosts or self.store.hosts()
+        batches = {}
+        for host in hosts:
+            ts, values, first = self._read_new(host, now_ns)
+            if len(ts):
+                batches[host] = (ts, values, first)
+
+        written = 0
+        if batches:
+            scorer = self._streaming_scorer()
+            risks = (self._score_lstm(scorer, batches) if scorer is not None
+                     else {h: np.full(len(ts), np.nan, dtype=np.float32) for h, (ts, _, _) in batches.items()})
+            if scorer is not None:
+                self._primed.update(batches)
+
+            # One anomaly-model call for the new rows of all hosts
+            X = pd.DataFrame(np.concatenate([values[first:] for _, values, first in batches.values()]),
+                             columns=self.store.columns)
+            if len(X):
+                model = self._anomaly_model()
+                columns = list(getattr(model, "feature_names_in_", METRIC_COLUMNS))
+                anomalies = np.asarray(predict_anomaly(model, X[columns]), dtype=np.float32)
+
+            offset = 0
+            for host, (ts, _, first) in batches.items():
+                n = len(ts) - first
+                if n == 0:
+                    continue
+                rows = np.column_stack([anomalies[offset:offset + n], risks[host][first:]])
+                self.results.append_arrays(ts[first:], rows, host=host)
+                self._cursors[host] = int(ts[-1])
+                offset += n
+                written += n
+
+        self.rows_scored += written
+        self.last_run_seconds = time.perf_counter() - start
+        return written
+
+    def write_heartbeat(self, interval):
+        status = {
+            "pid": os.getpid(),
+            "updated": time.time(),
+            "interval": interval,
+            "hosts": sorted(self._cursors),
+            "backend": self.backend,
+            "rows_scored": self.rows_scored,
+            "last_run_seconds": self.last_run_seconds,
+        }
+        os.makedirs(self.results.root, exist_ok=True)
+        path = os.path.join(self.results.root, HEARTBEAT_FILENAME)
+        with open(path + ".tmp", "w") as f:
+            json.dump(status, f)
+        os.replace(path + ".tmp", path)
+
+    def run(self, interval=SCORE_INTERVAL, stop=None):
+        """Scores every `interval` seconds until `stop` (a threading.Event) is set."""
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            started = time.monotonic()
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"Scoring pass failed: {e}")
+            self.write_heartbeat(interval)
+            stop.wait(max(0.0, interval - (time.monotonic() - started)))
+
+
+def service_status(root=RESULTS_DIR, max_age=None):
+    """The running service's heartbeat, or None if it is missing or stale."""
+    try:
+        with open(os.path.join(root, HEARTBEAT_FILENAME)) as f:
+            status = json.load(f)
+    except (OSError, ValueError):
+        return None
+    max_age = max_age or max(3 * status.get("interval", SCORE_INTERVAL), 10.0)
+    if time.time() - status.get("updated", 0) > max_age:
+        return None
+    return status
+
+
+def read_scored(n, host, store=None, results=None):
+    """Last `n` scored samples of `host`: timestamp, metric columns, anomaly and risk."""
+    store = store or MetricStore()
+    results = results or results_store()
+    scored = results.tail(n, host=host)
+    if scored.empty:
+        return pd.DataFrame(columns=["timestamp"] + store.columns + RESULT_COLUMNS)
+    first, last = scored["timestamp"].iloc[0], scored["timestamp"].iloc[-1]
+    metrics = store.read_range(first, to_ns(last) + 1, host=host)
+    return metrics.merge(scored, on="timestamp", how="inner")
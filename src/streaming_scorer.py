@@ -0,0 +1,244 @@
+import threading
+
+import numpy as np
+
+try:
+    from .numpy_engine import load_numpy_model
+    from .model_registry import get_model, registry
+    from .scaling import load_scaler, SCALER_FILENAME
+    from .metric_store import METRIC_COLUMNS, to_ns, to_ns_array
+except ImportError:
+    from numpy_engine import load_numpy_model
+    from model_registry import get_model, registry
+    from scaling import load_scaler, SCALER_FILENAME
+    from metric_store import METRIC_COLUMNS, to_ns, to_ns_array
+
+KERAS_FILENAME = "lstm_model.h5"
+
+
+def _timestamps_ns(timestamps):
+    ts = np.asarray(timestamps)
+    if ts.dtype.kind == "M":
+        return to_ns_array(ts)
+    if ts.dtype.kind in "iu":
+        return ts.astype(np.int64)
+    return np.array([to_ns(t) for t in timestamps], dtype=np.int64)
+
+
+class StreamingScorer:
+    """
+    Scores every new sample of many hosts without re-running whole windows.
+
+    Each host keeps the recurrent state of the model; a new sample advances
+    it by one step (O(1), independent of window length), batched over all
+    hosts in the call. The windowed model always starts a window from a zero
+    state, so carried state slowly drifts from it: every `resync_every`
+    samples a host's state is rebuilt exactly from its last `timesteps`
+    samples. Resyncs are staggered across hosts so per-call cost stays level.
+
+    Scores are NaN until a host has a full window, and for samples not newer
+    than the host's last one (so re-feeding the same history is a no-op).
+    """
+
+    def __init__(self, model, timesteps=10, resync_every=None, scaler=None, capacity=16):
+        recurrent = [layer for layer in model.layers if hasattr(layer, "step")]
+        if not recurrent or model.layers[:len(recurrent)] != recurrent:
+            raise ValueError("Model must start with its recurrent layers")
+        self.recurrent = recurrent
+        self.head = model.layers[len(recurrent):]
+        self.timesteps = timesteps
+        self.resync_every = resync_every or timesteps
+        self.scaler = scaler
+        self.features = recurrent[0].kernel.shape[0]
+        self.resyncs = 0
+        self.steps = 0
+        self._slots = {}
+        self._lock = threading.Lock()
+        self._history = self._position = self._count = None
+        self._since_resync = self._last_ts = self._last_score = self._states = None
+        self._capacity = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        """(Re)allocates per-host arrays for `capacity` hosts, keeping existing rows."""
+        def grow(old, shape, dtype, fill=0):
+            new = np.full((capacity,) + shape, fill, dtype=dtype)
+            if old is not None:
+                new[:len(old)] = old
+            return new
+
+        self._history = grow(self._history, (self.timesteps, self.features), np.float32)
+        self._position = grow(self._position, (), np.int64)
+        self._count = grow(self._count, (), np.int64)
+        self._since_resync = grow(self._since_resync, (), np.int64)
+        self._last_ts = grow(self._last_ts, (), np.int64, np.iinfo(np.int64).min)
+        self._last_score = grow(self._last_score, (), np.float32, np.nan)
+        self._states = [
+            [grow(states[j] if states else None, (layer.units,), np.float32)
+             for j in range(len(layer.initial_state(1)))]
+            for layer, states in zip(self.recurrent, self._states or [None] * len(self.recurrent))
+        ]
+        self._capacity = capacity
+
+    def _slot(self, host):
+        slot = self._slots.get(host)
+        if slot is None:
+            slot = self._slots[host] = len(self._slots)
+            if slot >= self._capacity:
+                self._allocate(self._capacity * 2)
+        return slot
+
+    @property
+    def hosts(self):
+        return list(self._slots)
+
+    def last_timestamp(self, host):
+        """ns timestamp of the host's newest scored sample, or None."""
+        slot = self._slots.get(host)
+        if slot is None or self._count[slot] == 0:
+            return None
+        return int(self._last_ts[slot])
+
+    def latest_score(self, host):
+        """The host's most recent score, or None before its first full window."""
+        slot = self._slots.get(host)
+        if slot is None or np.isnan(self._last_score[slot]):
+            return None
+        return float(self._last_score[slot])
+
+    def _windows(self, slots):
+        """Last `timesteps` samples of each slot, oldest first: (k, timesteps, features)."""
+        order = (self._position[slots, None] + np.arange(self.timesteps)) % self.timesteps
+        return self._history[slots[:, None], order]
+
+    def _advance(self, slots, X):
+        x = X
+        for layer, states in zip(self.recurrent, self._states):
+            state = layer.step(layer.project(x), tuple(s[slots] for s in states))
+            for s, new in zip(states, state):
+                s[slots] = new
+            x = layer.output(state)
+        return x
+
+    def _resync(self, slots):
+        x = self._windows(slots)
+        for layer, states in zip(self.recurrent, self._states):
+            projected = layer.project(x)
+            state = layer.initial_state(len(slots))
+            outputs = []
+            for t in range(self.timesteps):
+                state = layer.step(projected[:, t], state)
+                outputs.append(layer.output(state))
+            for s, new in zip(states, state):
+                s[slots] = new
+            x = np.stack(outputs, axis=1)
+        self.resyncs += len(slots)
+        return x[:, -1]
+
+    def _score(self, x):
+        for layer in self.head:
+            x = layer(x)
+        return x[:, 0]
+
+    def update(self, hosts, timestamps, samples):
+        """
+        One sample per host (hosts must be distinct). `samples` is raw
+        (n, features) in the scaler's column order. Returns float32 scores (n,).
+        """
+        samples = np.asarray(samples, dtype=np.float32).reshape(len(hosts), -1)
+        if self.scaler is not None:
+            samples = self.scaler.transform(samples)
+        ts = _timestamps_ns(timestamps)
+        scores = np.full(len(hosts), np.nan, dtype=np.float32)
+
+        with self._lock:
+            slots = np.array([self._slot(h) for h in hosts], dtype=np.int64)
+            fresh = ts > self._last_ts[slots]
+            slots, rows = slots[fresh], np.flatnonzero(fresh)
+            if len(slots) == 0:
+                return scores
+
+            # Append to each host's ring of the last `timesteps` samples
+            self._history[slots, self._position[slots]] = samples[rows]
+            self._position[slots] = (self._position[slots] + 1) % self.timesteps
+            self._last_ts[slots] = ts[rows]
+            self._count[slots] += 1
+            self._since_resync[slots] += 1
+
+            ready = self._count[slots] >= self.timesteps
+            # First full window, or due: rebuild exactly; otherwise one step
+            exact = ready & ((self._count[slots] == self.timesteps)
+                             | (self._since_resync[slots] >= self.resync_every))
+            step = ready & ~exact
+
+            if exact.any():
+                s = slots[exact]
+                scores[rows[exact]] = self._score(self._resync(s))
+                # Stagger the next resync by slot so hosts don't all resync together
+                first = self._count[s] == self.timesteps
+                self._since_resync[s] = np.where(first, s % self.resync_every, 0)
+            if step.any():
+                scores[rows[step]] = self._score(self._advance(slots[step], samples[rows[step]]))
+                self.steps += int(step.sum())
+            # Not ready yet: keep states at zero, history only
+            self._last_score[slots] = scores[rows]
+        return scores
+
+    def score(self, host, timestamp, sample):
+        """Single-host update; returns the score, or None while it warms up."""
+        value = self.update([host], [timestamp], [sample])[0]
+        return None if np.isnan(value) else float(value)
+
+    def feed(self, host, timestamps, samples):
+        """Feeds a host's samples in order; already-seen timestamps are skipped."""
+        samples = np.asarray(samples, dtype=np.float32)
+        return np.array([self.update([host], [t], s[None])[0] for t, s in zip(timestamps, samples)],
+                        dtype=np.float32)
+
+    def reset(self, host=None):
+        with self._lock:
+            slots = list(self._slots.values()) if host is None else [self._slots.get(host)]
+            for slot in slots:
+                if slot is None:
+                    continue
+                self._count[slot] = self._since_resync[slot] = self._position[slot] = 0
+                self._last_ts[slot] = np.iinfo(np.int64).min
+                self._last_score[slot] = np.nan
+                for states in self._states:
+                    for s in states:
+                        s[slot] = 0.0
+
+
+_scorer = None
+_scorer_key = None
+_scorer_lock = threading.Lock()
+
+
+def get_streaming_scorer(timesteps=10, resync_every=None):
+    """
+    Process-wide scorer over models/lstm_model.h5 and its scaler (loaded
+    through the model registry). Rebuilt, with fresh host state, when either
+    file changes.
+    """
+    global _scorer, _scorer_key
+    model, model_path = get_model(KERAS_FILENAME, load_numpy_model)
+    scaler, scaler_path = None, None
+    for filename in (SCALER_FILENAME, "scaler.pkl"):
+        try:
+            scaler, scaler_path = get_model(filename, load_scaler)
+            break
+        except Exception:
+            pass
+    key = (registry.version(model_path), scaler_path and registry.version(scaler_path), timesteps, resync_every)
+    with _scorer_lock:
+        if _scorer is None or _scorer_key != key:
+            _scorer = StreamingScorer(model, timesteps, resync_every, scaler)
+            _scorer_key = key
+        return _scorer
+
+
+def input_columns(scorer):
+    """Column order the scorer expects its raw samples in."""
+    if scorer.scaler is not None and scorer.scaler.columns:
+        return list(scorer.scaler.columns)
+    return list(METRIC_COLUMNS)
@@ -0,0 +1,64 @@
+import importlib
+import threading
+import time
+
+try:
+    from .model_registry import get_model, load_pickle
+    from .inference import load_forecaster
+    from .scaling import load_scaler, SCALER_FILENAME
+except ImportError:
+    from model_registry import get_model, load_pickle
+    from inference import load_forecaster
+    from scaling import load_scaler, SCALER_FILENAME
+
+# Imported by the dashboard pages, not at module level
+WARMUP_MODULES = ("plotly.graph_objects", "plotly.express")
+
+_thread = None
+_lock = threading.Lock()
+_status = {}
+
+
+def _timed(name, fn):
+    start = time.perf_counter()
+    try:
+        fn()
+        _status[name] = {"seconds": time.perf_counter() - start, "error": None}
+    except Exception as e:
+        _status[name] = {"seconds": time.perf_counter() - start, "error": repr(e)}
+
+
+def _load_scaler():
+    for filename in (SCALER_FILENAME, "scaler.pkl"):
+        try:
+            return get_model(filename, load_scaler)
+        except Exception:
+            pass
+
+
+def _warm():
+    for name in WARMUP_MODULES:
+        _timed(name, lambda: importlib.import_module(name))
+    # Models go through the shared registry, so the dashboard finds them loaded.
+    # Unpickling the anomaly model is what imports sklearn.
+    _timed("anomaly_model.pkl", lambda: get_model("anomaly_model.pkl", load_pickle))
+    _timed("forecaster", load_forecaster)
+    _timed("scaler", _load_scaler)
+
+
+def start_warmup():
+    """
+    Starts (once per process) a daemon thread that imports the dashboard's
+    heavy modules and loads its models. Cheap to call on every rerun.
+    """
+    global _thread
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=_warm, name="bpredictor-warmup", daemon=True)
+            _thread.start()
+        return _thread
+
+
+def warmup_status():
+    """Per-step {seconds, error} of the warm-up so far."""
+    return dict(_status)
@@ -0,0 +1,34 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def sliding_windows(X, timesteps, dtype=np.float32):
+    """
+    Returns every window of `timesteps` consecutive rows of X as a
+    read-only strided view of shape (n - timesteps + 1, timesteps, features).
+
+    X is converted to `dtype` (and made C-contiguous) at most once; the
+    windows themselves share that buffer, so no per-window copy is made.
+    Pass dtype=None to keep X's own dtype.
+    """
+    X = np.ascontiguousarray(X, dtype=dtype)
+    if X.ndim == 1:
+        X = X[:, None]
+    if timesteps < 1:
+        raise ValueError(f"timesteps must be >= 1, got {timesteps}")
+    if len(X) < timesteps:
+        return np.empty((0, timesteps, X.shape[1]), dtype=X.dtype)
+
+    # sliding_window_view puts the window axis last: (n, features, timesteps)
+    return sliding_window_view(X, timesteps, axis=0).transpose(0, 2, 1)
+
+
+def make_sequences(X, y, timesteps, dtype=np.float32):
+    """
+    Builds (X_seq, y_seq) for supervised training: window i holds rows
+    i..i+timesteps-1 and is labelled with y[i+timesteps].
+    Same pairing as the old list-comprehension loop in create_lstm.
+    """
+    windows = sliding_windows(X, timesteps, dtype=dtype)[:-1]
+    y_seq = np.asarray(y)[timesteps:]
+    return windows, y_seq
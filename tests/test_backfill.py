@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+from benchmarks.prom_stub import start_stub
+from src import live_metrics
+from src.live_metrics import backfill, fetch_all_metrics, plan_pages, QUERIES
+from src.metric_store import MetricStore
+
+END = 1_760_000_000
+START = END - 86_400     # one day at 60 s: 1441 points, several pages of 300
+STEP = 60
+MAX_POINTS = 300
+
+
+@pytest.fixture
+def prometheus():
+    """Starts a stub and returns a function giving its query_range URL; restarts reuse the port."""
+    servers = []
+
+    def start(**kwargs):
+        port = servers[-1].server_address[1] if servers else 0
+        if servers:
+            servers[-1].shutdown()
+            servers[-1].server_close()
+        server, base_url, _ = start_stub(port=port, latency=0, **kwargs)
+        servers.append(server)
+        return base_url + "/api/v1/query_range"
+
+    yield start
+    servers[-1].shutdown()
+    servers[-1].server_close()
+
+
+@pytest.fixture
+def store(tmp_path):
+    return MetricStore(str(tmp_path / "store"))
+
+
+def assert_exactly_once(store):
+    ts, values = store.read_arrays()
+    grid = np.arange(START, END + 1, STEP) * 1_000_000_000
+    np.testing.assert_array_equal(ts, grid)
+    assert values.shape == (len(grid), len(QUERIES))
+
+
+def test_plan_pages_covers_the_grid():
+    pages = plan_pages(START, END, STEP, MAX_POINTS)
+    points = np.concatenate([np.arange(lo, hi + 1, STEP) for lo, hi in pages])
+    np.testing.assert_array_equal(points, np.arange(START, END + 1, STEP))
+    assert all((hi - lo) // STEP + 1 <= MAX_POINTS for lo, hi in pages)
+
+
+def test_resume_after_failed_page(prometheus, store, tmp_path, monkeypatch):
+    monkeypatch.setattr(live_metrics.time, "sleep", lambda seconds: None)
+    checkpoint = str(tmp_path / "checkpoint.json")
+    pages = plan_pages(START, END, STEP, MAX_POINTS)
+
+    url = prometheus(fail_after=2 * len(QUERIES))
+    with pytest.raises(Exception):
+        backfill(START, END, STEP, store=store, url=url, checkpoint_path=checkpoint,
+                 workers=1, max_points=MAX_POINTS)
+    assert 0 < len(store.read_arrays()[0]) < len(np.arange(START, END + 1, STEP))
+
+    url = prometheus()
+    backfill(START, END, STEP, store=store, url=url, checkpoint_path=checkpoint,
+             workers=2, max_points=MAX_POINTS)
+    assert len(pages) > 2
+    assert_exactly_once(store)
+    assert not (tmp_path / "checkpoint.json").exists()
+
+
+def test_crash_between_write_and_checkpoint(prometheus, store, tmp_path, monkeypatch):
+    checkpoint = str(tmp_path / "checkpoint.json")
+    save = live_metrics._save_checkpoint
+    calls = []
+
+    def crash_on_second_save(path, job, next_page):
+        calls.append(next_page)
+        if len(calls) == 2:
+            raise KeyboardInterrupt   # page 2 is stored, the checkpoint still says page 2 is next
+        save(path, job, next_page)
+
+    url = prometheus()
+    monkeypatch.setattr(live_metrics, "_save_checkpoint", crash_on_second_save)
+    with pytest.raises(KeyboardInterrupt):
+        backfill(START, END, STEP, store=store, url=url, checkpoint_path=checkpoint,
+                 workers=1, max_points=MAX_POINTS)
+    monkeypatch.setattr(live_metrics, "_save_checkpoint", save)
+
+    backfill(START, END, STEP, store=store, url=url, checkpoint_path=checkpoint,
+             workers=1, max_points=MAX_POINTS)
+    assert_exactly_once(store)
+
+
+def test_fetch_all_metrics_appends_only_new_points(prometheus, store):
+    url = prometheus()
+    first = fetch_all_metrics(hours=1, store=store, url=url)
+    assert first > 0
+    fetch_all_metrics(hours=1, store=store, url=url)
+    ts, _ = store.read_arrays()
+    assert len(np.unique(ts)) == len(ts)
+    assert np.all(np.diff(ts) > 0)
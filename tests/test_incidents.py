@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.incidents import load_incidents, label_samples, merge_intervals
+from src.metric_store import to_ns_array
+
+SECOND = 10**9
+BASE = pd.Timestamp("2025-12-23 23:53:20.393179")
+
+
+def brute_force(ts, starts, ends):
+    return ((ts[:, None] >= starts[None, :]) & (ts[:, None] < ends[None, :])).any(axis=1).astype(np.float32)
+
+
+@pytest.fixture
+def write_csv(tmp_path):
+    def write(frame):
+        path = tmp_path / "incidents.csv"
+        frame.to_csv(path, index=False)
+        return str(path)
+    return write
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_labels_match_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    ts = np.sort(rng.integers(0, 86_400 * SECOND, 20_000)).astype(np.int64)
+    starts = rng.integers(0, 86_400 * SECOND, 300).astype(np.int64)
+    ends = starts + rng.integers(1, 600 * SECOND, 300)
+    got = label_samples(ts, merge_intervals(starts, ends))
+    np.testing.assert_array_equal(got, brute_force(ts, starts, ends))
+
+
+def test_merge_overlapping_and_touching():
+    starts, ends = merge_intervals(np.array([5, 0, 10, 30]), np.array([12, 5, 20, 31]))
+    assert starts.tolist() == [0, 30]
+    assert ends.tolist() == [20, 31]
+
+
+def test_merge_nested_interval():
+    starts, ends = merge_intervals(np.array([0, 2, 50]), np.array([40, 10, 60]))
+    assert starts.tolist() == [0, 50]
+    assert ends.tolist() == [40, 60]
+
+
+@pytest.mark.parametrize("lead_time, expected", [
+    (0, [0, 0, 1, 1, 0]),
+    (60, [0, 1, 1, 1, 0]),
+    ("1min", [0, 1, 1, 1, 0]),
+])
+def test_lead_time_and_exclusive_end(write_csv, lead_time, expected):
+    path = write_csv(pd.DataFrame({"start": [BASE], "end": [BASE + pd.Timedelta("10s")]}))
+    probe = to_ns_array(BASE + pd.to_timedelta([-61, -59, 0, 9.999, 10], unit="s"))
+    assert label_samples(probe, load_incidents(path, lead_time=lead_time)).tolist() == expected
+
+
+def test_overlapping_incidents_in_file_are_merged(write_csv):
+    path = write_csv(pd.DataFrame({
+        "start": [BASE, BASE + pd.Timedelta("5s"), BASE + pd.Timedelta("1h")],
+        "end": [BASE + pd.Timedelta("10s"), BASE + pd.Timedelta("20s"), BASE + pd.Timedelta("2h")],
+    }))
+    starts, ends = load_incidents(path)
+    assert len(starts) == 2
+    assert ends[0] - starts[0] == 20 * SECOND
+
+
+def test_legacy_format_matches_exact_timestamp_merge(write_csv):
+    rng = np.random.default_rng(0)
+    ts = pd.Series(np.sort(rng.integers(0, 86_400 * SECOND, 2000)).astype(np.int64).view("datetime64[ns]"))
+    legacy = pd.DataFrame({"timestamp": ts.sample(50, random_state=0).sort_values(), "incident": 1})
+    legacy.loc[legacy.index[:5], "incident"] = 0
+    path = write_csv(legacy)
+
+    old = (pd.DataFrame({"timestamp": ts})
+           .merge(pd.read_csv(path, parse_dates=["timestamp"]), on="timestamp", how="left")
+           .fillna(0)["incident"].to_numpy(np.float32))
+    labels = label_samples(to_ns_array(ts), load_incidents(path))
+    np.testing.assert_array_equal(labels, old)
+    assert labels.sum() == 45
+
+
+def test_missing_or_empty_file_labels_nothing(tmp_path):
+    empty = tmp_path / "empty.csv"
+    empty.write_text("")
+    for path in (tmp_path / "missing.csv", empty):
+        intervals = load_incidents(str(path))
+        assert intervals is None
+        assert label_samples(np.arange(3, dtype=np.int64), intervals).tolist() == [0, 0, 0]
@@ -0,0 +1,60 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.prom_stub import start_stub
+from data.live_metrics import PrometheusFetcher, QUERIES
+from src import live_metrics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def prometheus():
+    """(instant query URL, request counters) of a stub where the error_rate query fails."""
+    server, base_url, counters = start_stub(latency=0, fail_on=("transmit_errs",))
+    yield base_url + "/api/v1/query", counters
+    server.shutdown()
+    server.server_close()
+
+
+def requests_sent(counters):
+    return counters.get("/api/v1/query", 0)
+
+
+def test_failing_query_only_affects_its_value(prometheus):
+    url, _ = prometheus
+    fetcher = PrometheusFetcher(url=url, ttl=0)
+    values = fetcher.fetch_all()
+    assert fetcher.last_errors.keys() == {"error_rate"}
+    assert values["error_rate"] == 0.0
+    assert all(values[k] > 0 for k in QUERIES if k != "error_rate")
+
+
+def test_complete_results_are_cached(prometheus):
+    url, counters = prometheus
+    fetcher = PrometheusFetcher(url=url, ttl=60)
+    fetcher.queries.pop("error_rate")
+    first = fetcher.get()
+    assert fetcher.get() == first
+    assert requests_sent(counters) == len(fetcher.queries)
+
+
+def test_failed_round_is_not_cached(prometheus):
+    url, counters = prometheus
+    fetcher = PrometheusFetcher(url=url, ttl=60)
+    fetcher.get()
+    fetcher.get()
+    assert requests_sent(counters) == 2 * len(QUERIES)
+
+
+def test_queries_shared_with_backfill():
+    assert QUERIES == live_metrics.QUERIES
+
+
+def test_imports_outside_repo_root(tmp_path):
+    script = "import runpy; print(sorted(runpy.run_path(%r)['QUERIES']))" % os.path.join(ROOT, "data", "live_metrics.py")
+    out = subprocess.run([sys.executable, "-c", script], cwd=tmp_path, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == str(sorted(QUERIES))
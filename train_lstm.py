@@ -1,13 +1,55 @@
-from src.data_processing import load_and_process
-from src.lstm_forecasting import create_lstm
+from src.data_processing import (load_and_process, fit_scaler_streaming, row_timestamp, sequence_dataset,
+                                 tfdata_dataset, CHUNK_ROWS)
+from src.lstm_forecasting import (create_lstm, create_lstm_from_dataset, configure_threads,
+                                  ThroughputReport, peak_rss_mb, export_tflite, CELLS)
+from src.metric_store import METRIC_COLUMNS
+from src.scaling import SCALER_FILENAME
 import os
-import pickle
+import json
+import time
 import argparse
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELS_DIR = os.path.join(BASE_DIR, "models")
 
-def main(timesteps, epochs, batch_size):
+
+def save_scaler(scaler):
+    # Saved after the model so the scaler is tagged with that model's hash
+    scaler_path = os.path.join(MODELS_DIR, SCALER_FILENAME)
+    scaler.save(scaler_path, model_path=os.path.join(MODELS_DIR, "lstm_model.h5"))
+    print(f"Saved scaler to {scaler_path}")
+
+
+def main_streaming(args, arch, callbacks):
+    print(f"Fitting scaler in one pass ({args.chunk_rows} rows per chunk)...")
+    scaler, rows = fit_scaler_streaming(args.chunk_rows)
+
+    # Validate on the most recent `validation_split` of the rows, like the
+    # last windows create_lstm holds out (not of the time span: sampling can
+    # be sparse early on and dense later)
+    holdout = int(rows * args.validation_split)
+    split = row_timestamp(rows - holdout, args.chunk_rows) if holdout else None
+
+    def dataset(start, end):
+        if args.pipeline == "tfdata":
+            return tfdata_dataset(scaler, args.timesteps, args.batch_size, args.chunk_rows, start, end,
+                                  lead_time=args.lead_time, shuffle_buffer=args.shuffle_buffer)
+        return sequence_dataset(scaler, args.timesteps, args.batch_size, args.chunk_rows, start, end,
+                                lead_time=args.lead_time)
+
+    validation = dataset(split, None) if split is not None else None
+    print(f"Training {arch['cell'].upper()} on the {args.pipeline} pipeline (this may take a while)...")
+    model = create_lstm_from_dataset(dataset(None, split), timesteps=args.timesteps, features=len(METRIC_COLUMNS),
+                                     epochs=args.epochs, callbacks=callbacks, validation_data=validation,
+                                     patience=args.patience, **arch)
+
+    save_scaler(scaler)
+    return model
+
+
+def main(args, arch, callbacks):
     print("Loading and processing data...")
-    df, scaler = load_and_process()
+    df, scaler = load_and_process(lead_time=args.lead_time)
 
     metric_cols = [c for c in df.columns if c not in ["timestamp", "incident"]]
     X = df[metric_cols].values
@@ -16,6 +58,7 @@ def main(timesteps, epochs, batch_size):
     print(f"Data shapes: X={X.shape}, y={y.shape}")
 
     # Ensure timesteps is appropriate for the dataset size
+    timesteps = args.timesteps
     n_samples = X.shape[0]
     if n_samples <= timesteps:
         effective_timesteps = max(1, n_samples - 1)
@@ -23,19 +66,37 @@ def main(timesteps, epochs, batch_size):
     else:
         effective_timesteps = timesteps
 
-    print("Training LSTM (this may take a while)...")
-    model = create_lstm(X, y, timesteps=effective_timesteps, features=X.shape[1], epochs=epochs, batch_size=batch_size)
+    print(f"Training {arch['cell'].upper()} (this may take a while)...")
+    model = create_lstm(X, y, timesteps=effective_timesteps, features=X.shape[1], epochs=args.epochs,
+                        batch_size=args.batch_size, callbacks=callbacks,
+                        validation_split=args.validation_split, patience=args.patience, **arch)
 
     # Save scaler for inference
-    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-    MODELS_DIR = os.path.join(BASE_DIR, "models")
-    os.makedirs(MODELS_DIR, exist_ok=True)
-    scaler_path = os.path.join(MODELS_DIR, "scaler.pkl")
-    with open(scaler_path, "wb") as f:
-        pickle.dump(scaler, f)
+    save_scaler(scaler)
+    return model
 
-    print(f"Saved scaler to {scaler_path}")
-    print("Training complete. Model saved to models/lstm_model.h5")
+
+def write_profile(path, args, arch, model, report, seconds):
+    """Per-epoch wall time, samples/sec and peak RSS, to compare architectures."""
+    epochs = report.epochs
+    profile = {
+        "architecture": arch,
+        "parameters": int(model.count_params()),
+        "pipeline": args.pipeline,
+        "timesteps": args.timesteps,
+        "batch_size": args.batch_size,
+        "validation_split": args.validation_split,
+        "total_seconds": seconds,
+        "mean_epoch_seconds": sum(e["seconds"] for e in epochs) / max(1, len(epochs)),
+        "mean_samples_per_sec": sum(e["samples_per_sec"] for e in epochs) / max(1, len(epochs)),
+        "peak_rss_mb": peak_rss_mb(),
+        "best_val_loss": min((e["val_loss"] for e in epochs if "val_loss" in e), default=None),
+        "epochs": epochs,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(profile, f, indent=2)
+    print(f"Saved training profile to {path}")
 
 
 if __name__ == "__main__":
@@ -43,8 +104,41 @@ if __name__ == "__main__":
     parser.add_argument("--timesteps", type=int, default=10)
     parser.add_argument("--epochs", type=int, default=20)
     parser.add_argument("--batch_size", type=int, default=32)
+    parser.add_argument("--cell", choices=sorted(CELLS), default="lstm")
+    parser.add_argument("--units", type=int, default=64)
+    parser.add_argument("--layers", type=int, default=1)
+    parser.add_argument("--dropout", type=float, default=0.0)
+    parser.add_argument("--validation_split", type=float, default=0.2,
+                        help="most recent fraction held out; early stopping watches its loss")
+    parser.add_argument("--patience", type=int, default=3)
+    parser.add_argument("--pipeline", choices=["memory", "streaming", "tfdata"], default="memory",
+                        help="streaming: train from chunks, for histories larger than RAM; "
+                             "tfdata: chunks plus parallel windowing, shuffling and prefetch")
+    parser.add_argument("--chunk_rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--lead_time", type=float, default=0,
+                        help="also label samples this many seconds before each incident")
+    parser.add_argument("--shuffle_buffer", type=int, default=10_000, help="windows (tfdata pipeline)")
+    parser.add_argument("--intra_op_threads", type=int, default=0, help="0 = TensorFlow default")
+    parser.add_argument("--inter_op_threads", type=int, default=0, help="0 = TensorFlow default")
+    parser.add_argument("--profile", nargs="?", const=os.path.join(MODELS_DIR, "train_profile.json"),
+                        help="write a JSON report of epoch time, samples/sec and peak RSS")
+    parser.add_argument("--export", action="store_true",
+                        help="also write models/lstm_model.tflite for the light inference backend")
     args = parser.parse_args()
+    configure_threads(args.intra_op_threads, args.inter_op_threads)
+
+    arch = {"cell": args.cell, "units": args.units, "layers": args.layers, "dropout": args.dropout}
+    report = ThroughputReport(args.batch_size)
+    start = time.perf_counter()
+    if args.pipeline in ("streaming", "tfdata"):
+        model = main_streaming(args, arch, [report])
+    else:
+        model = main(args, arch, [report])
+    print("Training complete. Model saved to models/lstm_model.h5")
+
+    if args.export:
+        tflite_path = export_tflite(model, source_path=os.path.join(MODELS_DIR, "lstm_model.h5"))
+        print(f"Exported {tflite_path}")
 
-    # Note: the `create_lstm` function currently sets epochs/batch_size internally.
-    # If you want to pass epochs/batch_size through, update `create_lstm` accordingly.
-    main(args.timesteps, args.epochs, args.batch_size)
+    if args.profile:
+        write_profile(args.profile, args, arch, model, report, time.perf_counter() - start)